@@ -0,0 +1,279 @@
+"""
+End-to-end benchmark of the hot API endpoints, compared against a stored baseline.
+
+Creates a test database (like ``manage.py test``), fills it with ``seed_load_data``
+and drives the real URL conf and middleware through Django's test client:
+
+    spaces/list/, space/<id>/, events/list/, schedules/availability/, <id>/reserve/,
+    spacemanager/reservations/, spacemanager/<id>/decision/, globalSearch/
+
+For each endpoint it reports p50/p95/p99 latency, the queries per request (from
+SQLProfilingMiddleware) and the memory allocated while serving one request (peak
+traced by tracemalloc, in a separate pass). Results are written as JSON and
+compared with the baseline. The exit status is 1 when an endpoint runs more queries
+than the baseline or its p95 latency or allocations grow past the tolerances.
+
+    python -m benchmarks.api [--iterations 200] [--keepdb]
+    python -m benchmarks.api --save-baseline      # after an intended change
+
+Query counts are exact and portable. Latency and allocations only compare
+meaningfully with a baseline taken on the same machine and database backend.
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+# The benchmark user sends thousands of requests an hour; keep the throttles out of the measurement.
+os.environ.setdefault("THROTTLE_RATE_USER", "1000000/hour")
+os.environ.setdefault("THROTTLE_RATE_ANON", "1000000/hour")
+# The queries per request come from the SQL profiler, which is off by default without DEBUG.
+os.environ.setdefault("SQL_PROFILING", "True")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+from benchmarks.http_load import percentile  # noqa: E402
+from common.authentication import refresh_token_for  # noqa: E402
+from space_managers.models import HourSlot, Schedule, Space, SpaceManager  # noqa: E402
+from students.models import Student  # noqa: E402
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baselines" / "api.json"
+RESULTS_DIR = BENCHMARK_DIR / "results"
+
+SEED_VOLUMES = {"managers": 10, "students": 1000, "staff": 100, "spaces": 100, "schedules": 5000}
+# Slow endpoints stop sampling after this many timed seconds (but take at least MIN_SAMPLES).
+MIN_SAMPLES = 10
+
+
+def bearer(user, role, profile_id):
+    return {"HTTP_AUTHORIZATION": f"Bearer {refresh_token_for(user, role, profile_id).access_token}"}
+
+
+def seed(seed_value):
+    call_command("seed_load_data", seed=seed_value, flush=True, stdout=io.StringIO(), **SEED_VOLUMES)
+
+
+def build_cases(client):
+    """``(name, request(i))`` pairs. ``i`` never repeats, so writes always target a fresh slot or reservation."""
+    student = Student.objects.select_related("user").filter(is_approved=True).order_by("id").first()
+    # The busiest manager, space and day: the worst case the seeded data offers.
+    manager = (SpaceManager.objects.select_related("user").annotate(spaces=Count("space"))
+               .order_by("-spaces", "id").first())
+    space = (Space.objects.filter(space_manager=manager).annotate(requests=Count("schedule"))
+             .order_by("-requests", "id").first())
+    busiest = (Schedule.objects.filter(space=space).values("date").annotate(requests=Count("id"))
+               .order_by("-requests", "date").first())
+    as_student = bearer(student.user, "student", student.id)
+    as_manager = bearer(manager.user, "space_manager", manager.id)
+
+    codes = list(HourSlot.objects.order_by("code").values_list("code", flat=True))
+    # Past the seeded calendar, so every reservation request is for a free slot.
+    free_from = Schedule.objects.order_by("-date").values_list("date", flat=True).first() + datetime.timedelta(days=30)
+    created = []
+
+    def reserve(i):
+        body = {
+            "reservation_type": "class",
+            "description": "benchmark",
+            "schedule": {"date": (free_from + datetime.timedelta(days=i // len(codes))).isoformat(),
+                         "hour_codes": [codes[i % len(codes)]]},
+        }
+        response = client.post(f"/api/{space.id}/reserve/", json.dumps(body), content_type="application/json",
+                               **as_student)
+        if response.status_code == 201:
+            created.append(response.json()["id"])
+        return response
+
+    def decide(i):
+        if not created:
+            raise SystemExit("spacemanager/<id>/decision/ decides the reservations <id>/reserve/ created; run both.")
+        return client.post(f"/api/spacemanager/{created.pop()}/decision/",
+                           json.dumps({"decision": "approved" if i % 2 else "rejected"}),
+                           content_type="application/json", **as_manager)
+
+    availability = f"/api/schedules/availability/?date={busiest['date'].isoformat()}&space_id={space.id}"
+    return [
+        ("spaces/list/", lambda i: client.get("/api/spaces/list/", **as_student)),
+        ("space/<id>/", lambda i: client.get(f"/api/space/{space.id}/", **as_student)),
+        ("events/list/", lambda i: client.get("/api/events/list/", **as_student)),
+        ("schedules/availability/", lambda i: client.get(availability, **as_student)),
+        ("<id>/reserve/", reserve),
+        ("spacemanager/reservations/", lambda i: client.get("/api/spacemanager/reservations/", **as_manager)),
+        # Runs after reserve: each request decides one of the reservations it created.
+        ("spacemanager/<id>/decision/", decide),
+        ("globalSearch/", lambda i: client.get("/api/globalSearch/?search=" + "کلاس", **as_student)),
+    ]
+
+
+def measure(request, counter, iterations, warmup, alloc_iterations, max_seconds):
+    statuses, queries, latencies, allocations = {}, [], [], []
+    for _ in range(warmup):
+        request(next(counter))
+    for _ in range(iterations):
+        if len(latencies) >= MIN_SAMPLES and sum(latencies) > max_seconds:
+            break
+        started = time.perf_counter()
+        response = request(next(counter))
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        profile = getattr(response.wsgi_request, "sql_profile", None)
+        if profile is not None:
+            queries.append(profile.queries)
+
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            request(next(counter))
+            allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "samples": len(latencies),
+        "queries": statistics.median_low(queries) if queries else None,
+        "queries_max": max(queries) if queries else None,
+        "alloc_peak_kib": round(statistics.median(allocations) / 1024, 1) if allocations else None,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCHMARK_DIR).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, latency_tolerance, alloc_tolerance):
+    """Print the comparison; return the regressions found."""
+    if baseline["meta"].get("database") != results["meta"]["database"]:
+        print(f"note: baseline was taken on {baseline['meta'].get('database')}, this run on "
+              f"{results['meta']['database']}; only query counts compare.")
+        latency_tolerance = alloc_tolerance = None
+
+    regressions = []
+    print(f"\n{'vs baseline':<30} {'queries':>12} {'p95 ms':>20} {'alloc KiB':>20}")
+    for name, current in results["endpoints"].items():
+        previous = baseline["endpoints"].get(name)
+        if previous is None:
+            print(f"{name:<30} (new)")
+            continue
+        flags = []
+        if current["queries"] is not None and previous["queries"] is not None and current["queries"] > previous["queries"]:
+            flags.append("queries")
+        if latency_tolerance is not None and current["p95_ms"] > previous["p95_ms"] * (1 + latency_tolerance):
+            flags.append("p95")
+        if (alloc_tolerance is not None and current["alloc_peak_kib"] is not None and previous["alloc_peak_kib"]
+                and current["alloc_peak_kib"] > previous["alloc_peak_kib"] * (1 + alloc_tolerance)):
+            flags.append("alloc")
+        regressions.extend(f"{name}: {flag}" for flag in flags)
+        print(f"{name:<30} {previous['queries']!s:>5} -> {current['queries']!s:<5} "
+              f"{previous['p95_ms']:>8.2f} -> {current['p95_ms']:<8.2f} "
+              f"{previous['alloc_peak_kib']!s:>8} -> {current['alloc_peak_kib']!s:<8}"
+              f"{'  REGRESSION: ' + ', '.join(flags) if flags else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--alloc-iterations", type=int, default=10)
+    parser.add_argument("--max-seconds", type=float, default=20.0,
+                        help="Timed seconds per endpoint after which sampling stops early.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="*", default=None, help="Endpoint names to run (default: all).")
+    parser.add_argument("--keepdb", action="store_true", help="Keep the test database between runs.")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results file (default: benchmarks/results/api-<timestamp>.json).")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--latency-tolerance", type=float, default=0.3, help="Allowed p95 growth (0.3 = +30%%).")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.2, help="Allowed allocation growth.")
+    args = parser.parse_args()
+    if not settings.SQL_PROFILING:
+        raise SystemExit("Queries per request come from SQLProfilingMiddleware; run with SQL_PROFILING=True.")
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=args.keepdb)
+    try:
+        started = time.perf_counter()
+        seed(args.seed)
+        print(f"seeded {SEED_VOLUMES} in {time.perf_counter() - started:.1f}s on {connection.vendor}")
+
+        client = Client()
+        counter = iter(range(sys.maxsize))
+        endpoints = {}
+        print(f"\n{'endpoint':<30} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'alloc KiB':>10}  statuses")
+        for name, request in build_cases(client):
+            if args.only and name not in args.only:
+                continue
+            result = endpoints[name] = measure(request, counter, args.iterations, args.warmup, args.alloc_iterations,
+                                                       args.max_seconds)
+            print(f"{name:<30} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                  f"{result['queries']!s:>8} {result['alloc_peak_kib']!s:>10}  {result['statuses']}")
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=args.keepdb)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "volumes": SEED_VOLUMES,
+            "iterations": args.iterations,
+        },
+        "endpoints": endpoints,
+    }
+    output = args.output or RESULTS_DIR / f"api-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nresults: {output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline saved: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.latency_tolerance, args.alloc_tolerance)
+    if regressions:
+        print("\nregressions: " + "; ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
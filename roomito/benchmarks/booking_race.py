@@ -0,0 +1,280 @@
+"""
+Concurrency stress test of the booking path: reserve/ and decision/ under contention.
+
+Needs PostgreSQL (SQLite serializes every writer). For each round, a fresh date is
+hammered in two storms. Both storms run first in threads, then in forked processes.
+
+1. --workers students POST <space_id>/reserve/ at once, --requests times each,
+   for random windows of a few hot hour codes. The requests overlap heavily.
+2. --workers concurrent sessions of the space's manager try to approve every
+   reservation still under review, each in its own random order. Overlapping
+   reservations and the very same reservation are decided at the same moment.
+
+Then it asserts the booking invariants:
+- no two approved schedules (or events) of the space overlap
+- every approved reservation has exactly one event
+- no request failed with a 5xx
+
+While the storms run, a monitor samples pg_stat_activity for backends waiting on
+locks. Reported per storm: requests/s, latency percentiles, status counts,
+lock-wait samples, and new deadlocks. The exit status is 1 when an invariant
+breaks. The fixture (one space, its manager and the students, tagged "race") is
+created with seed_load_data and removed afterwards:
+
+    python -m benchmarks.booking_race [--workers 8] [--requests 20] [--rounds 3] [--modes threads processes]
+"""
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+# Every worker is one user sending requests back to back; the throttles are not under test.
+os.environ.setdefault("THROTTLE_RATE_USER", "1000000/hour")
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from benchmarks.http_load import percentile  # noqa: E402
+from common.authentication import refresh_token_for  # noqa: E402
+from space_managers.models import Event, HourSlot, Reservation, Space  # noqa: E402
+from students.models import Student  # noqa: E402
+
+TAG = "race"
+FIRST_DATE = date(2090, 1, 6)
+
+OVERLAPPING_APPROVALS_SQL = """
+    WITH taken AS (
+        SELECT s.id, s.date, s.start_hour_code_id AS first_code, s.end_hour_code_id AS last_code
+        FROM space_managers_schedule s
+        LEFT JOIN space_managers_reservation r ON r.schedule_id = s.id
+        LEFT JOIN space_managers_event e ON e.schedule_id = s.id
+        WHERE s.space_id = %s AND (r.status = 'approved' OR e.id IS NOT NULL)
+    )
+    SELECT a.date, a.id, b.id FROM taken a JOIN taken b
+        ON a.date = b.date AND a.id < b.id AND a.first_code <= b.last_code AND a.last_code >= b.first_code
+"""
+
+LOCK_WAITERS_SQL = """
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database() AND wait_event_type = 'Lock'
+"""
+
+DEADLOCKS_SQL = "SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()"
+
+
+def reserve_worker(space_id, token, day, codes, requests, seed):
+    client, rng, results = Client(raise_request_exception=False), random.Random(seed), []
+    for _ in range(requests):
+        start = rng.randrange(len(codes) - 1)
+        window = codes[start:start + rng.randint(1, 3)]
+        body = {"reservation_type": "class", "schedule": {"date": day.isoformat(), "hour_codes": window}}
+        started = time.perf_counter()
+        response = client.post(f"/api/{space_id}/reserve/", json.dumps(body), content_type="application/json",
+                               HTTP_AUTHORIZATION=f"Bearer {token}")
+        results.append((response.status_code, time.perf_counter() - started))
+    connection.close()
+    return results
+
+
+def decide_worker(token, reservation_ids, seed):
+    client, results = Client(raise_request_exception=False), []
+    reservation_ids = list(reservation_ids)
+    random.Random(seed).shuffle(reservation_ids)
+    for reservation_id in reservation_ids:
+        started = time.perf_counter()
+        response = client.post(f"/api/spacemanager/{reservation_id}/decision/", json.dumps({"decision": "approved"}),
+                               content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}")
+        results.append((response.status_code, time.perf_counter() - started))
+    connection.close()
+    return results
+
+
+def _process_entry(task, args, barrier, queue):
+    results = []
+    try:
+        barrier.wait()
+        results = task(*args)
+    finally:
+        # Always report, or the parent would wait for this worker forever.
+        queue.put(results)
+
+
+def storm(mode, task, worker_args):
+    """Run ``task(*args)`` for every args tuple at once; return the (status, seconds) results of all of them."""
+    results = []
+    if mode == "threads":
+        barrier, lock = threading.Barrier(len(worker_args)), threading.Lock()
+
+        def run(args):
+            barrier.wait()
+            outcome = task(*args)
+            with lock:
+                results.extend(outcome)
+
+        threads = [threading.Thread(target=run, args=(args,)) for args in worker_args]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        # Children must not share the parent's socket to the database.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        barrier, queue = context.Barrier(len(worker_args)), context.Queue()
+        processes = [context.Process(target=_process_entry, args=(task, args, barrier, queue)) for args in worker_args]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            results.extend(queue.get())
+        for process in processes:
+            process.join()
+    return results
+
+
+class LockMonitor(threading.Thread):
+    """Samples how many backends wait on a lock, every ``interval`` seconds, on its own connection."""
+
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self.done = threading.Event()
+
+    def run(self):
+        with connection.cursor() as cursor:
+            while not self.done.is_set():
+                cursor.execute(LOCK_WAITERS_SQL)
+                self.samples.append(cursor.fetchone()[0])
+                time.sleep(self.interval)
+        connection.close()
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        return self.samples
+
+
+def deadlocks():
+    with connection.cursor() as cursor:
+        cursor.execute(DEADLOCKS_SQL)
+        return cursor.fetchone()[0]
+
+
+def measured_storm(label, mode, task, worker_args):
+    deadlocks_before = deadlocks()
+    monitor = LockMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    results = storm(mode, task, worker_args)
+    elapsed = time.perf_counter() - started
+    samples = monitor.stop()
+
+    latencies = sorted(seconds for _, seconds in results)
+    statuses = {}
+    for code, _ in results:
+        statuses[code] = statuses.get(code, 0) + 1
+    waiting = [count for count in samples if count]
+    print(f"  {label:<9} {len(results) / elapsed:>7.1f} req/s  p50 {percentile(latencies, 0.5) * 1000:>6.1f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:>6.1f} ms  p99 {percentile(latencies, 0.99) * 1000:>6.1f} ms  "
+          f"statuses {dict(sorted(statuses.items()))}")
+    print(f"  {'':<9} lock waits in {len(waiting)}/{len(samples)} samples, "
+          f"max {max(samples, default=0)} backends waiting, deadlocks {deadlocks() - deadlocks_before}")
+    return statuses
+
+
+def check_invariants(space):
+    failures = []
+    with connection.cursor() as cursor:
+        cursor.execute(OVERLAPPING_APPROVALS_SQL, [space.id])
+        overlaps = cursor.fetchall()
+    if overlaps:
+        failures.append(f"{len(overlaps)} overlapping approved schedules, e.g. {overlaps[:3]}")
+    approved = Reservation.objects.filter(space=space, status="approved")
+    missing = approved.filter(schedule__event_instance__isnull=True).count()
+    if missing:
+        failures.append(f"{missing} approved reservations without an event")
+    events = Event.objects.filter(space=space).count()
+    if events != approved.count():
+        failures.append(f"{events} events for {approved.count()} approved reservations")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent clients per storm.")
+    parser.add_argument("--requests", type=int, default=20, help="Reservation requests per worker per round.")
+    parser.add_argument("--rounds", type=int, default=3, help="Rounds per mode, each on a fresh date.")
+    parser.add_argument("--hot-codes", type=int, default=4, help="Hour codes the reservation storm aims at.")
+    parser.add_argument("--modes", nargs="+", choices=("threads", "processes"), default=["threads", "processes"])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="Keep the race fixture for inspection.")
+    args = parser.parse_args()
+    if connection.vendor != "postgresql":
+        raise SystemExit("Needs PostgreSQL: SQLite serializes all writers, so nothing would race.")
+    if args.workers < 2:
+        raise SystemExit("--workers must be at least 2.")
+
+    setup_test_environment()
+    # Refused requests (400/409) are expected by the hundreds; keep the log for server errors.
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    call_command("seed_load_data", tag=TAG, flush=True, seed=args.seed, managers=1, spaces=1, students=args.workers * 2,
+                 staff=0, schedules=0, stdout=io.StringIO())
+    space = Space.objects.select_related("space_manager__user").get(address__startswith=f"[{TAG}]")
+    manager = space.space_manager
+    students = list(Student.objects.select_related("user")
+                    .filter(user__email__endswith=f"@{TAG}.seed.test", is_approved=True).order_by("id")[:args.workers])
+    if len(students) < args.workers:
+        raise SystemExit("Not enough approved students in the fixture; try another --seed.")
+    student_tokens = [str(refresh_token_for(s.user, "student", s.id).access_token) for s in students]
+    manager_token = str(refresh_token_for(manager.user, "space_manager", manager.id).access_token)
+    codes = list(HourSlot.objects.order_by("code").values_list("code", flat=True))[:args.hot_codes + 1]
+
+    failures, server_errors = [], 0
+    try:
+        day = FIRST_DATE
+        for mode in args.modes:
+            for round_no in range(args.rounds):
+                print(f"{mode}, round {round_no + 1}, {day} ({args.workers} workers)")
+                statuses = measured_storm("reserve", mode, reserve_worker, [
+                    (space.id, token, day, codes, args.requests, args.seed * 1000 + round_no * 100 + n)
+                    for n, token in enumerate(student_tokens)
+                ])
+                server_errors += sum(count for code, count in statuses.items() if code >= 500)
+                pending = list(Reservation.objects.filter(space=space, schedule__date=day, status="under_review")
+                               .values_list("id", flat=True))
+                statuses = measured_storm("decide", mode, decide_worker, [
+                    (manager_token, pending, args.seed * 1000 + round_no * 100 + n) for n in range(args.workers)
+                ])
+                server_errors += sum(count for code, count in statuses.items() if code >= 500)
+                day += timedelta(days=7)
+        failures = check_invariants(space)
+        if server_errors:
+            failures.append(f"{server_errors} requests failed with a 5xx")
+        approved = Reservation.objects.filter(space=space, status="approved").count()
+        total = Reservation.objects.filter(space=space).count()
+        print(f"\n{total} reservations, {approved} approved")
+    finally:
+        if not args.keep:
+            call_command("seed_load_data", tag=TAG, flush_only=True, stdout=io.StringIO())
+
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: no overlapping approvals, one event per approved reservation, no server errors")
+
+
+if __name__ == "__main__":
+    main()
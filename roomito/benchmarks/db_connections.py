@@ -0,0 +1,99 @@
+"""
+Request latency under each DB_CONN_MODE (see settings).
+
+Each mode runs in its own subprocess, because the connection settings are
+fixed at startup. The child process drives the views through the same
+request_started / request_finished signals a real server fires. Those
+signals are what close, keep or return connections. Run from the project
+directory against a real Postgres:
+
+    python -m benchmarks.db_connections [--modes none persistent pool] [--requests 300]
+
+Measured paths: spaces/list/ and schedules/availability/ (first space, --date).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def child(requests, date):
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+    django.setup()
+
+    from django.conf import settings
+    from django.core import signals
+    from django.db import connection
+    from rest_framework.test import APIRequestFactory
+
+    from common.authentication import refresh_token_for
+    from space_managers.models import Space
+    from space_managers.views import ScheduleAvailabilityView, SpaceListView
+    from students.models import Student
+
+    student = Student.objects.select_related("user").filter(is_approved=True).first()
+    space = Space.objects.order_by("id").first()
+    if student is None or space is None:
+        raise SystemExit("Needs at least one approved student and one space (see seed_load_data).")
+    token = str(refresh_token_for(student.user, "student", student.id).access_token)
+    signals.request_finished.send(sender=None)
+    connection.close()
+
+    factory = APIRequestFactory()
+    cases = [
+        ("spaces/list/", SpaceListView.as_view(throttle_classes=[]), {}),
+        ("schedules/availability/", ScheduleAvailabilityView.as_view(throttle_classes=[]),
+         {"date": date, "space_id": space.id}),
+    ]
+    results = {}
+    for path, view, params in cases:
+        timings = []
+        for _ in range(requests):
+            request = factory.get(f"/api/{path}", params, HTTP_AUTHORIZATION=f"Bearer {token}")
+            started = time.perf_counter()
+            signals.request_started.send(sender=None)
+            response = view(request)
+            response.render()
+            signals.request_finished.send(sender=None)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == 200, (path, response.status_code)
+        timings.sort()
+        results[path] = {
+            "mean_ms": statistics.fmean(timings) * 1000,
+            "p50_ms": timings[len(timings) // 2] * 1000,
+            "p99_ms": timings[int(len(timings) * 0.99)] * 1000,
+        }
+    print(json.dumps({"mode": settings.DB_CONN_MODE, "results": results}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["none", "persistent", "pool"],
+                        choices=["none", "persistent", "pool", "pgbouncer"])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--date", default="2026-10-02")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.requests, args.date)
+
+    print(f"{'mode':<11} {'path':<26} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.db_connections", "--child",
+             "--requests", str(args.requests), "--date", args.date],
+            env={**os.environ, "DB_CONN_MODE": mode}, capture_output=True, text=True, check=True,
+        ).stdout
+        report = json.loads(out.strip().splitlines()[-1])
+        for path, r in report["results"].items():
+            print(f"{mode:<11} {path:<26} {r['mean_ms']:>8.2f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
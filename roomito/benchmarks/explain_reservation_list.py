@@ -0,0 +1,125 @@
+"""
+Plan check of the space manager's reservation list (spacemanager/reservations/).
+
+Builds the list's query through ManagerReservationListView.reservations() for each
+filter combination the endpoint accepts, first page and deep behind a cursor. For each
+one it runs EXPLAIN (FORMAT JSON) on the configured PostgreSQL database, which should
+hold production-scale data (see ``seed_load_data``), and checks the plan:
+
+- no sequential scan of the reservation or schedule table
+- one of the indexes expected for that filter is used
+
+The exit status is 1 when a plan fails a check. ``--analyze`` also executes the
+queries and prints their actual time; ``--verbose`` prints every plan.
+
+    python -m benchmarks.explain_reservation_list [--manager-id ID] [--limit 50] [--analyze] [--verbose]
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+
+from space_managers.models import Reservation  # noqa: E402
+from space_managers.views import ManagerReservationListView  # noqa: E402
+
+LARGE_TABLES = {"space_managers_reservation", "space_managers_schedule"}
+BY_DATE = {"schedule_date_start_idx", "schedule_space_date_idx"}
+BY_SPACE = {"reservation_space_status_idx", "schedule_space_date_idx"}
+
+
+def busiest_manager():
+    row = (Reservation.objects.values("space__space_manager_id").annotate(n=Count("id"))
+           .exclude(space__space_manager_id=None).order_by("-n").first())
+    return row["space__space_manager_id"] if row else None
+
+
+def cases(manager_id):
+    """(name, filters, cursor key or None, acceptable indexes)."""
+    listed = ManagerReservationListView.reservations(manager_id)
+    space_id = (listed.values("space_id").annotate(n=Count("id")).order_by("-n").values_list("space_id", flat=True)
+                .first())
+    count = listed.count()
+    deep = listed.values_list("schedule__date", "schedule__start_hour_code", "id")[count // 2]
+    last_day = deep[0]
+    window = {"schedule__date__gte": last_day - timedelta(days=30), "schedule__date__lte": last_day}
+    combos = [
+        ("no filter", {}, BY_DATE),
+        ("status=under_review", {"status__in": ["under_review"]}, BY_DATE | BY_SPACE),
+        ("status=approved,rejected", {"status__in": ["approved", "rejected"]}, BY_DATE | BY_SPACE),
+        ("reservation_type=event", {"reservation_type__in": ["event"]}, BY_DATE),
+        (f"space_id={space_id}", {"space_id": space_id}, BY_DATE | BY_SPACE),
+        (f"space_id={space_id}, status=under_review", {"space_id": space_id, "status__in": ["under_review"]},
+         BY_SPACE),
+        ("30-day date range", window, BY_DATE),
+        ("30-day date range, status=approved", {**window, "status__in": ["approved"]}, BY_DATE | BY_SPACE),
+    ]
+    for name, filters, indexes in combos:
+        yield name, filters, None, indexes
+        yield f"{name}, deep cursor", filters, deep, indexes
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def check(plan, indexes):
+    """Problems found in a JSON plan; empty when it passes."""
+    nodes = list(plan_nodes(plan["Plan"]))
+    problems = [f"Seq Scan on {node['Relation Name']}" for node in nodes
+                if node["Node Type"] in ("Seq Scan", "Parallel Seq Scan") and node.get("Relation Name") in LARGE_TABLES]
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+    if not used & indexes:
+        problems.append(f"none of {', '.join(sorted(indexes))} used (used: {', '.join(sorted(used)) or 'no index'})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manager-id", type=int, default=None, help="Default: the manager with the most reservations.")
+    parser.add_argument("--limit", type=int, default=ManagerReservationListView.default_limit,
+                        help="Page size; the view fetches one row more.")
+    parser.add_argument("--analyze", action="store_true", help="Execute the queries and report their actual time.")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan.")
+    args = parser.parse_args()
+
+    if connection.vendor != "postgresql":
+        raise SystemExit(f"The plans checked are PostgreSQL's; the configured database is {connection.vendor}.")
+    manager_id = args.manager_id or busiest_manager()
+    if not manager_id:
+        raise SystemExit("No reservations in the database; seed some with seed_load_data first.")
+
+    failures = []
+    print(f"manager {manager_id}\n")
+    print(f"{'query':<56} {'result':<6} {'ms':>8}")
+    for name, filters, after, indexes in cases(manager_id):
+        page = ManagerReservationListView.reservations(manager_id, filters, after)[:args.limit + 1]
+        plan = json.loads(page.explain(format="json", analyze=args.analyze))[0]
+        problems = check(plan, indexes)
+        elapsed = f"{plan['Execution Time']:.1f}" if args.analyze else "-"
+        print(f"{name:<56} {'FAIL' if problems else 'ok':<6} {elapsed:>8}")
+        for problem in problems:
+            print(f"    {problem}")
+        if args.verbose or problems:
+            print(page.explain(analyze=args.analyze))
+        if problems:
+            failures.append(name)
+
+    if failures:
+        print(f"\nFAILED: {len(failures)} plan(s) do not use the list's indexes: " + "; ".join(failures))
+        sys.exit(1)
+    print("\nOK: every plan reads the reservation and schedule tables through an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Closed-loop HTTP load generator for comparing serving setups.
+
+Each of --concurrency threads keeps one keep-alive connection and sends GET
+requests back to back for --duration seconds; the report gives requests/s
+and latency percentiles per path. Standard library only, so it runs against
+any server:
+
+    python manage.py runserver 8000 &
+    gunicorn roomito.asgi:application -c gunicorn.conf.py --bind 127.0.0.1:8001 &
+    python -m benchmarks.http_load --base http://127.0.0.1:8000 --token "$ACCESS" spaces/list/
+    python -m benchmarks.http_load --base http://127.0.0.1:8001 --token "$ACCESS" spaces/list/
+
+Paths are relative to /api/. Without --token, --login role:username:password
+obtains one through api/login/.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def login(base, credentials):
+    role, username, password = credentials.split(":", 2)
+    parts = urlsplit(base)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    body = json.dumps({"role": role, "username": username, "password": password})
+    conn.request("POST", "/api/login/", body=body, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    payload = json.loads(response.read() or b"{}")
+    if response.status != 200:
+        raise SystemExit(f"login failed ({response.status}): {payload}")
+    return payload["access"]
+
+
+def worker(base, path, headers, deadline, latencies, statuses, lock):
+    parts = urlsplit(base)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    local_latencies = []
+    local_statuses = {}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            code = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            code = "error"
+        local_latencies.append(time.perf_counter() - started)
+        local_statuses[code] = local_statuses.get(code, 0) + 1
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        for code, count in local_statuses.items():
+            statuses[code] = statuses.get(code, 0) + count
+
+
+def run(base, path, headers, concurrency, duration):
+    latencies, statuses, lock = [], {}, threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(base, path, headers, deadline, latencies, statuses, lock))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Paths under /api/, e.g. spaces/list/ 'globalSearch/?search=hall'")
+    parser.add_argument("--base", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", help="JWT access token.")
+    parser.add_argument("--login", help="role:username:password used to obtain a token.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per path.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines.")
+    args = parser.parse_args()
+
+    token = args.token or (login(args.base, args.login) if args.login else None)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    if not args.json:
+        print(f"{args.base}  concurrency={args.concurrency}  {args.duration:.0f}s per path")
+        print(f"{'path':<48} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for path in args.paths:
+        result = run(args.base, "/api/" + path.lstrip("/"), headers, args.concurrency, args.duration)
+        if args.json:
+            print(json.dumps({"base": args.base, "concurrency": args.concurrency, **result}))
+        else:
+            print(f"{result['path']:<48} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                  f"{result['p99_ms']:>8.1f}  {result['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
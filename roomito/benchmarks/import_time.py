@@ -0,0 +1,77 @@
+"""
+Worker boot cost: django.setup() plus loading the URLconf, which imports every view.
+
+Runs the boot in --runs fresh interpreters under ``python -X importtime``. It
+reports the median wall time, peak RSS and module count, and then the
+modules with the most self import time, summed over the project's own
+packages. Run from the project directory:
+
+    python -m benchmarks.import_time [--runs 7] [--top 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BOOT = """
+import json, os, resource, sys, time
+started = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "schema_docs_loaded": sorted(m for m in sys.modules if m.endswith(".schema_docs")),
+}))
+"""
+
+PROJECT_PACKAGES = ("common", "roomito", "space_managers", "staffs", "students")
+
+
+def boot_once():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        capture_output=True, text=True, check=True, env={**os.environ},
+    )
+    self_us = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _cumulative, name = line[len("import time:"):].split("|")
+        self_us[name.strip()] = int(own)
+    return json.loads(result.stdout.strip().splitlines()[-1]), self_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    reports, self_times = [], defaultdict(list)
+    for _ in range(args.runs):
+        report, self_us = boot_once()
+        reports.append(report)
+        for name, us in self_us.items():
+            self_times[name].append(us)
+
+    median = {name: statistics.median(values) for name, values in self_times.items()}
+    print(f"boot (setup + urls): {statistics.median(r['seconds'] for r in reports) * 1000:.0f} ms median of {args.runs}, "
+          f"peak RSS {statistics.median(r['max_rss_kb'] for r in reports) / 1024:.1f} MiB, "
+          f"{reports[0]['modules']} modules, schema docs loaded: {reports[0]['schema_docs_loaded'] or 'none'}")
+    project = sum(us for name, us in median.items() if name.split(".")[0] in PROJECT_PACKAGES)
+    print(f"project modules self import time: {project / 1000:.1f} ms")
+    print(f"\n{'self ms':>8}  module")
+    for name, us in sorted(median.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{us / 1000:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
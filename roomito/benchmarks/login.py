@@ -0,0 +1,95 @@
+"""
+Logins per second per core through UnifiedLoginView.
+
+Creates a throwaway approved student, runs --logins sequential logins on one
+thread for each PBKDF2 iteration count in --iterations, and reports logins/s
+and queries per login. It then fires --burst concurrent logins from
+--threads threads to show how LOGIN_MAX_CONCURRENT_HASHES turns the excess
+into fast 503s instead of a CPU pile-up. Run from the project directory:
+
+    python -m benchmarks.login [--logins 20] [--iterations 1000000 600000 260000] [--threads 8 --burst 32]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from asgiref.sync import async_to_sync
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test.utils import CaptureQueriesContext, override_settings  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from common.views import UnifiedLoginView  # noqa: E402
+from students.models import Student  # noqa: E402
+
+USERNAME = "bench-login-0001"
+PASSWORD = "Bench-login-pass-1"
+
+
+def make_student(iterations):
+    User.objects.filter(username=USERNAME).delete()
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+        user = User(username=USERNAME)
+        user.set_password(PASSWORD)
+        user.save()
+    Student.objects.create(user=user, student_id=USERNAME[-12:], national_id="9999999999", is_approved=True)
+
+
+def login(view, factory):
+    request = factory.post("/api/login/", {"role": "student", "username": USERNAME, "password": PASSWORD},
+                           format="json")
+    return async_to_sync(view)(request).status_code
+
+
+def threaded_login(view, factory):
+    try:
+        return login(view, factory)
+    finally:
+        connections.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--iterations", type=int, nargs="+", default=[1_000_000, 600_000, 260_000])
+    parser.add_argument("--threads", type=int, default=0, help="Burst test threads (0 skips the burst test).")
+    parser.add_argument("--burst", type=int, default=32)
+    args = parser.parse_args()
+
+    view = UnifiedLoginView.as_view(throttle_classes=[])
+    factory = APIRequestFactory()
+    try:
+        print(f"{'iterations':>10} {'logins/s/core':>14} {'ms/login':>9} {'queries':>8}")
+        for iterations in args.iterations:
+            make_student(iterations)
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+                assert login(view, factory) == 200  # warm-up; also settles any rehash
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    for _ in range(args.logins):
+                        assert login(view, factory) == 200
+                elapsed = time.perf_counter() - started
+            print(f"{iterations:>10} {args.logins / elapsed:>14.1f} {elapsed / args.logins * 1000:>9.1f} "
+                  f"{len(queries) / args.logins:>8.1f}")
+
+        if args.threads:
+            make_student(args.iterations[0])
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=args.iterations[0]):
+                started = time.perf_counter()
+                with ThreadPoolExecutor(args.threads) as pool:
+                    codes = list(pool.map(lambda _: threaded_login(view, factory), range(args.burst)))
+                elapsed = time.perf_counter() - started
+            print(f"burst: {args.burst} logins on {args.threads} threads in {elapsed:.2f}s -> "
+                  f"{codes.count(200)} ok, {codes.count(503)} busy (503)")
+    finally:
+        User.objects.filter(username=USERNAME).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Where queries go once read replicas are configured (DB_REPLICA_HOSTS).
+
+Replays read endpoints through the full middleware stack and counts the queries
+served by each database alias. Then it checks read-your-writes: a student
+reserves a slot and immediately lists myreservations/, once while pinned to
+the primary and once more after the pin has expired. Run it against a
+primary and a replica. Two local databases will do, e.g. a copy made with
+``createdb -T roomito roomito_replica``:
+
+    DB_REPLICA_HOSTS=127.0.0.1 DB_REPLICA_NAME=roomito_replica python -m benchmarks.replica_routing
+
+With a static copy standing in for the replica, the unpinned read is expected
+to miss the new reservation. That is the staleness the pin prevents.
+"""
+import contextlib
+import datetime
+import json
+import os
+import random
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+
+from common.authentication import refresh_token_for  # noqa: E402
+from common.db_routing import _pin_key  # noqa: E402
+from space_managers.models import HourSlot, Reservation, Space, SpaceManager  # noqa: E402
+from students.models import Student  # noqa: E402
+
+
+def bearer(user, role, profile_id):
+    return {"HTTP_AUTHORIZATION": f"Bearer {refresh_token_for(user, role, profile_id).access_token}"}
+
+
+def queries_by_alias(call):
+    with contextlib.ExitStack() as stack:
+        captured = {alias: stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in settings.DATABASES}
+        response = call()
+    return response, {alias: len(queries) for alias, queries in captured.items() if len(queries)}
+
+
+def main():
+    if not settings.DATABASE_REPLICAS:
+        raise SystemExit("No replicas configured; set DB_REPLICA_HOSTS (and DB_REPLICA_NAME for a local copy).")
+    setup_test_environment()
+    client = Client()
+
+    student = Student.objects.select_related("user").filter(is_approved=True).first()
+    manager = SpaceManager.objects.select_related("user").first()
+    space = Space.objects.order_by("id").first()
+    if student is None or manager is None or space is None:
+        raise SystemExit("Needs an approved student, a space manager and a space (see seed_load_data).")
+    as_student = bearer(student.user, "student", student.id)
+    as_manager = bearer(manager.user, "space_manager", manager.id)
+    cache.delete(_pin_key(student.user_id))
+
+    reads = [
+        ("spaces/list/", as_student),
+        ("events/list/", as_student),
+        ("globalSearch/?search=a", as_student),
+        ("schedules/availability/?date=2026-10-02&space_id=%d" % space.id, as_student),
+        ("spacemanager/reservations/", as_manager),
+        ("myreservations/", as_student),
+    ]
+    print(f"replicas: {', '.join(settings.DATABASE_REPLICAS)}")
+    print(f"{'GET /api/...':<52} {'status':>6}  queries per alias")
+    for path, auth in reads:
+        response, counts = queries_by_alias(lambda: client.get("/api/" + path, **auth))
+        print(f"{path:<52} {response.status_code:>6}  {counts}")
+
+    date = datetime.date(2040, 1, 1) + datetime.timedelta(days=random.randrange(3650))
+    hour = HourSlot.objects.order_by("code").first()
+    body = {"reservation_type": "class", "schedule": {"date": date.isoformat(), "hour_codes": [hour.code]}}
+    response, counts = queries_by_alias(
+        lambda: client.post(f"/api/{space.id}/reserve/", json.dumps(body), content_type="application/json", **as_student)
+    )
+    print(f"{'POST ' + str(space.id) + '/reserve/':<52} {response.status_code:>6}  {counts}")
+    reservation_id = response.json().get("id")
+    try:
+        for label in ("pinned", "pin expired"):
+            response, counts = queries_by_alias(lambda: client.get("/api/myreservations/", **as_student))
+            payload = response.json()
+            visible = isinstance(payload, list) and any(row.get("id") == reservation_id for row in payload)
+            print(f"{'myreservations/ (' + label + ')':<52} {response.status_code:>6}  {counts}  "
+                  f"new reservation visible: {visible}")
+            cache.delete(_pin_key(student.user_id))
+    finally:
+        reservation = Reservation.objects.filter(id=reservation_id).select_related("schedule").first()
+        if reservation is not None:
+            reservation.schedule.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark of the reservation lists: the values_list() fast path against the ModelSerializer path.
+
+Reads the configured database, which should hold production-scale data (see
+``seed_load_data``). Three lists are measured:
+
+- spacemanager/reservations/ for the space manager with the most reservations
+- myreservations/ for the student with the most reservations
+- myreservations/ for the staff member with the most reservations
+
+Each list is built both ways:
+
+- serializer: model instances over select_related joins, through ReservationListSerializer
+  or MyReservationListSerializer, as the views did before
+- values: reservation_list_rows() / my_reservation_list_rows(), as the views do now
+
+Each path is timed twice: building the data (queries included), then the same plus
+rendering it with DRF's JSONRenderer. Reported: best and median over the repeats and
+the speedup. Both paths must render byte-identical JSON; the exit status is 1 when
+they do not.
+
+    python -m benchmarks.reservation_lists [--repeat 5] [--manager-id ID] [--student-id ID] [--staff-id ID]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+django.setup()
+
+from django.db.models import Count  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from common.serializers import MyReservationListSerializer, my_reservation_list_rows  # noqa: E402
+from space_managers.hour_slots import hour_slots  # noqa: E402
+from space_managers.models import Reservation, Space  # noqa: E402
+from space_managers.serializers import ReservationListSerializer, reservation_list_rows  # noqa: E402
+
+
+def manager_serializer_path(space_manager_id):
+    managed_spaces = Space.objects.filter(space_manager_id=space_manager_id)
+    reservations = (
+        Reservation.objects.filter(space__in=managed_spaces)
+        .select_related('space', 'schedule', 'student', 'student__user', 'staff')
+        .order_by('-schedule__date', '-schedule__start_hour_code__code', '-id')
+    )
+    return ReservationListSerializer(reservations, many=True).data
+
+
+def manager_values_path(space_manager_id):
+    return reservation_list_rows(
+        Reservation.objects.filter(space__space_manager_id=space_manager_id)
+        .order_by('-schedule__date', '-schedule__start_hour_code', '-id')
+    )
+
+
+def my_serializer_path(**owner):
+    reservations = (
+        Reservation.objects.filter(**owner)
+        .select_related('schedule', 'space', 'student__user', 'staff')
+        .order_by('-schedule__date', '-id')
+    )
+    return MyReservationListSerializer(reservations, many=True).data
+
+
+def my_values_path(**owner):
+    return my_reservation_list_rows(Reservation.objects.filter(**owner).order_by('-schedule__date', '-id'))
+
+
+def busiest(field):
+    row = (Reservation.objects.filter(**{f"{field}__isnull": False}).values(field)
+           .annotate(n=Count('id')).order_by('-n').first())
+    return row[field] if row else None
+
+
+def timed(build, repeat, render):
+    renderer, timings = JSONRenderer(), []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = build()
+        if render:
+            renderer.render(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--manager-id", type=int, default=None, help="Default: the manager with the most reservations.")
+    parser.add_argument("--student-id", type=int, default=None, help="Default: the student with the most reservations.")
+    parser.add_argument("--staff-id", type=int, default=None, help="Default: the staff member with the most reservations.")
+    args = parser.parse_args()
+
+    manager_id = args.manager_id or busiest('space__space_manager_id')
+    student_id = args.student_id or busiest('student_id')
+    staff_id = args.staff_id or busiest('staff_id')
+    cases = []
+    if manager_id:
+        cases.append((f"spacemanager/reservations/ (manager {manager_id})",
+                      lambda: manager_serializer_path(manager_id), lambda: manager_values_path(manager_id)))
+    if student_id:
+        cases.append((f"myreservations/ (student {student_id})",
+                      lambda: my_serializer_path(student_id=student_id), lambda: my_values_path(student_id=student_id)))
+    if staff_id:
+        cases.append((f"myreservations/ (staff {staff_id})",
+                      lambda: my_serializer_path(staff_id=staff_id), lambda: my_values_path(staff_id=staff_id)))
+    if not cases:
+        raise SystemExit("No reservations in the database; seed some with seed_load_data first.")
+    hour_slots()
+
+    mismatches = []
+    print(f"{'list':<44} {'rows':>7} {'stage':<7} {'serializer ms':>14} {'values ms':>10} {'speedup':>8}")
+    for name, serializer_path, values_path in cases:
+        expected, actual = serializer_path(), values_path()
+        renderer = JSONRenderer()
+        if renderer.render(expected) != renderer.render(actual):
+            mismatches.append(name)
+        for stage, render in (("build", False), ("+json", True)):
+            slow_best, slow_median = timed(serializer_path, args.repeat, render)
+            fast_best, fast_median = timed(values_path, args.repeat, render)
+            print(f"{name:<44} {len(actual):>7} {stage:<7} {slow_best * 1000:>14.1f} {fast_best * 1000:>10.1f} "
+                  f"{slow_best / fast_best:>7.1f}x   (medians {slow_median * 1000:.1f} / {fast_median * 1000:.1f})")
+
+    if mismatches:
+        print("\nFAILED: the two paths render different JSON for: " + "; ".join(mismatches))
+        sys.exit(1)
+    print("\nOK: both paths render identical JSON")
+
+
+if __name__ == "__main__":
+    main()
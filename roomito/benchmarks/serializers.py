@@ -0,0 +1,276 @@
+"""
+Microbenchmark of the hot list serializers on prebuilt in-memory object graphs.
+
+Builds unsaved model instances wired together the way select_related/prefetch_related
+leave them (hour slots, spaces with their manager, features and images, students with
+their user, staff), then times ``Serializer(objects, many=True).data`` for:
+
+    EventSerializer, ReservationListSerializer, MyReservationListSerializer, SpaceListSerializer
+
+Apart from loading the hour slot registry once, no database is touched: every run
+executes under a wrapper that fails on any query, so the numbers are serialization
+CPU only and an N+1 creeping into a serializer shows up as an error here. Reported per serializer and size: best and median seconds over
+the repeats, microseconds per object and objects per second. Results are written as
+JSON and compared with the baseline. The exit status is 1 when a serializer gets
+slower per object than the tolerance allows.
+
+    python -m benchmarks.serializers [--sizes 1000 10000 100000] [--repeat 5]
+    python -m benchmarks.serializers --only EventSerializer --profile   # where the time goes
+    python -m benchmarks.serializers --save-baseline                    # after an intended change
+
+Like all timings, compare only with a baseline taken on the same machine.
+"""
+import argparse
+import cProfile
+import datetime
+import gc
+import json
+import os
+import platform
+import pstats
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from benchmarks.api import git_commit  # noqa: E402
+from common.serializers import MyReservationListSerializer  # noqa: E402
+from space_managers.hour_slots import hour_slots  # noqa: E402
+from space_managers.models import (  # noqa: E402
+    Event, Reservation, Schedule, Space, SpaceFeature, SpaceImage, SpaceManager,
+)
+from space_managers.serializers import EventSerializer, ReservationListSerializer, SpaceListSerializer  # noqa: E402
+from staffs.models import Staff  # noqa: E402
+from students.models import Student  # noqa: E402
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baselines" / "serializers.json"
+RESULTS_DIR = BENCHMARK_DIR / "results"
+
+# Objects shared between the rows, like the distinct spaces and people of a real page.
+POOL = {"managers": 20, "features": 12, "spaces": 300, "students": 3000, "staff": 300}
+
+
+class UnexpectedQuery(AssertionError):
+    pass
+
+
+def _no_queries(execute, sql, params, many, context):
+    raise UnexpectedQuery(f"Serializer ran a query on an in-memory graph: {sql[:200]}")
+
+
+class Graph:
+    """Pools of related instances, and factories for the top-level objects serialized."""
+
+    def __init__(self, seed):
+        rng = self.rng = random.Random(seed)
+        self.slots = [slot.instance() for slot in hour_slots()]
+        managers = [
+            SpaceManager(id=n, first_name=f"Manager{n}", last_name="Seed", username=f"manager{n}",
+                         email=f"manager{n}@seed.test")
+            for n in range(1, POOL["managers"] + 1)
+        ]
+        features = [SpaceFeature(id=n, name=f"Feature {n}") for n in range(1, POOL["features"] + 1)]
+        self.spaces = []
+        for n in range(1, POOL["spaces"] + 1):
+            space = Space(id=n, name=f"Space {n}", address=f"Building {n % 17}, room {n}", capacity=rng.randint(10, 300),
+                          phone_number=rng.choice([None, "", f"0912{n:07d}"]), description="no description",
+                          space_type=rng.choice(Space.SPACE_TYPES)[0], space_manager=rng.choice(managers))
+            images = [SpaceImage(id=n * 10 + i, space=space, image=f"space_photos/space{n}_{i}.jpg")
+                      for i in range(rng.choice([0, 1, 1, 2, 3]))]
+            # What prefetch_related("images", "features") leaves behind.
+            space._prefetched_objects_cache = {"images": images, "features": rng.sample(features, rng.randint(0, 5))}
+            self.spaces.append(space)
+        self.students = []
+        for n in range(1, POOL["students"] + 1):
+            user = User(id=n, username=f"student{n}", first_name=f"Student{n}", last_name="Seed",
+                        email=f"student{n}@seed.test")
+            self.students.append(Student(id=n, user=user, student_id=f"99{n:010d}", national_id=f"9{n:09d}",
+                                         is_approved=True))
+        self.staff = [
+            Staff(id=n, first_name=f"Staff{n}", last_name="Seed", email=f"staff{n}@seed.test",
+                  personnel_code=f"7{n:09d}", national_id=f"8{n:09d}", is_registered=True)
+            for n in range(1, POOL["staff"] + 1)
+        ]
+        self.first_day = datetime.date(2025, 9, 23)
+
+    def schedule(self, n, space):
+        start = self.rng.randrange(len(self.slots))
+        end = min(start + self.rng.choice([0, 0, 1, 1, 2]), len(self.slots) - 1)
+        return Schedule(id=n, space=space, date=self.first_day + datetime.timedelta(days=n % 365),
+                        start_hour_code=self.slots[start], end_hour_code=self.slots[end])
+
+    def reservations(self, count):
+        rows = []
+        for n in range(1, count + 1):
+            space = self.rng.choice(self.spaces)
+            by_student = self.rng.random() < 0.8
+            rows.append(Reservation(
+                id=n, space=space, schedule=self.schedule(n, space),
+                reservation_type=self.rng.choice(Reservation.RESERVATION_TYPES)[0],
+                reservee_type="student" if by_student else "staff",
+                student=self.rng.choice(self.students) if by_student else None,
+                staff=None if by_student else self.rng.choice(self.staff),
+                phone_number=f"0935{n % 10_000_000:07d}", description="no description",
+                status=self.rng.choice(Reservation.STATUSES)[0],
+                manager_comment=self.rng.choice([None, "", "See the notes on the door."]),
+            ))
+        return rows
+
+    def events(self, count):
+        rows = []
+        for n in range(1, count + 1):
+            space = self.rng.choice(self.spaces)
+            by_student = self.rng.random() < 0.4
+            rows.append(Event(
+                id=n, title=f"Event {n}", event_type=self.rng.choice(Event.EVENT_TYPES)[0], space=space,
+                poster=self.rng.choice([None, f"event_posters/event{n}.jpg"]),
+                organizer="student" if by_student else "staff",
+                student_organizer=self.rng.choice(self.students) if by_student else None,
+                staff_organizer=None if by_student else self.rng.choice(self.staff),
+                contact_info="contact@seed.test", registration_link="https://seed.test/register",
+                description="no description", schedule=self.schedule(n, space),
+            ))
+        return rows
+
+    def spaces_list(self, count):
+        return [self.spaces[n % len(self.spaces)] for n in range(count)]
+
+
+CASES = {
+    "EventSerializer": (EventSerializer, Graph.events),
+    "ReservationListSerializer": (ReservationListSerializer, Graph.reservations),
+    "MyReservationListSerializer": (MyReservationListSerializer, Graph.reservations),
+    "SpaceListSerializer": (SpaceListSerializer, Graph.spaces_list),
+}
+
+
+def serialize(serializer_class, objects, context):
+    return serializer_class(objects, many=True, context=context).data
+
+
+def measure(serializer_class, objects, context, repeat):
+    timings = []
+    for _ in range(repeat):
+        # Collect the previous run's garbage outside the timed region.
+        gc.collect()
+        started = time.perf_counter()
+        serialize(serializer_class, objects, context)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "objects": len(objects),
+        "best_s": round(best, 4),
+        "median_s": round(statistics.median(timings), 4),
+        "us_per_object": round(best / len(objects) * 1e6, 2),
+        "objects_per_s": round(len(objects) / best),
+        "repeat": repeat,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the comparison; return the regressions found."""
+    regressions = []
+    print(f"\n{'vs baseline (us/object)':<40} {'before':>10} {'after':>10}")
+    for name, current in results["serializers"].items():
+        previous = baseline["serializers"].get(name)
+        if previous is None:
+            print(f"{name:<40} (new)")
+            continue
+        flag = current["us_per_object"] > previous["us_per_object"] * (1 + tolerance)
+        if flag:
+            regressions.append(name)
+        print(f"{name:<40} {previous['us_per_object']:>10.2f} {current['us_per_object']:>10.2f}"
+              f"{'  REGRESSION' if flag else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per serializer and size; the best counts.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="*", default=None, choices=list(CASES), help="Serializers to run (default: all).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Instead of timing, profile one run at the largest size and print the top functions.")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results file (default: benchmarks/results/serializers-<timestamp>.json).")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed growth in us/object (0.2 = +20%%).")
+    args = parser.parse_args()
+
+    setup_test_environment()
+    # Absolute URLs are built the way the views build them.
+    context = {"request": RequestFactory().get("/api/events/list/")}
+    cases = {name: case for name, case in CASES.items() if not args.only or name in args.only}
+    hour_slots()
+    for connection in connections.all():
+        connection.execute_wrappers.append(_no_queries)
+
+    if args.profile:
+        size = max(args.sizes)
+        for name, (serializer_class, build) in cases.items():
+            objects = build(Graph(args.seed), size)
+            profiler = cProfile.Profile()
+            profiler.runcall(serialize, serializer_class, objects, context)
+            print(f"\n{name}, {size} objects")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("tottime").print_stats(15)
+        return
+
+    serializers = {}
+    print(f"{'serializer':<40} {'best s':>8} {'median s':>9} {'us/object':>10} {'objects/s':>11}")
+    for name, (serializer_class, build) in cases.items():
+        for size in args.sizes:
+            objects = build(Graph(args.seed), size)
+            serialize(serializer_class, objects[:100], context)  # warm up field binding and lazy imports
+            result = serializers[f"{name}[{size}]"] = measure(serializer_class, objects, context, args.repeat)
+            print(f"{name + f'[{size}]':<40} {result['best_s']:>8.3f} {result['median_s']:>9.3f} "
+                  f"{result['us_per_object']:>10.2f} {result['objects_per_s']:>11}")
+            del objects
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "serializers": serializers,
+    }
+    output = args.output or RESULTS_DIR / f"serializers-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nresults: {output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline saved: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    if regressions:
+        print("\nregressions: " + ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
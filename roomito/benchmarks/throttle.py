@@ -0,0 +1,105 @@
+"""
+Per-request overhead of the API throttles.
+
+Compares DRF's UserRateThrottle (full timestamp history per client) with the
+sliding-window counter from common.throttling, on every cache backend the
+settings can select. Run from the project directory:
+
+    python -m benchmarks.throttle [--requests 2000] [--clients 1] [--backends locmem file db redis]
+
+The "db" backend needs `manage.py createcachetable`, "redis" needs REDIS_URL.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "roomito.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache.backends.db import DatabaseCache  # noqa: E402
+from django.core.cache.backends.filebased import FileBasedCache  # noqa: E402
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework.throttling import UserRateThrottle  # noqa: E402
+from rest_framework_simplejwt.models import TokenUser  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from common.throttling import SlidingWindowUserRateThrottle  # noqa: E402
+
+
+def make_cache(name, tmpdir):
+    if name == "locmem":
+        return LocMemCache("bench-throttle", {})
+    if name == "file":
+        return FileBasedCache(tmpdir, {"OPTIONS": {"MAX_ENTRIES": 100000}})
+    if name == "db":
+        return DatabaseCache("roomito_cache", {})
+    if name == "redis":
+        from django.core.cache.backends.redis import RedisCache
+        return RedisCache(os.environ.get("REDIS_URL", "redis://localhost:6379/1"), {})
+    raise ValueError(name)
+
+
+def make_requests(clients):
+    factory = APIRequestFactory()
+    requests = []
+    for client_id in range(1, clients + 1):
+        token = AccessToken()
+        token[settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id")] = client_id
+        request = factory.get("/api/spaces/list/")
+        request.user = TokenUser(token)
+        requests.append(request)
+    return requests
+
+
+def run(throttle_class, cache, requests, total):
+    class Throttle(throttle_class):
+        rate = f"{total}/hour"
+
+    Throttle.cache = cache
+    cache.clear()
+    timings = []
+    allowed = 0
+    for i in range(total):
+        request = requests[i % len(requests)]
+        started = time.perf_counter()
+        allowed += Throttle().allow_request(request, None)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "allowed": allowed,
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=1,
+                        help="Distinct users; with 1 client DRF's history grows to --requests entries.")
+    parser.add_argument("--backends", nargs="+", default=["locmem", "file"],
+                        choices=["locmem", "file", "db", "redis"])
+    args = parser.parse_args()
+
+    requests = make_requests(args.clients)
+    print(f"{args.requests} requests from {args.clients} client(s)")
+    print(f"{'backend':<8} {'throttle':<14} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for backend in args.backends:
+            cache = make_cache(backend, tmpdir)
+            for label, throttle_class in (("drf-history", UserRateThrottle),
+                                          ("sliding", SlidingWindowUserRateThrottle)):
+                result = run(throttle_class, cache, requests, args.requests)
+                print(f"{backend:<8} {label:<14} {result['mean_us']:>9.1f} {result['p50_us']:>9.1f} "
+                      f"{result['p99_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, for read endpoints served under ASGI.
+
+    Authentication, permission and throttle checks (``initial``) still run the
+    regular synchronous DRF machinery, in a worker thread; the handler itself runs
+    on the event loop and should query through Django's async ORM API. Every
+    handler on a subclass must be ``async def`` (Django refuses mixed views).
+
+    Handlers overriding a documented synchronous handler inherit its
+    ``@extend_schema`` or ``@lazy_schema`` annotation, so an async variant can
+    subclass the sync view and only redefine ``get``.
+    """
+
+    schema_attributes = ('kwargs', 'schema_docs')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for method in cls.http_method_names:
+            handler = cls.__dict__.get(method)
+            if handler is None or any(hasattr(handler, attr) for attr in cls.schema_attributes):
+                continue
+            for base in cls.__mro__[1:]:
+                documented = base.__dict__.get(method)
+                if documented is not None and any(hasattr(documented, attr) for attr in cls.schema_attributes):
+                    for attr in cls.schema_attributes:
+                        if hasattr(documented, attr):
+                            setattr(handler, attr, getattr(documented, attr))
+                    break
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = await handler(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
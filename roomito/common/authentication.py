@@ -0,0 +1,140 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .db_routing import bind_user
+
+
+ROLE_CLAIM = 'role'
+
+PROFILE_ID_CLAIMS = {
+    'student': 'student_id',
+    'staff': 'staff_id',
+    'space_manager': 'space_manager_id',
+}
+
+PROFILE_ACCESSORS = {
+    'student': 'student_profile',
+    'staff': 'staff',
+    'space_manager': 'spacemanager',
+}
+
+
+def refresh_token_for(user, role, profile_id):
+    """Issue a refresh token (and derived access token) carrying the login role and profile ID."""
+    refresh = RefreshToken.for_user(user)
+    refresh[ROLE_CLAIM] = role
+    refresh[PROFILE_ID_CLAIMS[role]] = profile_id
+    return refresh
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that copies the role claims of the token onto ``request.user``
+    so permissions and views can skip the reverse one-to-one profile lookups.
+    """
+
+    def get_user(self, validated_token):
+        bind_user(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = super().get_user(validated_token)
+        role = validated_token.get(ROLE_CLAIM)
+        if role in PROFILE_ID_CLAIMS:
+            user.token_role = role
+            user.token_profile_id = validated_token.get(PROFILE_ID_CLAIMS[role])
+        return user
+
+
+class RoleClaimsTokenUser(TokenUser):
+    """
+    Stateless user built from a validated role token.
+
+    ``id``, ``token_role`` and ``token_profile_id`` come straight from the claims. Any
+    other attribute (``email``, ``student_profile``, ...) loads the real ``User`` on first
+    access, so read-only views pay for the user query only when they actually need it.
+    """
+
+    @cached_property
+    def token_role(self):
+        role = self.token.get(ROLE_CLAIM)
+        return role if role in PROFILE_ID_CLAIMS else None
+
+    @cached_property
+    def token_profile_id(self):
+        if self.token_role is None:
+            return None
+        return self.token.get(PROFILE_ID_CLAIMS[self.token_role])
+
+    @cached_property
+    def user(self):
+        return get_user_model().objects.get(pk=self.id)
+
+    def __eq__(self, other):
+        if isinstance(other, get_user_model()):
+            return self.id == other.pk
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return super().__hash__()
+
+    def __getattr__(self, attr):
+        if attr.startswith('__') or attr == 'token':
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
+
+
+class StatelessRoleClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the token alone, without loading the user row.
+
+    Meant for read-only endpoints: deactivated users and changed passwords are only
+    noticed once the access token expires.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        bind_user(validated_token[api_settings.USER_ID_CLAIM])
+        return RoleClaimsTokenUser(validated_token)
+
+
+class RoleClaimsJWTScheme(SimpleJWTScheme):
+    target_class = 'common.authentication.RoleClaimsJWTAuthentication'
+    match_subclasses = True
+
+
+class StatelessRoleClaimsJWTScheme(RoleClaimsJWTScheme):
+    target_class = 'common.authentication.StatelessRoleClaimsJWTAuthentication'
+
+
+def get_profile_id(user, role):
+    """
+    Return the ``role`` profile ID of ``user``, or ``None``.
+
+    Trusts the token claims when the request was authenticated with a role token and
+    falls back to a profile lookup otherwise (session auth, tokens issued before claims).
+    """
+    if user is None or not user.is_authenticated:
+        return None
+    token_role = getattr(user, 'token_role', None)
+    if token_role is not None:
+        return user.token_profile_id if token_role == role else None
+    profile = getattr(user, PROFILE_ACCESSORS[role], None)
+    return profile.pk if profile is not None else None
+
+
+def get_student_id(user):
+    return get_profile_id(user, 'student')
+
+
+def get_staff_id(user):
+    return get_profile_id(user, 'staff')
+
+
+def get_space_manager_id(user):
+    return get_profile_id(user, 'space_manager')
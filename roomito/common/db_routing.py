@@ -0,0 +1,156 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Tables whose reads must see the latest write: DatabaseCache's table (app_label
+# "django_cache"), which holds the pins below and the throttle counters, and the sessions.
+PRIMARY_ONLY_APPS = frozenset({'django_cache', 'sessions'})
+
+# Routing state of the request being served, or None outside requests (management
+# commands, workers, shell), which always read from the primary.
+_request_state = ContextVar('db_routing_request_state', default=None)
+
+
+class RequestRouting:
+    __slots__ = ('pinned', 'user_id')
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.user_id = None
+
+
+def _pin_key(user_id):
+    return f'db-primary-pin:{user_id}'
+
+
+def _session_pin_key(session_key):
+    return f'db-primary-pin:session:{session_key}'
+
+
+def bind_user(user_id):
+    """
+    Record the authenticated user of the current request.
+
+    Called by the JWT authentication classes. A user who wrote within the last
+    ``DB_REPLICA_STICKY_SECONDS`` keeps reading from the primary, so their own
+    changes never look lost behind replication lag.
+    """
+    state = _request_state.get()
+    if state is None or user_id is None:
+        return
+    state.user_id = user_id
+    if not state.pinned and cache.get(_pin_key(user_id)):
+        state.pinned = True
+
+
+def _in_transaction():
+    # Like Django's own check for durable blocks, the atomic blocks TestCase wraps every
+    # test in do not count, so tests see the routing a request would get.
+    return any(not block._from_testcase for block in connections[DEFAULT_DB_ALIAS].atomic_blocks)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads made while serving a safe (GET/HEAD/OPTIONS) request to a random
+    replica in ``DATABASE_REPLICAS``; everything else goes to ``default``.
+
+    Reads stay on the primary when the request is unsafe, when the user or
+    session is pinned after a recent write, inside a transaction on the
+    primary, for the tables in ``PRIMARY_ONLY_APPS``, and outside requests
+    altogether. Migrations only run on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        state = _request_state.get()
+        if (
+            state is None
+            or state.pinned
+            or not settings.DATABASE_REPLICAS
+            or _in_transaction()
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Opens the routing state for each request and, after an unsafe request by an
+    authenticated user, pins that user to the primary for
+    ``DB_REPLICA_STICKY_SECONDS``. Unsafe requests with a session (the admin,
+    logins) pin the session too, so session-authenticated users, whom
+    ``bind_user`` never sees, also read their own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RequestRouting(pinned=request.method not in SAFE_METHODS)
+        if not state.pinned and (session_key := self.session_key(request)):
+            state.pinned = bool(cache.get(_session_pin_key(session_key)))
+        token = _request_state.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            _request_state.reset(token)
+            if pins := self.pins(request, state):
+                cache.set_many(pins, settings.DB_REPLICA_STICKY_SECONDS)
+
+    async def __acall__(self, request):
+        state = RequestRouting(pinned=request.method not in SAFE_METHODS)
+        if not state.pinned and (session_key := self.session_key(request)):
+            state.pinned = bool(await cache.aget(_session_pin_key(session_key)))
+        token = _request_state.set(state)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+            if pins := self.pins(request, state):
+                await cache.aset_many(pins, settings.DB_REPLICA_STICKY_SECONDS)
+
+    @staticmethod
+    def session_key(request):
+        # The session, once SessionMiddleware has run, is the current one: a login
+        # rotates the key the request came with.
+        session = getattr(request, 'session', None)
+        return (session.session_key if session is not None else None) or \
+            request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+
+    @classmethod
+    def pins(cls, request, state):
+        """Cache keys pinning whoever wrote in this request to the primary."""
+        if request.method in SAFE_METHODS:
+            return {}
+        pins = {}
+        if state.user_id is not None:
+            pins[_pin_key(state.user_id)] = 1
+        if session_key := cls.session_key(request):
+            pins[_session_pin_key(session_key)] = 1
+        return pins
@@ -0,0 +1,47 @@
+from importlib import import_module
+
+from drf_spectacular.generators import SchemaGenerator
+
+
+def lazy_schema(view_or_handler):
+    """
+    Mark a view class or handler as documented in its app's ``schema_docs`` module.
+
+    That module maps ``"<View>"`` / ``"<View>.<method>"`` to the ``@extend_schema(...)``
+    decorator to apply and is imported only by ``LazySchemaGenerator``, so serving
+    requests never compiles or builds the (large) example and response objects.
+    """
+    app = view_or_handler.__module__.rpartition('.')[0]
+    view_or_handler.schema_docs = (f'{app}.schema_docs', view_or_handler.__qualname__)
+    return view_or_handler
+
+
+def _schema_decorator(docs):
+    module, key = docs
+    return import_module(module).SCHEMAS[key]
+
+
+def apply_schema_docs(view_cls):
+    """
+    Apply the registered ``@extend_schema`` decorators to ``view_cls``: handlers first,
+    then the class, the order they would have run in as plain decorators.
+    """
+    if view_cls.__dict__.get('schema_docs_applied'):
+        return
+    for method in view_cls.http_method_names:
+        handler = getattr(view_cls, method, None)
+        docs = getattr(handler, 'schema_docs', None)
+        if docs is not None and 'schema' not in getattr(handler, 'kwargs', {}):
+            _schema_decorator(docs)(handler)
+    docs = getattr(view_cls, 'schema_docs', None)
+    if docs is not None:
+        _schema_decorator(docs)(view_cls)
+    view_cls.schema_docs_applied = True
+
+
+class LazySchemaGenerator(SchemaGenerator):
+    def create_view(self, callback, method, request=None):
+        view_cls = getattr(callback, 'cls', None)
+        if view_cls is not None:
+            apply_schema_docs(view_cls)
+        return super().create_view(callback, method, request)
@@ -0,0 +1,70 @@
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+
+from staffs.models import Staff
+
+
+class LoginBusy(Exception):
+    """Raised when no password-hashing slot frees up within ``LOGIN_HASH_WAIT_SECONDS``."""
+
+
+_hash_slots = threading.BoundedSemaphore(settings.LOGIN_MAX_CONCURRENT_HASHES)
+
+
+def get_login_user(role, username):
+    """
+    Fetch the user for ``role`` together with its role profile in a single query.
+
+    Returns ``(user, profile)``. ``user`` is ``None`` when no account matches and
+    ``profile`` is ``None`` when the account exists but does not have that role.
+    """
+    if role == 'staff':
+        staff = Staff.objects.select_related('user').filter(personnel_code=username).first()
+        if staff is None or not staff.user_id:
+            return None, None
+        return staff.user, staff
+
+    accessor = {'student': 'student_profile', 'space_manager': 'spacemanager'}[role]
+    user = User.objects.select_related(accessor).filter(username=username).first()
+    if user is None:
+        return None, None
+    return user, getattr(user, accessor, None)
+
+
+def _check_in_slot(password, encoded):
+    """
+    Check ``password`` against ``encoded`` once a hashing slot is free.
+
+    Returns ``(valid, upgraded)``, ``upgraded`` being the password rehashed to the
+    current hasher policy when the stored hash is outdated, else ``None``. Touches no
+    model or connection, so it may run on any thread.
+    """
+    if not _hash_slots.acquire(timeout=settings.LOGIN_HASH_WAIT_SECONDS):
+        raise LoginBusy()
+    try:
+        upgraded = []
+        valid = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+        return valid, (upgraded[0] if upgraded else None)
+    finally:
+        _hash_slots.release()
+
+
+async def check_password_bounded(user, password):
+    """
+    ``user.check_password`` with the hashing on executor threads, a bounded number at once.
+
+    Password hashing is deliberately CPU-heavy. Under ASGI every sync view shares one
+    thread, so hashing there would queue the rest of the API behind each login (and a
+    per-process cap would never be reached). The hash runs on its own thread instead
+    (``thread_sensitive=False``), gated by ``LOGIN_MAX_CONCURRENT_HASHES`` slots; an
+    upgraded hash is saved afterwards, on the request's database thread.
+    """
+    valid, upgraded = await sync_to_async(_check_in_slot, thread_sensitive=False)(password, user.password)
+    if upgraded:
+        user.password = upgraded
+        await user.asave(update_fields=['password'])
+    return valid
@@ -0,0 +1,132 @@
+"""
+Prometheus metrics for the API, served in the text exposition format at ``/metrics``.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` (``gunicorn.conf.py``
+does) before ``prometheus_client`` is imported: every process then writes its samples
+to memory-mapped files in that directory and a scrape of any worker sums them all.
+Without it the metrics are the serving process's own.
+"""
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+REQUEST_LATENCY = Histogram(
+    'roomito_http_request_duration_seconds', 'Time spent serving a request, by route.',
+    ['method', 'route'],
+)
+REQUESTS = Counter(
+    'roomito_http_requests_total', 'Responses sent, by route and status code.',
+    ['method', 'route', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'roomito_http_request_db_queries', 'SQL queries run per request, by route.',
+    ['method', 'route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+THROTTLED = Counter(
+    'roomito_throttled_requests_total', 'Requests rejected by a rate throttle, by throttle scope.',
+    ['scope'],
+)
+RESERVATIONS_CREATED = Counter(
+    'roomito_reservations_created_total', 'Reservation requests created.',
+    ['reservee_type', 'reservation_type'],
+)
+RESERVATIONS_DECIDED = Counter(
+    'roomito_reservations_decided_total', 'Reservation requests approved or rejected by a space manager.',
+    ['decision'],
+)
+RESERVATIONS_CONFLICTED = Counter(
+    'roomito_reservations_conflicted_total', 'Reservation requests refused because the time was already taken.',
+    ['reservation_type'],
+)
+
+
+def route_of(request):
+    """URL pattern the request resolved to (bounded label values), not the raw path."""
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else '<unmatched>'
+
+
+class MetricsMiddleware:
+    """
+    Per-route latency, status counts and, with ``SQLProfilingMiddleware`` installed
+    after it, the number of queries each request ran.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    def observe(self, request, response, elapsed):
+        route = route_of(request)
+        REQUEST_LATENCY.labels(request.method, route).observe(elapsed)
+        REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+        profile = getattr(request, 'sql_profile', None)
+        if profile is not None:
+            REQUEST_QUERIES.labels(request.method, route).observe(profile.queries)
+
+
+class OutboxCollector:
+    """Outbox depth by status, read from the database when scraped rather than tracked per process."""
+
+    def collect(self):
+        from space_managers.models import OutboxEmail
+
+        depth = GaugeMetricFamily('roomito_email_outbox_depth', 'Queued notification emails not yet sent, by status.',
+                                  labels=['status'])
+        counts = dict(
+            OutboxEmail.objects.exclude(status='sent')
+            .values_list('status').annotate(count=Count('id')).order_by()
+        )
+        for status in ('pending', 'sending', 'failed'):
+            depth.add_metric([status], counts.get(status, 0))
+        yield depth
+
+
+def process_registry():
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
+
+_outbox_registry = CollectorRegistry(auto_describe=False)
+_outbox_registry.register(OutboxCollector())
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        # Route names, traffic and outbox depth are not for the public internet.
+        return HttpResponseForbidden("Set METRICS_TOKEN to serve /metrics with DEBUG off.")
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    body = generate_latest(process_registry()) + generate_latest(_outbox_registry)
+    return HttpResponse(body, content_type=CONTENT_TYPE_LATEST)
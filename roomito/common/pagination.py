@@ -0,0 +1,53 @@
+"""
+Keyset ("seek") pagination for list endpoints.
+
+A page ends with the sort key of its last row. The next page asks for rows strictly
+after that key, so every page costs the same however deep it is, and rows inserted
+meanwhile neither repeat nor shift later pages, unlike OFFSET. The key travels as an
+opaque ``cursor`` query parameter. The URL of the next page goes in a
+``Link: <...>; rel="next"`` header, which keeps the response body a plain list.
+"""
+import base64
+import binascii
+import json
+from datetime import date
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(key):
+    """Opaque token for a sort key made of ints, strings and dates."""
+    values = [value.isoformat() if isinstance(value, date) else value for value in key]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, length):
+    """The list of ``length`` values encoded by ``encode_cursor``; dates come back as ISO strings."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor("Invalid cursor.")
+    return values
+
+
+def parse_limit(raw, default, maximum):
+    if raw in (None, ''):
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"limit must be an integer between 1 and {maximum}.")
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit must be an integer between 1 and {maximum}.")
+    return limit
+
+
+def next_page_link(request, cursor):
+    """``Link`` header value pointing at the same list and filters, from ``cursor`` on."""
+    params = request.query_params.copy()
+    params['cursor'] = cursor
+    return f'<{request.build_absolute_uri(request.path)}?{params.urlencode()}>; rel="next"'
@@ -0,0 +1,18 @@
+from rest_framework.permissions import IsAuthenticated
+
+from .authentication import get_space_manager_id, get_staff_id, get_student_id
+
+
+class IsSpaceManagerUser(IsAuthenticated):
+    def has_permission(self, request, view):
+        return super().has_permission(request, view) and get_space_manager_id(request.user) is not None
+
+
+class IsStudentUser(IsAuthenticated):
+    def has_permission(self, request, view):
+        return super().has_permission(request, view) and get_student_id(request.user) is not None
+
+
+class IsStaffUser(IsAuthenticated):
+    def has_permission(self, request, view):
+        return super().has_permission(request, view) and get_staff_id(request.user) is not None
@@ -0,0 +1,146 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import drf_spectacular
+import rest_framework
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+SCHEMA_RENDERERS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+
+class SchemaArtifact(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """
+    Version the prebuilt schema is valid for.
+
+    ``CODE_VERSION`` (e.g. the release or commit) when set, otherwise a hash of the
+    project's Python sources and the schema library versions. Computed once per
+    process: code cannot change under a running worker.
+    """
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    digest = hashlib.sha1(f'{drf_spectacular.__version__}:{rest_framework.VERSION}'.encode())
+    base_dir = Path(settings.BASE_DIR)
+    for path in sorted(base_dir.rglob('*.py')):
+        relative = path.relative_to(base_dir)
+        if relative.parts[0].startswith('.') or relative.parts[0] == 'benchmarks':
+            continue
+        digest.update(str(relative).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def _artifact_path(version, fmt):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f'openapi-{version}.{fmt}'
+
+
+def _write_atomically(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def _artifact(body):
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+    return SchemaArtifact(body, gzip.compress(body, compresslevel=9, mtime=0), etag)
+
+
+def build_schema_files(version=None):
+    """Generate the schema once and write every format for ``version`` to disk."""
+    version = version or code_version()
+    schema = generate_schema()
+    artifacts = {}
+    for fmt, renderer_class in SCHEMA_RENDERERS.items():
+        renderer = renderer_class()
+        body = renderer.render(schema, renderer.media_type, {})
+        _write_atomically(_artifact_path(version, fmt), body)
+        artifacts[fmt] = _artifact(body)
+    for stale in Path(settings.OPENAPI_SCHEMA_DIR).glob('openapi-*'):
+        if not stale.name.startswith(f'openapi-{version}.'):
+            stale.unlink(missing_ok=True)
+    return artifacts
+
+
+_artifacts = {}
+_build_lock = threading.Lock()
+
+
+def get_schema_artifact(fmt):
+    """
+    Rendered schema in ``fmt`` for the current code version: from memory, else from
+    the files ``build_openapi_schema`` wrote, else generated now (and written).
+    """
+    version = code_version()
+    artifact = _artifacts.get((version, fmt))
+    if artifact is not None:
+        return artifact
+    with _build_lock:
+        artifact = _artifacts.get((version, fmt))
+        if artifact is None:
+            try:
+                artifact = _artifact(_artifact_path(version, fmt).read_bytes())
+                _artifacts[(version, fmt)] = artifact
+            except FileNotFoundError:
+                for built_fmt, built in build_schema_files(version).items():
+                    _artifacts[(version, built_fmt)] = built
+                artifact = _artifacts[(version, fmt)]
+    return artifact
+
+
+class PrebuiltSpectacularAPIView(SpectacularAPIView):
+    # SpectacularAPIView serving the prebuilt schema instead of introspecting every view
+    # per request. Answers with an ETag (304 on a match) and gzip-compressed bytes when
+    # the client accepts them. Requests for another language or API version still go
+    # through the regular generator. The docstring is the endpoint's public description.
+    __doc__ = SpectacularAPIView.__doc__
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        artifact = get_schema_artifact(renderer.format)
+        content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+        if artifact.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response = HttpResponse(artifact.gzipped, content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(artifact.body, content_type=content_type)
+        response['ETag'] = artifact.etag
+        response['Cache-Control'] = 'no-cache'
+        response['Content-Disposition'] = f'inline; filename="{spectacular_settings.TITLE or "schema"}.{renderer.format}"'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
@@ -0,0 +1,602 @@
+"""OpenAPI documentation of the login, my-reservations/my-events and search views. See common.lazy_schema."""
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    OpenApiTypes,
+)
+
+from .serializers import (
+    ErrorResponseSerializer,
+    EventDetailSerializer,
+    MyEventListSerializer,
+    MyEventUpdateSerializer,
+    MyReservationDetailSerializer,
+    MyReservationListSerializer,
+    ReservationUpdateSerializer,
+    SearchResultSerializer,
+    SuccessResponseSerializer,
+    TokenResponseSerializer,
+    UnifiedLoginSerializer,
+)
+
+
+SCHEMAS = {
+    'UnifiedLoginView': extend_schema(tags=['auth']),
+
+    'UnifiedLoginView.post': extend_schema(
+        request=UnifiedLoginSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=TokenResponseSerializer,
+                description="Login successful",
+                examples=[
+                    OpenApiExample(
+                        "LoginSuccess",
+                        value={"access": "access_token", "refresh": "refresh_token", "role": "staff"},
+                        response_only=True
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Missing fields or invalid input format",
+                examples=[
+                    OpenApiExample(
+                        "InvalidRole",
+                        value={"error": "Invalid role. Must be one of: staff, student, space_manager."},
+                        response_only=True
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unauthorized – invalid credentials or account status",
+                examples=[
+                    OpenApiExample(
+                        "InvalidCredentials", 
+                        value={"error": "Invalid credentials."}, 
+                        response_only=True),
+                    OpenApiExample(
+                        "StudentNotApproved", 
+                        value={"error": "Your student card is not yet approved."}, 
+                        response_only=True),
+                    OpenApiExample(
+                        "NotSpaceManager", 
+                        value={"error": "User is not a space manager."}, 
+                        response_only=True),
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal Server Error – token generation failed",
+                examples=[
+                    OpenApiExample(
+                        "TokenGenerationError", 
+                        value={"error": "Failed to generate token."}, 
+                        response_only=True)
+                ]
+            ),
+            503: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Login capacity exhausted – all password-hashing slots are busy; retry after the Retry-After delay",
+                examples=[
+                    OpenApiExample(
+                        "LoginBusy",
+                        value={"error": "Too many login attempts right now. Please try again shortly."},
+                        response_only=True)
+                ]
+            )
+        },
+        description="Unified login for staffs, students, and space managers (use personnel code for staff and student id for student as usernames)."
+    ),
+
+    'MyReservationsListView': extend_schema(tags=['reservation']),
+
+    'MyReservationsListView.get': extend_schema(
+        description="Retrieve all reservation requests created by the authenticated user (student or staff).",
+        responses={
+            200: OpenApiResponse(
+                response=MyReservationListSerializer(many=True),
+                description="List of user's reservations retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        'SuccessExample',
+                        value=[
+                            {
+                                "id": 5,
+                                "space_name": "string",
+                                "date": "2025-09-01",
+                                "start_time": "09:00:00",
+                                "end_time": "11:00:00",
+                                "status_display": "Under Review",
+                                "manager_comment": "string",
+                                "reservation_type": "event",
+                                "description": "string",
+                                "phone_number": "09123456789"
+                            },
+                            {
+                                "id": 6,
+                                "space_name": "string",
+                                "date": "2025-09-02",
+                                "start_time": "14:00:00",
+                                "end_time": "16:00:00",
+                                "status_display": "Approved",
+                                "manager_comment": "string",
+                                "reservation_type": "class",
+                                "description": "string",
+                                "phone_number": "09351234567"
+                            }
+                        ]
+                    ),
+                    OpenApiExample(
+                        'EmptyList',
+                        value={"message": "You have no reservations."}
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[OpenApiExample('Unauthorized', value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is neither student nor staff.",
+                examples=[OpenApiExample('Forbidden', value={"error": "Only students or staff can view their reservations."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample('ServerError', value={"error": "An unexpected error occurred."})]
+            ),
+        }
+    ),
+
+    'MyReservationDetailView': extend_schema(tags=['reservation']),
+
+    'MyReservationDetailView.get': extend_schema(
+        description="Retrieve a single reservation (only if it belongs to the authenticated user).",
+        parameters=[
+            OpenApiParameter(
+                name="reservation_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="Reservation ID"
+            )
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=MyReservationDetailSerializer,
+                description="Reservation retrieved successfully.",
+                examples=[OpenApiExample(
+                    "Success",
+                    value={
+                        "id": 2,
+                        "reservation_type": "event",
+                        "description": "string",
+                        "status_display": "Rejected",
+                        "phone_number": "09123456789",
+                        "manager_comment": "string",
+                        "date": "2025-09-01",
+                        "space": {
+                                "name": "string",
+                                "capacity": 50,
+                                "address": "string",
+                                "space_type": "hall",
+                                "description": "string"
+                            },
+                        "hosting_association": "string",
+                        "hosting_organizations": "string",
+                        "responsible_organizer": "string",
+                        "position": "Professor"
+                    }
+                )]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Not authenticated.",
+                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation does not belong to the user.",
+                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to view this reservation."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation not found.",
+                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        }
+    ),
+
+    'MyReservationDeleteView': extend_schema(tags=['reservation']),
+
+    'MyReservationDeleteView.delete': extend_schema(
+        description=(
+            "Delete a reservation created by the authenticated user (student or staff). "
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="reservation_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="ID of the reservation to delete"
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=SuccessResponseSerializer,
+                description="Reservation deleted successfully.",
+                examples=[OpenApiExample("Deleted", value={"message": "Reservation deleted successfully."})]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation does not belong to the user.",
+                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to delete this reservation."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation not found.",
+                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        }
+    ),
+
+    'MyReservationUpdateView': extend_schema(tags=['reservation']),
+
+    'MyReservationUpdateView.put': extend_schema(
+        description="Update a reservation created by the authenticated user. Allowed only while status is 'under_review'. Space is NOT editable.",
+        parameters=[
+            OpenApiParameter(
+                name="reservation_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="ID of the reservation to edit"
+            ),
+        ],
+        request=ReservationUpdateSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=SuccessResponseSerializer,
+                description="Reservation updated successfully.",
+                examples=[OpenApiExample("Success", value={"message": "Reservation updated successfully."})]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Validation error or not editable.",
+                examples=[
+                    OpenApiExample("NotEditable", value={"error": "Reservation is not editable."}),
+                    OpenApiExample("BadPhone", value={"phone_number": ["Phone number must be exactly 11 digits."]}),
+                    OpenApiExample("BadSchedule", value={"schedule": ["This reservation has no schedule to update."]}),
+                    OpenApiExample("BadHourCodes", value={"hour_codes": ["Hour codes must be consecutive."]}),
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Not authenticated.",
+                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Not owner.",
+                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to update this reservation."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation not found.",
+                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
+            ),
+            409: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Schedule time conflict.",
+                examples=[OpenApiExample("Conflict", value={"error": "This time conflicts with another schedule on the same date."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Server error.",
+                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        }
+    ),
+
+    'MyEventsListView': extend_schema(tags=['event']),
+
+    'MyEventsListView.get': extend_schema(
+        description="List events organized by the authenticated user (student or staff).",
+        responses={
+            200: OpenApiResponse(
+                response=MyEventListSerializer(many=True),
+                description="My events retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        "Success",
+                        value=[{
+                            "id": 10,
+                            "title": "string",
+                            "event_type": "event",
+                            "description": "string",
+                            "poster": "/media/event_posters/10.jpg",
+                            "space_name": "string",
+                            "date": "2025-09-05",
+                            "start_time": "10:00:00",
+                            "end_time": "12:00:00"
+                        }]
+                    ),
+                    OpenApiExample("EmptyList", value=[]) 
+                ]
+            ),
+            401: OpenApiResponse(response=ErrorResponseSerializer, description="Not authenticated."),
+        }
+    ),
+
+    'MyEventDetailView': extend_schema(tags=['event']),
+
+    'MyEventDetailView.get': extend_schema(
+        description="Retrieve an event details owned by the authenticated user",
+        parameters=[
+            OpenApiParameter(
+                name="event_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="Event ID"
+            )
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=EventDetailSerializer,
+                description="Event details retrieved successfully.",
+                examples=[OpenApiExample(
+                    "Success",
+                    value={
+                        "id": 11,
+                        "title": "string",
+                        "event_type": "class",
+                        "description": "string",
+                        "poster": None,
+                        "organizer": "staff",
+                        "organizer_display": "Staff",
+                        "space": {
+                            "id": 2,
+                            "space_type": "class",
+                            "name": "string",
+                            "address": "string",
+                            "capacity": 40,
+                            "phone_number": "09123456789",
+                            "description": "string",
+                            "features": [{"id": 1, "name": "Projector"}],
+                            "images": [{"id": 5, "url": "/media/space_photos/5.jpg"}]
+                        },
+                        "date": "2025-09-07",
+                        "start_time": "14:00:00",
+                        "end_time": "16:00:00"
+                    }
+                )]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Not authenticated.",
+                examples=[OpenApiExample(
+                    "Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Event is not owned by the user.",
+                examples=[OpenApiExample(
+                    "Forbidden", value={"error": "You are not authorized to view this event."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Event not found.",
+                examples=[OpenApiExample(
+                    "NotFound", value={"error": "Event with this ID does not exist."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample(
+                    "ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        }
+    ),
+
+    'MyEventUpdateView': extend_schema(tags=['event']),
+
+    'MyEventUpdateView.put': extend_schema(
+        tags=['event'],
+        description="Update an event created by the authenticated user.",
+        parameters=[OpenApiParameter(name='event_id', required=True, type=int, location=OpenApiParameter.PATH)],
+        request=MyEventUpdateSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=EventDetailSerializer,
+                description="Event updated successfully.",
+                examples=[OpenApiExample(
+                    name="Success",
+                    value={
+                        "id": 12,
+                        "title": "کارگاه Django - ویرایش شده",
+                        "event_type": "event",
+                        "date": "2025-08-25",
+                        "start_time": "09:00:00",
+                        "end_time": "11:00:00",
+                        "space_name": "تالار برآنی",
+                        "poster_url": None,
+                        "organizer": {"type": "staff", "id": 3, "first_name": "Ali", "last_name": "Ahmadi", "email": "ali@example.com"},
+                        "contact_info": "0913xxxxxxx",
+                        "registration_link": "https://example.com/register",
+                        "description": "متن جدید"
+                    },
+                    response_only=True
+                )]
+            ),
+            400: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Validation error",
+            examples=[
+                OpenApiExample(name="BadURL", value={"registration_link": ["Enter a valid URL."]}, response_only=True),
+                OpenApiExample(name="EmptyTitle", value={"title": ["This field may not be blank."]}, response_only=True),
+                OpenApiExample(name="InvalidImage", value={"poster": ["Invalid image."]}, response_only=True),
+            ]
+        ),
+        401: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Unauthorized",
+            examples=[OpenApiExample(
+                name="Unauthorized",
+                value={"detail": "Authentication credentials were not provided."},
+                response_only=True
+            )]
+        ),
+        403: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Forbidden (not owner)",
+            examples=[OpenApiExample(
+                name="Forbidden",
+                value={"error": "You are not allowed to edit this event."},
+                response_only=True
+            )]
+        ),
+        404: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Not found or not an event",
+            examples=[OpenApiExample(
+                name="NotFound",
+                value={"error": "Event not found or not editable (not an 'event')."},
+                response_only=True
+            )]
+        ),
+        405: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Method not allowed",
+            examples=[OpenApiExample(
+                name="MethodNotAllowed",
+                value={"detail": "Method \"POST\" not allowed."},
+                response_only=True
+            )]
+        ),
+        415: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Unsupported media type",
+            examples=[OpenApiExample(
+                name="UnsupportedMediaType",
+                value={"detail": "Unsupported media type \"application/json\" in request."},
+                response_only=True
+            )]
+        ),
+        500: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Internal server error",
+            examples=[OpenApiExample(
+                name="ServerError",
+                value={"error": "An unexpected server error occurred."},
+                response_only=True
+            )]
+        ),
+        }
+    ),
+
+    'GlobalSearchView.get': extend_schema(
+        description="Search spaces and events by a query string, type keywords and event date.",
+        parameters=[
+            OpenApiParameter(
+                name='search',
+                required=True,
+                type=OpenApiTypes.STR,
+                description="Query string to search in Space.name and Event.title or type keywords.",
+            ),
+            OpenApiParameter(
+                name='event_date',
+                required=False,
+                type=OpenApiTypes.DATE,
+                description="Exact event date filter (YYYY-MM-DD). Filters Event.schedule.date exactly."
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=SearchResultSerializer(many=True),
+                description="Search results returned successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="SuccessExample",
+                        value=[
+                            {"type": "space", "id": 1, "title": "تالار برآنی"},
+                            {"type": "event", "id": 7, "title": "کارگاه Django"},
+                        ],
+                        response_only=True,
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid request.",
+                examples=[
+                    OpenApiExample(
+                        name="BadDate", 
+                        value={"error": "Invalid date format. Use YYYY-MM-DD."}, 
+                        response_only=True
+                    ),
+                ],
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication required.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."},
+                        response_only=True,
+                    )
+                ],
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="No matching spaces or events found.",
+                examples=[
+                    OpenApiExample(
+                        name="NotFound",
+                        value={"error": "No results found for the given query."},
+                        response_only=True,
+                    )
+                ],
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred."},
+                        response_only=True,
+                    ),
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Failed to query database."},
+                        response_only=True,
+                    ),
+                ],
+            ),
+        },
+    ),
+}
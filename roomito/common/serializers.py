@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from space_managers.serializers import SpaceSerializer
-from space_managers.models import Event, HourSlot, Reservation, Schedule, Space
+from space_managers.hour_slots import hour_slots, schedule_end_time, schedule_start_time
+from space_managers.serializers import HourCodeField, SpaceSerializer, without_missing_relations
+from space_managers.models import Event, Reservation, Schedule, Space
 from django.core.exceptions import ValidationError as DjangoValidationError
 
 
@@ -51,20 +52,40 @@ class MyReservationListSerializer(serializers.ModelSerializer):
             'phone_number',
         ]
 
-    def _parse_time_range(self, time_range_str, pick='start'):
-        if not time_range_str or '-' not in time_range_str:
-            return None
-        parts = time_range_str.split('-')
-        val = parts[0] if pick == 'start' else parts[-1]
-        return f"{val}:00" if len(val) == 5 else val
-
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), pick='start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), pick='end')
+        return schedule_end_time(obj.schedule)
+
+
+def my_reservation_list_rows(reservations):
+    """
+    The output of MyReservationListSerializer(reservations, many=True), from a single
+    values_list() projection. Keep the two in step when a field changes.
+    """
+    slots = hour_slots()
+    status_display = dict(Reservation.STATUSES)
+    rows = reservations.values_list(
+        'id', 'space__name', 'schedule__date', 'schedule__start_hour_code', 'schedule__end_hour_code', 'status',
+        'manager_comment', 'reservation_type', 'description', 'phone_number',
+    )
+    return [
+        without_missing_relations({
+            'id': pk,
+            'space_name': space_name,
+            'date': date,
+            'start_time': slots.start_label(start_code),
+            'end_time': slots.end_label(end_code),
+            'status_display': status_display.get(status_value, status_value),
+            'manager_comment': manager_comment,
+            'reservation_type': reservation_type,
+            'description': description,
+            'phone_number': phone_number,
+        })
+        for (pk, space_name, date, start_code, end_code, status_value, manager_comment, reservation_type,
+             description, phone_number) in rows
+    ]
 
 
 class MyReservationDetailSerializer(serializers.ModelSerializer):
@@ -93,10 +114,10 @@ class MyReservationDetailSerializer(serializers.ModelSerializer):
 
     def get_hour_codes(self, obj):
         sch = getattr(obj, 'schedule', None)
-        if not sch or not sch.start_hour_code or not sch.end_hour_code:
+        if not sch or not sch.start_hour_code_id or not sch.end_hour_code_id:
             return []
-        start = sch.start_hour_code.code
-        end   = sch.end_hour_code.code
+        start = sch.start_hour_code_id
+        end   = sch.end_hour_code_id
         if start is None or end is None or end < start:
             return []
         return list(range(start, end + 1))
@@ -116,19 +137,11 @@ class MyEventListSerializer(serializers.ModelSerializer):
             'poster', 'space_name', 'date', 'start_time', 'end_time'
         ]
 
-    def _parse_time_range(self, time_range_str, pick='start'):
-        if not time_range_str or '-' not in time_range_str:
-            return None
-        part = time_range_str.split('-')[0 if pick=='start' else -1]
-        return f"{part}:00" if len(part) == 5 else part
-
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), 'start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), 'end')
+        return schedule_end_time(obj.schedule)
 
 
 class EventDetailSerializer(serializers.ModelSerializer):
@@ -170,24 +183,16 @@ class EventDetailSerializer(serializers.ModelSerializer):
             }
         return None
 
-    def _parse_time_range(self, time_range_str, pick='start'):
-        if not time_range_str or '-' not in time_range_str:
-            return None
-        part = time_range_str.split('-')[0 if pick=='start' else -1]
-        return f"{part}:00" if len(part) == 5 else part
-
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), 'start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), 'end')
+        return schedule_end_time(obj.schedule)
 
 
 class ScheduleUpdateSerializer(serializers.Serializer):
     hour_codes = serializers.ListField(
-        child=serializers.PrimaryKeyRelatedField(queryset=HourSlot.objects.all()),
+        child=HourCodeField(),
         required=False, min_length=1, max_length=12
     )
     date = serializers.DateField(required=False)
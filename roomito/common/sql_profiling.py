@@ -0,0 +1,149 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('roomito.sql')
+
+# Profile of the request being served; queries outside requests are not recorded.
+_current_profile = ContextVar('sql_request_profile', default=None)
+
+# "IN (%s, %s, %s)" and multi-row "VALUES (...), (...)" differ only in length.
+_PLACEHOLDER_LIST = re.compile(r'\((?:%s, )+%s\)')
+_REPEATED_ROWS = re.compile(r'\(\.\.\.\)(?:, \(\.\.\.\))+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    """Query shape without parameters, so the N queries of an N+1 loop collapse into one."""
+    return _REPEATED_ROWS.sub('(...)', _PLACEHOLDER_LIST.sub('(...)', sql))
+
+
+class RequestProfile:
+    __slots__ = ('queries', 'seconds', 'fingerprints')
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, sql, seconds):
+        self.queries += 1
+        self.seconds += seconds
+        self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+class SQLProfilingMiddleware:
+    """
+    Records the queries, DB time and repeated query shapes of each request.
+
+    Reported in a ``Server-Timing`` header and as one JSON log line on the
+    ``roomito.sql`` logger. Views may declare ``query_budget``. A request over
+    budget is logged as a warning or, with ``SQL_QUERY_BUDGET_MODE = 'raise'``
+    (the default under ``manage.py test``), fails with ``QueryBudgetExceeded``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Every connection, in every thread, records into the profile of the current
+        # request (async views run their queries in worker threads).
+        connection_created.connect(install_query_recorder, dispatch_uid='roomito.sql_profiling')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = request.sql_profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        self.report(request, response, profile, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        profile = request.sql_profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        self.report(request, response, profile, time.perf_counter() - started)
+        return response
+
+    def report(self, request, response, profile, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        view_cls = getattr(match.func, 'cls', None) if match else None
+        view = view_cls.__name__ if view_cls else getattr(match, 'view_name', None)
+        budget = getattr(view_cls, 'query_budget', None)
+        duplicates = profile.duplicates()
+        repeated = sum(count - 1 for _, count in duplicates)
+
+        timing = (f'db;dur={profile.seconds * 1000:.1f};desc="{profile.queries} queries, {repeated} repeated", '
+                  f'app;dur={elapsed * 1000:.1f}')
+        response['Server-Timing'] = f"{response['Server-Timing']}, {timing}" if response.has_header('Server-Timing') else timing
+
+        over_budget = budget is not None and profile.queries > budget
+        if over_budget:
+            level = logging.WARNING
+        elif duplicates:
+            level = logging.INFO
+        else:
+            level = logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps({
+                'event': 'sql_profile',
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': profile.queries,
+                'db_ms': round(profile.seconds * 1000, 2),
+                'total_ms': round(elapsed * 1000, 2),
+                'query_budget': budget,
+                'duplicates': [{'count': count, 'sql': sql[:300]} for sql, count in duplicates[:5]],
+            }, ensure_ascii=False))
+
+        if over_budget and settings.SQL_QUERY_BUDGET_MODE == 'raise':
+            raise QueryBudgetExceeded(
+                f'{view} ran {profile.queries} queries for {request.method} {request.path}, '
+                f'budget is {budget}. Most repeated: {duplicates[:3]}'
+            )
@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+from itertools import chain
+
+from django.core.management.base import CommandError
+from openpyxl import load_workbook
+
+
+INPUT_FORMATS = ("xlsx", "csv", "ndjson")
+
+
+def detect_header_map(headers, header_maps, optional=None) -> dict:
+    for m in header_maps:
+        if all(mv in headers for mv in m.values()):
+            found = dict(m)
+            for key, names in (optional or {}).items():
+                for name in names:
+                    if name in headers:
+                        found[key] = name
+                        break
+            return found
+    raise CommandError(
+        f"Cannot detect headers. Got: {headers}\n"
+        f"Expected one of maps like: {header_maps}"
+    )
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "json"):
+        return "ndjson"
+    if ext in INPUT_FORMATS:
+        return ext
+    raise CommandError(f"Cannot infer input format from '{path}'. Use --format {{{','.join(INPUT_FORMATS)}}}.")
+
+
+def read_records(path: str, fmt: str | None, header_maps, sheet_name: str | None = None, optional=None):
+    """
+    Stream ``(row_no, record)`` pairs from an .xlsx, .csv or .ndjson file.
+
+    ``record`` is a dict keyed by the logical field names of the matched header
+    map (optional columns missing from the file come back as ``None``), or the
+    exception raised while parsing that line.
+    """
+    fmt = fmt or detect_format(path)
+    keys = list(header_maps[0].keys()) + list((optional or {}).keys())
+    if fmt == "xlsx":
+        return _read_xlsx(path, sheet_name, header_maps, optional, keys)
+    if fmt == "csv":
+        return _read_csv(path, header_maps, optional, keys)
+    return _read_ndjson(path, header_maps, optional, keys)
+
+
+def _pick(row, idx, keys):
+    return {key: (row[idx[key]] if key in idx and idx[key] < len(row) else None) for key in keys}
+
+
+def _read_xlsx(path, sheet_name, header_maps, optional, keys):
+    try:
+        wb = load_workbook(filename=path, read_only=True, data_only=True)
+    except Exception as e:
+        raise CommandError(f"Cannot open Excel file: {e}")
+
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+    except Exception as e:
+        raise CommandError(f"Cannot open worksheet: {e}")
+
+    rows = ws.iter_rows(values_only=True)
+    headers = [(v.strip() if isinstance(v, str) else v) for v in next(rows, ())]
+    idx = {key: headers.index(colname) for key, colname in detect_header_map(headers, header_maps, optional).items()}
+
+    def records():
+        try:
+            for row_no, row in enumerate(rows, start=2):
+                yield row_no, _pick(row, idx, keys)
+        finally:
+            wb.close()
+
+    return records()
+
+
+def _read_csv(path, header_maps, optional, keys):
+    try:
+        fh = open(path, newline="", encoding="utf-8-sig")
+    except OSError as e:
+        raise CommandError(f"Cannot open CSV file: {e}")
+
+    reader = csv.reader(fh)
+    headers = [h.strip() for h in next(reader, [])]
+    try:
+        idx = {key: headers.index(colname) for key, colname in detect_header_map(headers, header_maps, optional).items()}
+    except CommandError:
+        fh.close()
+        raise
+
+    def records():
+        with fh:
+            for row_no, row in enumerate(reader, start=2):
+                yield row_no, _pick(row, idx, keys)
+
+    return records()
+
+
+def _parse_ndjson(fh):
+    for row_no, line in enumerate(fh, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            yield row_no, e
+            continue
+        if not isinstance(obj, dict):
+            yield row_no, ValueError("line is not a JSON object")
+            continue
+        yield row_no, obj
+
+
+def _read_ndjson(path, header_maps, optional, keys):
+    try:
+        fh = open(path, encoding="utf-8-sig")
+    except OSError as e:
+        raise CommandError(f"Cannot open NDJSON file: {e}")
+
+    # Read up to the first object and check its keys now, like the csv/xlsx headers, so a
+    # file with unknown keys fails before any row is processed or reported.
+    parsed = _parse_ndjson(fh)
+    head = []
+    for row_no, obj in parsed:
+        head.append((row_no, obj))
+        if isinstance(obj, dict):
+            break
+    first = head[-1][1] if head and isinstance(head[-1][1], dict) else {}
+    try:
+        header_map = detect_header_map(list(first.keys()), header_maps, optional)
+    except CommandError:
+        fh.close()
+        raise
+
+    def records():
+        with fh:
+            for row_no, obj in chain(head, parsed):
+                if isinstance(obj, Exception):
+                    yield row_no, obj
+                    continue
+                yield row_no, {key: obj.get(header_map[key]) if key in header_map else None for key in keys}
+
+    return records()
@@ -0,0 +1,93 @@
+import time
+
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, UserRateThrottle
+
+from .metrics import THROTTLED
+
+
+class SlidingWindowRateThrottleMixin:
+    """
+    Sliding-window counter on top of DRF's rate throttles.
+
+    DRF's SimpleRateThrottle keeps the full list of request timestamps per client
+    and rewrites it on every request (up to 1000 entries for the "user" rate). Here
+    each client costs two integer counters, one for the current fixed window and
+    one for the previous one. The request count over the last ``duration`` seconds
+    is estimated as::
+
+        previous * (1 - elapsed / duration) + current
+
+    The counters are bumped with ``cache.incr``, which is atomic on Redis and
+    close enough on the database/file stand-ins, so the limits hold across every
+    worker process that shares the cache.
+    """
+
+    timer = time.time
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        current_key = f"{self.key}:{window}"
+        previous_key = f"{self.key}:{window - 1}"
+
+        counts = self.cache.get_many([current_key, previous_key])
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+
+        if self.estimate() >= self.num_requests:
+            return self.throttle_failure()
+
+        # Counters outlive their own window by one window so they can serve as "previous".
+        if self.current or not self.cache.add(current_key, 1, timeout=2 * self.duration):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Expired since get_many(); start the window over.
+                self.cache.set(current_key, 1, timeout=2 * self.duration)
+        return self.throttle_success()
+
+    def estimate(self):
+        return self.previous * (1 - self.elapsed / self.duration) + self.current
+
+    def throttle_success(self):
+        return True
+
+    def throttle_failure(self):
+        THROTTLED.labels(self.scope).inc()
+        return False
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current + 1 > self.num_requests or not self.previous:
+            # Nothing left to slide out of this window; wait for the next one.
+            return remaining
+        # Seconds until enough of the previous window has slid out to admit one request.
+        needed = 1 - (self.num_requests - 1 - self.current) / self.previous
+        return max(needed * self.duration - self.elapsed, 0.0)
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowRateThrottleMixin, UserRateThrottle):
+    pass
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowRateThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowScopedRateThrottle(SlidingWindowRateThrottleMixin, ScopedRateThrottle):
+    def allow_request(self, request, view):
+        # ScopedRateThrottle resolves its rate from the view here; the mixin would skip that.
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     MyEventUpdateView,
@@ -8,7 +9,8 @@ from .views import (
     MyEventDetailView,
     MyEventsListView,
     MyReservationUpdateView,
-    GlobalSearchView
+    GlobalSearchView,
+    AsyncGlobalSearchView,
 )
 
 urlpatterns = [
@@ -20,5 +22,5 @@ urlpatterns = [
     path("myevents/<int:event_id>/", MyEventDetailView.as_view(), name="my-event"),
     path("myreservations/<int:reservation_id>/update", MyReservationUpdateView.as_view(), name="my-reservation-update"),
     path("myevents/<int:event_id>/update/", MyEventUpdateView.as_view(), name="my-event-update"),
-    path("globalSearch/", GlobalSearchView.as_view(), name="global-search")
+    path("globalSearch/", (AsyncGlobalSearchView if settings.ASYNC_READ_VIEWS else GlobalSearchView).as_view(), name="global-search")
 ]
\ No newline at end of file
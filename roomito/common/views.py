@@ -1,15 +1,16 @@
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.contrib.auth.models import User
-from rest_framework_simplejwt.tokens import RefreshToken
+from .async_views import AsyncAPIView
+from .authentication import get_staff_id, get_student_id, refresh_token_for
+from .login import LoginBusy, check_password_bounded, get_login_user
 from django.core.cache import cache
-from staffs.models import Staff
 from students.models import Student
-from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse, OpenApiParameter
-from .serializers import EventDetailSerializer, MyEventListSerializer, MyEventUpdateSerializer, MyReservationDetailSerializer, ReservationUpdateSerializer, SuccessResponseSerializer, UnifiedLoginSerializer, TokenResponseSerializer, ErrorResponseSerializer
+from .lazy_schema import lazy_schema
+from .serializers import EventDetailSerializer, MyEventListSerializer, MyEventUpdateSerializer, MyReservationDetailSerializer, ReservationUpdateSerializer, UnifiedLoginSerializer
 from rest_framework.permissions import IsAuthenticated
-from .serializers import MyReservationListSerializer
+from .serializers import my_reservation_list_rows
 from space_managers.models import Reservation, Event
 from django.shortcuts import get_object_or_404
 from django.db import transaction
@@ -18,70 +19,13 @@ from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from space_managers.models import Space, Event
-from .serializers import SearchResultSerializer
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample, OpenApiTypes
 from datetime import datetime
 
 
-@extend_schema(tags=['auth'])
-class UnifiedLoginView(APIView):
-    @extend_schema(
-        request=UnifiedLoginSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=TokenResponseSerializer,
-                description="Login successful",
-                examples=[
-                    OpenApiExample(
-                        "LoginSuccess",
-                        value={"access": "access_token", "refresh": "refresh_token", "role": "staff"},
-                        response_only=True
-                    )
-                ]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Missing fields or invalid input format",
-                examples=[
-                    OpenApiExample(
-                        "InvalidRole",
-                        value={"error": "Invalid role. Must be one of: staff, student, space_manager."},
-                        response_only=True
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unauthorized – invalid credentials or account status",
-                examples=[
-                    OpenApiExample(
-                        "InvalidCredentials", 
-                        value={"error": "Invalid credentials."}, 
-                        response_only=True),
-                    OpenApiExample(
-                        "StudentNotApproved", 
-                        value={"error": "Your student card is not yet approved."}, 
-                        response_only=True),
-                    OpenApiExample(
-                        "NotSpaceManager", 
-                        value={"error": "User is not a space manager."}, 
-                        response_only=True),
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal Server Error – token generation failed",
-                examples=[
-                    OpenApiExample(
-                        "TokenGenerationError", 
-                        value={"error": "Failed to generate token."}, 
-                        response_only=True)
-                ]
-            )
-        },
-        description="Unified login for staffs, students, and space managers (use personnel code for staff and student id for student as usernames)."
-    )
-    def post(self, request):
+@lazy_schema
+class UnifiedLoginView(AsyncAPIView):
+    @lazy_schema
+    async def post(self, request):
         serializer = UnifiedLoginSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -90,56 +34,38 @@ class UnifiedLoginView(APIView):
         username = (serializer.validated_data['username'] or '').strip()
         password = serializer.validated_data['password'] 
     
-        try:
-            if role == 'staff':
-                try:
-                    staff = Staff.objects.select_related('user').get(personnel_code=username)
-                except Staff.DoesNotExist:
-                    return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
-
-                if not staff.user_id or not staff.is_registered:
-                    return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
+        if role not in ('staff', 'student', 'space_manager'):
+            return Response(
+                {"error": "Invalid role. Must be one of: staff, student, space_manager."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-                user = staff.user
+        try:
+            user, profile = await sync_to_async(get_login_user)(role, username)
+            if user is None:
+                return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
 
-                if not user.check_password(password):
+            if role == 'staff':
+                if not profile.is_registered:
                     return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
 
             elif role == 'student':
-                try:
-                    user = User.objects.get(username=username)
-                except User.DoesNotExist:
-                    return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
-
-                if not hasattr(user, 'student_profile'):
+                if profile is None:
                     return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
 
-                if not user.student_profile.is_approved:
+                if not profile.is_approved:
                     return Response({"error": "Your student card is not yet approved."}, status=status.HTTP_401_UNAUTHORIZED)
 
-                if not user.check_password(password):
-                    return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
+            elif profile is None:
+                return Response({"error": "User is not a space manager."}, status=status.HTTP_401_UNAUTHORIZED)
 
-            elif role == 'space_manager':
-                try:
-                    user = User.objects.get(username=username)
-                except User.DoesNotExist:
-                    return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
+            if not await check_password_bounded(user, password):
+                return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
 
-                if not hasattr(user, 'spacemanager'):
-                    return Response({"error": "User is not a space manager."}, status=status.HTTP_401_UNAUTHORIZED)
-
-                if not user.check_password(password):
-                    return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
-
-            else:
-                return Response(
-                    {"error": "Invalid role. Must be one of: staff, student, space_manager."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+            profile_id = profile.id
 
             try:
-                refresh = RefreshToken.for_user(user)
+                refresh = refresh_token_for(user, role, profile_id)
             except Exception:
                 return Response({"error": "Failed to generate token."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -149,171 +75,56 @@ class UnifiedLoginView(APIView):
                 "role": role,
             }, status=status.HTTP_200_OK)
 
+        except LoginBusy:
+            return Response({"error": "Too many login attempts right now. Please try again shortly."},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "1"})
         except Exception:
             return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
 
 
-@extend_schema(tags=['reservation'])
+@lazy_schema
 class MyReservationsListView(APIView):
 
     permission_classes = [IsAuthenticated]
+    query_budget = 5
 
-    @extend_schema(
-        description="Retrieve all reservation requests created by the authenticated user (student or staff).",
-        responses={
-            200: OpenApiResponse(
-                response=MyReservationListSerializer(many=True),
-                description="List of user's reservations retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        'SuccessExample',
-                        value=[
-                            {
-                                "id": 5,
-                                "space_name": "string",
-                                "date": "2025-09-01",
-                                "start_time": "09:00:00",
-                                "end_time": "11:00:00",
-                                "status_display": "Under Review",
-                                "manager_comment": "string",
-                                "reservation_type": "event",
-                                "description": "string",
-                                "phone_number": "09123456789"
-                            },
-                            {
-                                "id": 6,
-                                "space_name": "string",
-                                "date": "2025-09-02",
-                                "start_time": "14:00:00",
-                                "end_time": "16:00:00",
-                                "status_display": "Approved",
-                                "manager_comment": "string",
-                                "reservation_type": "class",
-                                "description": "string",
-                                "phone_number": "09351234567"
-                            }
-                        ]
-                    ),
-                    OpenApiExample(
-                        'EmptyList',
-                        value={"message": "You have no reservations."}
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[OpenApiExample('Unauthorized', value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is neither student nor staff.",
-                examples=[OpenApiExample('Forbidden', value={"error": "Only students or staff can view their reservations."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample('ServerError', value={"error": "An unexpected error occurred."})]
-            ),
-        }
-    )
+    @lazy_schema
     def get(self, request):
         user = request.user
 
-        if hasattr(user, 'student_profile') and user.student_profile is not None:
-            qs = Reservation.objects.filter(student=user.student_profile)
-        elif hasattr(user, 'staff') and user.staff is not None:
-            qs = Reservation.objects.filter(staff=user.staff)
+        student_id = get_student_id(user)
+        staff_id = get_staff_id(user)
+
+        if student_id is not None:
+            qs = Reservation.objects.filter(student_id=student_id)
+        elif staff_id is not None:
+            qs = Reservation.objects.filter(staff_id=staff_id)
         else:
             return Response({"error": "Only students or staff can view their reservations."},
                             status=status.HTTP_403_FORBIDDEN)
 
-        qs = qs.select_related(
-            'schedule', 'schedule__start_hour_code', 'schedule__end_hour_code',
-            'space', 'student__user', 'staff'
-        ).order_by('-schedule__date', '-id')
-
-        if not qs.exists():
+        # Rows straight from values_list(), in MyReservationListSerializer's format.
+        rows = my_reservation_list_rows(qs.order_by('-schedule__date', '-id'))
+        if not rows:
             return Response({"message": "You have no reservations."}, status=status.HTTP_200_OK)
-        
-        return Response(MyReservationListSerializer(qs, many=True).data, status=status.HTTP_200_OK)
+
+        return Response(rows, status=status.HTTP_200_OK)
     
 
-@extend_schema(tags=['reservation'])
+@lazy_schema
 class MyReservationDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        description="Retrieve a single reservation (only if it belongs to the authenticated user).",
-        parameters=[
-            OpenApiParameter(
-                name="reservation_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-                description="Reservation ID"
-            )
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=MyReservationDetailSerializer,
-                description="Reservation retrieved successfully.",
-                examples=[OpenApiExample(
-                    "Success",
-                    value={
-                        "id": 2,
-                        "reservation_type": "event",
-                        "description": "string",
-                        "status_display": "Rejected",
-                        "phone_number": "09123456789",
-                        "manager_comment": "string",
-                        "date": "2025-09-01",
-                        "space": {
-                                "name": "string",
-                                "capacity": 50,
-                                "address": "string",
-                                "space_type": "hall",
-                                "description": "string"
-                            },
-                        "hosting_association": "string",
-                        "hosting_organizations": "string",
-                        "responsible_organizer": "string",
-                        "position": "Professor"
-                    }
-                )]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Not authenticated.",
-                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation does not belong to the user.",
-                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to view this reservation."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation not found.",
-                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        }
-    )
+    @lazy_schema
     def get(self, request, reservation_id):
         user = request.user
-        student_id = getattr(getattr(user, 'student_profile', None), 'id', None)
-        staff_id   = getattr(getattr(user, 'staff', None), 'id', None)
+        student_id = get_student_id(user)
+        staff_id   = get_staff_id(user)
 
         try:
             reservation = (
                 Reservation.objects
-                .select_related('schedule', 'schedule__start_hour_code', 'schedule__end_hour_code',
-                                'space', 'student__user', 'staff')
+                .select_related('schedule', 'space', 'student__user', 'staff')
                 .filter(id=reservation_id)
                 .filter(
                     Q(student_id=student_id) | Q(staff_id=staff_id)
@@ -333,55 +144,15 @@ class MyReservationDetailView(APIView):
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
 
-@extend_schema(tags=['reservation'])
+@lazy_schema
 class MyReservationDeleteView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        description=(
-            "Delete a reservation created by the authenticated user (student or staff). "
-        ),
-        parameters=[
-            OpenApiParameter(
-                name="reservation_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-                description="ID of the reservation to delete"
-            ),
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Reservation deleted successfully.",
-                examples=[OpenApiExample("Deleted", value={"message": "Reservation deleted successfully."})]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation does not belong to the user.",
-                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to delete this reservation."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation not found.",
-                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        }
-    )
+    @lazy_schema
     def delete(self, request, reservation_id):
         user = request.user
-        student_id = getattr(getattr(user, 'student_profile', None), 'id', None)
-        staff_id   = getattr(getattr(user, 'staff', None), 'id', None)
+        student_id = get_student_id(user)
+        staff_id   = get_staff_id(user)
 
         reservation = Reservation.objects.filter(
             Q(student_id=student_id) | Q(staff_id=staff_id),
@@ -406,76 +177,21 @@ class MyReservationDeleteView(APIView):
             return Response({"error": "An unexpected error occurred."}, status=500)
         
 
-@extend_schema(tags=['reservation'])
+@lazy_schema
 class MyReservationUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        description="Update a reservation created by the authenticated user. Allowed only while status is 'under_review'. Space is NOT editable.",
-        parameters=[
-            OpenApiParameter(
-                name="reservation_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-                description="ID of the reservation to edit"
-            ),
-        ],
-        request=ReservationUpdateSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Reservation updated successfully.",
-                examples=[OpenApiExample("Success", value={"message": "Reservation updated successfully."})]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Validation error or not editable.",
-                examples=[
-                    OpenApiExample("NotEditable", value={"error": "Reservation is not editable."}),
-                    OpenApiExample("BadPhone", value={"phone_number": ["Phone number must be exactly 11 digits."]}),
-                    OpenApiExample("BadSchedule", value={"schedule": ["This reservation has no schedule to update."]}),
-                    OpenApiExample("BadHourCodes", value={"hour_codes": ["Hour codes must be consecutive."]}),
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Not authenticated.",
-                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Not owner.",
-                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to update this reservation."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation not found.",
-                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
-            ),
-            409: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Schedule time conflict.",
-                examples=[OpenApiExample("Conflict", value={"error": "This time conflicts with another schedule on the same date."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Server error.",
-                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        }
-    )
+    @lazy_schema
     def put(self, request, reservation_id: int):
         user = request.user
-        student = getattr(user, 'student_profile', None)
-        staff = getattr(user, 'staff', None)
+        student_id = get_student_id(user)
+        staff_id = get_staff_id(user)
 
         reservation = (
             Reservation.objects
-            .select_related('schedule', 'schedule__start_hour_code', 'schedule__end_hour_code',
-                            'space', 'student__user', 'staff')
+            .select_related('schedule', 'space', 'student__user', 'staff')
             .filter(id=reservation_id)
-            .filter(Q(student=student) | Q(staff=staff))
+            .filter(Q(student_id=student_id) | Q(staff_id=staff_id))
             .first()
         )
         if reservation is None:
@@ -502,54 +218,27 @@ class MyReservationUpdateView(APIView):
         return Response({"message": "Reservation updated successfully."}, status=status.HTTP_200_OK)
     
     
-@extend_schema(tags=['event'])    
+@lazy_schema
 class MyEventsListView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 4
 
-    @extend_schema(
-        description="List events organized by the authenticated user (student or staff).",
-        responses={
-            200: OpenApiResponse(
-                response=MyEventListSerializer(many=True),
-                description="My events retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        "Success",
-                        value=[{
-                            "id": 10,
-                            "title": "string",
-                            "event_type": "event",
-                            "description": "string",
-                            "poster": "/media/event_posters/10.jpg",
-                            "space_name": "string",
-                            "date": "2025-09-05",
-                            "start_time": "10:00:00",
-                            "end_time": "12:00:00"
-                        }]
-                    ),
-                    OpenApiExample("EmptyList", value=[]) 
-                ]
-            ),
-            401: OpenApiResponse(response=ErrorResponseSerializer, description="Not authenticated."),
-        }
-    )
+    @lazy_schema
     def get(self, request):
         try:
             user = request.user
-            student = getattr(user, 'student_profile', None)
-            staff   = getattr(user, 'staff', None)
+            student_id = get_student_id(user)
+            staff_id   = get_staff_id(user)
 
-            if student is not None:
-                qs = Event.objects.filter(student_organizer=student)
+            if student_id is not None:
+                qs = Event.objects.filter(student_organizer_id=student_id)
             else:
-                qs = Event.objects.filter(staff_organizer=staff)
+                qs = Event.objects.filter(staff_organizer_id=staff_id)
 
             events = qs.select_related(
                 'space',
                 'schedule',
-                'schedule__start_hour_code',
-                'schedule__end_hour_code'
-            ).order_by('schedule__date', 'schedule__start_hour_code__time_range')
+            ).order_by('schedule__date', 'schedule__start_hour_code_id')
 
             serializer = MyEventListSerializer(events, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -561,100 +250,32 @@ class MyEventsListView(APIView):
             )
 
 
-@extend_schema(tags=['event'])
+@lazy_schema
 class MyEventDetailView(APIView):
  
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        description="Retrieve an event details owned by the authenticated user",
-        parameters=[
-            OpenApiParameter(
-                name="event_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-                description="Event ID"
-            )
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=EventDetailSerializer,
-                description="Event details retrieved successfully.",
-                examples=[OpenApiExample(
-                    "Success",
-                    value={
-                        "id": 11,
-                        "title": "string",
-                        "event_type": "class",
-                        "description": "string",
-                        "poster": None,
-                        "organizer": "staff",
-                        "organizer_display": "Staff",
-                        "space": {
-                            "id": 2,
-                            "space_type": "class",
-                            "name": "string",
-                            "address": "string",
-                            "capacity": 40,
-                            "phone_number": "09123456789",
-                            "description": "string",
-                            "features": [{"id": 1, "name": "Projector"}],
-                            "images": [{"id": 5, "url": "/media/space_photos/5.jpg"}]
-                        },
-                        "date": "2025-09-07",
-                        "start_time": "14:00:00",
-                        "end_time": "16:00:00"
-                    }
-                )]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Not authenticated.",
-                examples=[OpenApiExample(
-                    "Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Event is not owned by the user.",
-                examples=[OpenApiExample(
-                    "Forbidden", value={"error": "You are not authorized to view this event."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Event not found.",
-                examples=[OpenApiExample(
-                    "NotFound", value={"error": "Event with this ID does not exist."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample(
-                    "ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        }
-    )
+    @lazy_schema
     def get(self, request, event_id):
         user = request.user
-        student = getattr(user, 'student_profile', None)
-        staff   = getattr(user, 'staff', None)
+        student_id = get_student_id(user)
+        staff_id   = get_staff_id(user)
 
-        if not student and not staff:
+        if student_id is None and staff_id is None:
             return Response({"error": "Only students or staff can view their events."},
                             status=status.HTTP_403_FORBIDDEN)
 
         qs = Event.objects.select_related(
             'space',
-            'schedule', 'schedule__start_hour_code', 'schedule__end_hour_code',
-            'student_organizer__user', 'staff_organizer'
+            'schedule', 'student_organizer__user', 'staff_organizer'
         ).prefetch_related(
             'space__features', 'space__images'
         )
 
-        if student:
-            qs = qs.filter(organizer='student', student_organizer=student)
+        if student_id is not None:
+            qs = qs.filter(organizer='student', student_organizer_id=student_id)
         else:
-            qs = qs.filter(organizer='staff', staff_organizer=staff)
+            qs = qs.filter(organizer='staff', staff_organizer_id=staff_id)
 
         event = qs.filter(id=event_id).first()
         if event is None:
@@ -664,7 +285,7 @@ class MyEventDetailView(APIView):
         return Response(EventDetailSerializer(event).data, status=status.HTTP_200_OK)
 
 
-@extend_schema(tags=['event'])
+@lazy_schema
 class MyEventUpdateView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
@@ -698,104 +319,12 @@ class MyEventUpdateView(APIView):
 
         return event
 
-    @extend_schema(
-        tags=['event'],
-        description="Update an event created by the authenticated user.",
-        parameters=[OpenApiParameter(name='event_id', required=True, type=int, location=OpenApiParameter.PATH)],
-        request=MyEventUpdateSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=EventDetailSerializer,
-                description="Event updated successfully.",
-                examples=[OpenApiExample(
-                    name="Success",
-                    value={
-                        "id": 12,
-                        "title": "کارگاه Django - ویرایش شده",
-                        "event_type": "event",
-                        "date": "2025-08-25",
-                        "start_time": "09:00:00",
-                        "end_time": "11:00:00",
-                        "space_name": "تالار برآنی",
-                        "poster_url": None,
-                        "organizer": {"type": "staff", "id": 3, "first_name": "Ali", "last_name": "Ahmadi", "email": "ali@example.com"},
-                        "contact_info": "0913xxxxxxx",
-                        "registration_link": "https://example.com/register",
-                        "description": "متن جدید"
-                    },
-                    response_only=True
-                )]
-            ),
-            400: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Validation error",
-            examples=[
-                OpenApiExample(name="BadURL", value={"registration_link": ["Enter a valid URL."]}, response_only=True),
-                OpenApiExample(name="EmptyTitle", value={"title": ["This field may not be blank."]}, response_only=True),
-                OpenApiExample(name="InvalidImage", value={"poster": ["Invalid image."]}, response_only=True),
-            ]
-        ),
-        401: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Unauthorized",
-            examples=[OpenApiExample(
-                name="Unauthorized",
-                value={"detail": "Authentication credentials were not provided."},
-                response_only=True
-            )]
-        ),
-        403: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Forbidden (not owner)",
-            examples=[OpenApiExample(
-                name="Forbidden",
-                value={"error": "You are not allowed to edit this event."},
-                response_only=True
-            )]
-        ),
-        404: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Not found or not an event",
-            examples=[OpenApiExample(
-                name="NotFound",
-                value={"error": "Event not found or not editable (not an 'event')."},
-                response_only=True
-            )]
-        ),
-        405: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Method not allowed",
-            examples=[OpenApiExample(
-                name="MethodNotAllowed",
-                value={"detail": "Method \"POST\" not allowed."},
-                response_only=True
-            )]
-        ),
-        415: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Unsupported media type",
-            examples=[OpenApiExample(
-                name="UnsupportedMediaType",
-                value={"detail": "Unsupported media type \"application/json\" in request."},
-                response_only=True
-            )]
-        ),
-        500: OpenApiResponse(
-            response=ErrorResponseSerializer,
-            description="Internal server error",
-            examples=[OpenApiExample(
-                name="ServerError",
-                value={"error": "An unexpected server error occurred."},
-                response_only=True
-            )]
-        ),
-        }
-    )
+    @lazy_schema
     def put(self, request, event_id):
         event = get_object_or_404(
             Event.objects.select_related(
                 "space",
-                "schedule", "schedule__start_hour_code", "schedule__end_hour_code",
+                "schedule",
                 "student_organizer__user",
                 "staff_organizer",
             ),
@@ -849,6 +378,7 @@ class MyEventUpdateView(APIView):
 
 class GlobalSearchView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 5
 
     TYPE_KEYWORDS = {
         "سالن": ("space", "hall"),
@@ -861,89 +391,25 @@ class GlobalSearchView(APIView):
         "دورهمی": ("event", "gathering"),
     }
     
-    @extend_schema(
-        description="Search spaces and events by a query string, type keywords and event date.",
-        parameters=[
-            OpenApiParameter(
-                name='search',
-                required=True,
-                type=OpenApiTypes.STR,
-                description="Query string to search in Space.name and Event.title or type keywords.",
-            ),
-            OpenApiParameter(
-                name='event_date',
-                required=False,
-                type=OpenApiTypes.DATE,
-                description="Exact event date filter (YYYY-MM-DD). Filters Event.schedule.date exactly."
-            ),
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=SearchResultSerializer(many=True),
-                description="Search results returned successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="SuccessExample",
-                        value=[
-                            {"type": "space", "id": 1, "title": "تالار برآنی"},
-                            {"type": "event", "id": 7, "title": "کارگاه Django"},
-                        ],
-                        response_only=True,
-                    )
-                ],
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid request.",
-                examples=[
-                    OpenApiExample(
-                        name="BadDate", 
-                        value={"error": "Invalid date format. Use YYYY-MM-DD."}, 
-                        response_only=True
-                    ),
-                ],
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication required.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."},
-                        response_only=True,
-                    )
-                ],
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="No matching spaces or events found.",
-                examples=[
-                    OpenApiExample(
-                        name="NotFound",
-                        value={"error": "No results found for the given query."},
-                        response_only=True,
-                    )
-                ],
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred."},
-                        response_only=True,
-                    ),
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Failed to query database."},
-                        response_only=True,
-                    ),
-                ],
-            ),
-        },
-    )
+    @lazy_schema
     def get(self, request):
+        params = self.parse_params(request)
+        if isinstance(params, Response):
+            return params
+        q, event_date_parsed = params
+
+        try:
+            if not q:
+                return Response([], status=status.HTTP_200_OK)
+
+            results = self.merge_results(q, self.search_querysets(q, event_date_parsed))
+            return Response(results, status=status.HTTP_200_OK)
+
+        except Exception:
+            return Response({"error": "An unexpected error occurred."},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def parse_params(self, request):
         q = (request.query_params.get('search') or '').strip()
         if not q:
             return Response({"error": "Search query parameter 'search' is required."},
@@ -957,65 +423,67 @@ class GlobalSearchView(APIView):
             except Exception:
                 return Response({"error": "Invalid date format. Use YYYY-MM-DD."},
                                 status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            if not q:
-                return Response([], status=status.HTTP_200_OK)
-            
-            results = []
-            seen = set()  
-
-            search_spaces = event_date_parsed is None
-
-            if search_spaces:
-                space_q = Q(name__icontains=q) | Q(description__icontains=q)
-                for s in Space.objects.filter(space_q).values("id", "name"):
-                    key = ("space", s["id"])
-                    if key not in seen:
-                        seen.add(key)
-                        results.append({"type": "space", "id": s["id"], "title": s["name"]})
-
-            event_q = Q(title__icontains=q) | Q(description__icontains=q)
-            if event_date_parsed:
-                event_q &= Q(schedule__date=event_date_parsed)
-            for e in Event.objects.filter(event_q).values("id", "title"):
-                key = ("event", e["id"])
+        return q, event_date_parsed
+
+    def search_querysets(self, q, event_date_parsed):
+        """``(type, values queryset)`` pairs, in the order their rows are merged."""
+        querysets = []
+        search_spaces = event_date_parsed is None
+
+        if search_spaces:
+            space_q = Q(name__icontains=q) | Q(description__icontains=q)
+            querysets.append(("space", Space.objects.filter(space_q).values("id", "name")))
+
+        event_q = Q(title__icontains=q) | Q(description__icontains=q)
+        if event_date_parsed:
+            event_q &= Q(schedule__date=event_date_parsed)
+        querysets.append(("event", Event.objects.filter(event_q).values("id", "title")))
+
+        keyword = self.TYPE_KEYWORDS.get(q)
+        if keyword:
+            kind, type_val = keyword
+            if kind == "space" and search_spaces:
+                querysets.append(("space", Space.objects.filter(space_type=type_val).values("id", "name")))
+            elif kind == "event":
+                type_q = Q(event_type=type_val)
+                if event_date_parsed:
+                    type_q &= Q(schedule__date=event_date_parsed)
+                querysets.append(("event", Event.objects.filter(type_q).values("id", "title")))
+        return querysets
+
+    def merge_results(self, q, rows_by_type):
+        results = []
+        seen = set()
+        for kind, rows in rows_by_type:
+            title_field = "name" if kind == "space" else "title"
+            for row in rows:
+                key = (kind, row["id"])
                 if key not in seen:
                     seen.add(key)
-                    results.append({"type": "event", "id": e["id"], "title": e["title"]})
-
-            keyword = self.TYPE_KEYWORDS.get(q)
-            if keyword:
-                kind, type_val = keyword
-                if kind == "space" and search_spaces:
-                    for s in Space.objects.filter(space_type=type_val).values("id", "name"):
-                        key = ("space", s["id"])
-                        if key not in seen:
-                            seen.add(key)
-                            results.append({"type": "space", "id": s["id"], "title": s["name"]})
-                elif kind == "event":
-                    type_q = Q(event_type=type_val)
-                    if event_date_parsed:
-                        type_q &= Q(schedule__date=event_date_parsed)
-                    for e in Event.objects.filter(type_q).values("id", "title"):
-                        key = ("event", e["id"])
-                        if key not in seen:
-                            seen.add(key)
-                            results.append({"type": "event", "id": e["id"], "title": e["title"]})
-
-            if not results:
-                return Response([], status=status.HTTP_200_OK)
+                    results.append({"type": kind, "id": row["id"], "title": row[title_field]})
 
-            q_lower = q.lower()
-            results.sort(
-                key=lambda item: (
-                    0 if (item.get("title") or "").lower().startswith(q_lower) else 1,
-                    (item.get("title") or "").lower()
-                )
+        q_lower = q.lower()
+        results.sort(
+            key=lambda item: (
+                0 if (item.get("title") or "").lower().startswith(q_lower) else 1,
+                (item.get("title") or "").lower()
             )
+        )
+        return results
 
-            return Response(results, status=status.HTTP_200_OK)
 
+class AsyncGlobalSearchView(AsyncAPIView, GlobalSearchView):
+    async def get(self, request):
+        params = self.parse_params(request)
+        if isinstance(params, Response):
+            return params
+        q, event_date_parsed = params
+
+        try:
+            rows_by_type = []
+            for kind, qs in self.search_querysets(q, event_date_parsed):
+                rows_by_type.append((kind, [row async for row in qs]))
+            return Response(self.merge_results(q, rows_by_type), status=status.HTTP_200_OK)
         except Exception:
             return Response({"error": "An unexpected error occurred."},
-                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,52 @@
+"""
+Production serving profile: gunicorn managing uvicorn (ASGI) workers.
+
+    gunicorn roomito.asgi:application -c gunicorn.conf.py
+
+Every value can be overridden from the environment or .env, like the Django settings
+(read through decouple.config: gunicorn reserves the bare name `config`).
+"""
+import multiprocessing
+import os
+import shutil
+
+import decouple
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+
+# Sync DRF views run on a single thread per ASGI worker (asgiref's thread-sensitive
+# executor), so scale with processes: the usual 2 x cores + 1.
+workers = decouple.config('WEB_CONCURRENCY', default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+worker_class = decouple.config('GUNICORN_WORKER_CLASS', default='uvicorn_worker.UvicornWorker')
+# Only used by the WSGI "gthread" worker class (gunicorn roomito.wsgi:application).
+threads = decouple.config('GUNICORN_THREADS', default=1, cast=int)
+
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = 30
+keepalive = decouple.config('GUNICORN_KEEPALIVE', default=5, cast=int)
+
+# Recycle workers now and then so slow leaks cannot pile up; jitter avoids restarting them all at once.
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=2000, cast=int)
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+accesslog = decouple.config('GUNICORN_ACCESS_LOG', default='-')
+errorlog = '-'
+
+# Workers share metrics through files in this directory (prometheus_client's multiprocess
+# mode, see common.metrics). It must be set before the app, and so prometheus_client, is
+# loaded, and is emptied at startup so counters do not carry over from a previous run.
+prometheus_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', decouple.config('PROMETHEUS_MULTIPROC_DIR', default='/tmp/roomito-metrics'),
+)
+
+
+def on_starting(server):
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,14 +1,22 @@
 
 from pathlib import Path
 from datetime import timedelta
+import os
+import sys
+from importlib.util import find_spec
+
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = 'django-insecure-82ysi6@94x1!(_$9426oe6tsk(uf)32qd!fr=jzdco#jg0kst_'
+# Every deployment-specific value below can be overridden from the environment or a
+# .env file next to manage.py; the defaults keep the docker-compose dev setup working.
+SECRET_KEY = config('SECRET_KEY', default='django-insecure-82ysi6@94x1!(_$9426oe6tsk(uf)32qd!fr=jzdco#jg0kst_')
 
-DEBUG = True
+DEBUG = config('DEBUG', default=True, cast=bool)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='', cast=Csv())
 
 
 INSTALLED_APPS = [
@@ -37,17 +45,54 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-CORS_ALLOWED_ORIGINS = [
-    "http://localhost:8000",
-    "http://localhost:5173", 
-    "http://127.0.0.1:5173",
-]
+# Per-request query count, DB time and repeated query shapes, reported in a
+# Server-Timing header and on the "roomito.sql" logger (common.sql_profiling).
+# Views can declare `query_budget`; going over it logs a warning, or raises under
+# `manage.py test` so N+1 regressions fail the suite. Off by default outside DEBUG,
+# always on under `manage.py test`, which checks the budgets.
+TESTING = sys.argv[1:2] == ['test']
+SQL_PROFILING = config('SQL_PROFILING', default=DEBUG, cast=bool) or TESTING
+SQL_QUERY_BUDGET_MODE = config('SQL_QUERY_BUDGET_MODE', default='raise' if TESTING else 'warn')
+
+if SQL_PROFILING:
+    MIDDLEWARE.insert(0, 'common.sql_profiling.SQLProfilingMiddleware')
+
+# Prometheus metrics served at /metrics (common.metrics). Outermost, so the latency
+# covers every other middleware; it reads the query count the SQL profiler records.
+# Scrapes must send "Authorization: Bearer <METRICS_TOKEN>"; without a token the
+# endpoint only answers with DEBUG on.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'common.metrics.MetricsMiddleware')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'roomito.sql': {
+            'handlers': ['console'],
+            'level': config('SQL_PROFILE_LOG_LEVEL', default='INFO' if DEBUG else 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
 
-CSRF_TRUSTED_ORIGINS = [
-    "http://localhost:8000",
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-]
+CORS_ALLOWED_ORIGINS = config(
+    'CORS_ALLOWED_ORIGINS',
+    default='http://localhost:8000,http://localhost:5173,http://127.0.0.1:5173',
+    cast=Csv(),
+)
+
+CSRF_TRUSTED_ORIGINS = config(
+    'CSRF_TRUSTED_ORIGINS',
+    default='http://localhost:8000,http://localhost:5173,http://127.0.0.1:5173',
+    cast=Csv(),
+)
 
 ROOT_URLCONF = 'roomito.urls'
 
@@ -68,20 +113,118 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'roomito.wsgi.application'
 
+ASGI_APPLICATION = 'roomito.asgi.application'
+
+# Serve the high-fan-out read endpoints (space/event lists, availability, search) with
+# their async variants. Only worth it under an ASGI server (see gunicorn.conf.py).
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
+
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'roomito',
-        'USER': 'mahya',
-        'PASSWORD': 'qnzmb5773',
-        'HOST': 'db',
-        'PORT': '5432',
+        'NAME': config('DB_NAME', default='roomito'),
+        'USER': config('DB_USER', default='mahya'),
+        'PASSWORD': config('DB_PASSWORD', default='qnzmb5773'),
+        'HOST': config('DB_HOST', default='db'),
+        'PORT': config('DB_PORT', default='5432'),
     }
 }
 
+# How workers hold their Postgres connections (DB_CONN_MODE):
+#   persistent - reuse a worker's connection for DB_CONN_MAX_AGE seconds, health-checked
+#                before reuse (WSGI / runserver).
+#   pool       - psycopg 3 connection pool per process, DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE
+#                connections (ASGI, where Django advises against persistent connections).
+#   pgbouncer  - DB_HOST/DB_PORT point at PgBouncer in transaction-pooling mode; keeps the
+#                short hop to PgBouncer open and disables server-side cursors, which
+#                transaction pooling cannot support.
+#   none       - a new connection per request.
+DB_CONN_MODE = config('DB_CONN_MODE', default='persistent')
+
+if DB_CONN_MODE == 'pool':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        },
+    }
+elif DB_CONN_MODE in ('persistent', 'pgbouncer'):
+    DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = DB_CONN_MODE == 'pgbouncer'
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Read replicas (DB_REPLICA_HOSTS=host[:port],...). Reads made while serving GET/HEAD/
+# OPTIONS requests go to a random replica; a user who has just written reads from the
+# primary for DB_REPLICA_STICKY_SECONDS, which should exceed the replication lag.
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv())
+
+for number, replica_host in enumerate(DB_REPLICA_HOSTS, start=1):
+    replica_host, _, replica_port = replica_host.partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+if TESTING and not DATABASE_REPLICAS:
+    # A mirror of the test database for the routing tests, which install the router and
+    # name this alias themselves; the rest of the suite never routes to it.
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DB_REPLICA_STICKY_SECONDS = config('DB_REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['common.db_routing.PrimaryReplicaRouter']
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.common.CommonMiddleware'),
+                      'common.db_routing.ReplicaRoutingMiddleware')
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Throttle counters and staff temp passwords must be visible to every worker process,
+# so the per-process LocMemCache default is not an option. Use Redis in production
+# (REDIS_URL), or the database/file backends as stand-ins for local runs. The "db"
+# backend needs `python manage.py createcachetable` once.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis' if REDIS_URL else 'file')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL or 'redis://redis:6379/1',
+            'KEY_PREFIX': 'roomito',
+        }
+    }
+elif CACHE_BACKEND == 'db':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'roomito_cache',
+            'KEY_PREFIX': 'roomito',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=str(BASE_DIR / '.cache')),
+            'KEY_PREFIX': 'roomito',
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+
+# Cached manager dashboards are dropped on every reservation, schedule, event or space
+# write; the timeout only bounds staleness after writes that bypass model signals.
+MANAGER_DASHBOARD_CACHE_SECONDS = config('MANAGER_DASHBOARD_CACHE_SECONDS', default=300, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -97,6 +240,40 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing policy. PASSWORD_HASHER picks the hasher for new and upgraded
+# hashes; the others stay listed so older hashes keep verifying and are rehashed
+# to the preferred one on the next successful login.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=None, cast=lambda v: int(v) if v else None)
+
+_PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'common.hashers.TunedPBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+# Hashers that need a package Django does not ship with (see requirements.txt).
+_PASSWORD_HASHER_PACKAGES = {'argon2': ('argon2', 'argon2-cffi'), 'bcrypt': ('bcrypt', 'bcrypt')}
+if PASSWORD_HASHER not in _PASSWORD_HASHER_CLASSES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of {', '.join(_PASSWORD_HASHER_CLASSES)}, not {PASSWORD_HASHER!r}."
+    )
+if PASSWORD_HASHER in _PASSWORD_HASHER_PACKAGES:
+    _module, _package = _PASSWORD_HASHER_PACKAGES[PASSWORD_HASHER]
+    if find_spec(_module) is None:
+        raise ImproperlyConfigured(f"PASSWORD_HASHER={PASSWORD_HASHER} needs the {_package} package installed.")
+
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+
+# Login password checks run on executor threads, at most LOGIN_MAX_CONCURRENT_HASHES
+# at once per process; others wait up to LOGIN_HASH_WAIT_SECONDS for a slot, then get
+# a 503 with Retry-After.
+LOGIN_MAX_CONCURRENT_HASHES = config('LOGIN_MAX_CONCURRENT_HASHES', default=os.cpu_count() or 1, cast=int)
+LOGIN_HASH_WAIT_SECONDS = config('LOGIN_HASH_WAIT_SECONDS', default=2, cast=float)
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -116,15 +293,15 @@ MEDIA_ROOT = BASE_DIR / 'media'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'common.authentication.RoleClaimsJWTAuthentication',
     ),
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
-        "rest_framework.throttling.AnonRateThrottle",
+        "common.throttling.SlidingWindowUserRateThrottle",
+        "common.throttling.SlidingWindowAnonRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
-    "anon": "100/hour",
-    "user": "1000/hour",
+    "anon": config('THROTTLE_RATE_ANON', default='100/hour'),
+    "user": config('THROTTLE_RATE_USER', default='1000/hour'),
     "resend_verification": "1/minute",
     },
 }
@@ -134,6 +311,8 @@ SPECTACULAR_SETTINGS = {
     'DESCRIPTION': 'APIs for space reservation system',
     'VERSION': '1.0.0',
     'COMPONENT_SPLIT_REQUEST': True,
+    # Attaches the @extend_schema docs kept in each app's schema_docs.py (see common.lazy_schema).
+    'DEFAULT_GENERATOR_CLASS': 'common.lazy_schema.LazySchemaGenerator',
     'TAGS': [
         {'name': 'auth', 'description': 'Authentication and registration endpoints'},
         {'name': 'space_manager', 'description': 'Endpoints for space managers'},
@@ -146,6 +325,14 @@ SPECTACULAR_SETTINGS = {
 }
 
 
+# /api/schema/ serves a schema prebuilt for the running code (`manage.py
+# build_openapi_schema`, run in the Docker build) instead of introspecting every view
+# per request. CODE_VERSION (release tag, commit) names the build; without it the
+# version is a hash of the Python sources.
+CODE_VERSION = config('CODE_VERSION', default='')
+OPENAPI_SCHEMA_DIR = config('OPENAPI_SCHEMA_DIR', default=str(BASE_DIR / '.openapi'))
+
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),  
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),    
@@ -156,11 +343,13 @@ SIMPLE_JWT = {
 AUTH_USER_MODEL = 'auth.User'
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
-EMAIL_HOST_USER = 'mahyajfri37@gmail.com'  
-EMAIL_HOST_PASSWORD = 'elbr voub wkgw oqwy'
-DEFAULT_FROM_EMAIL = 'mahyajfri37@gmail.com'
-
-CORS_ALLOW_CREDENTIALS = True
\ No newline at end of file
+EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='mahyajfri37@gmail.com')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='elbr voub wkgw oqwy')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='mahyajfri37@gmail.com')
+
+CORS_ALLOW_CREDENTIALS = True
+# Lets browser clients read the next-page link of keyset-paginated lists.
+CORS_EXPOSE_HEADERS = ['Link']
\ No newline at end of file
@@ -2,9 +2,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from common.metrics import metrics_view
+from common.schema import PrebuiltSpectacularAPIView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', SpectacularSwaggerView.as_view(url_name='api-schema'), name='swagger-ui'),
@@ -12,7 +15,8 @@ urlpatterns = [
     path('api/', include('staffs.urls')),
     path('api/', include('space_managers.urls')),
     path('api/', include('common.urls')), 
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
+    path('api/schema/', PrebuiltSpectacularAPIView.as_view(), name='api-schema'),
     path('api/swagger/', SpectacularSwaggerView.as_view(url_name='api-schema'), name='swagger-ui-alt'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', metrics_view, name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SpaceManager, Space, Reservation, Schedule, Event, SpaceFeature, SpaceImage, HourSlot
+from .models import SpaceManager, Space, Reservation, Schedule, Event, SpaceFeature, SpaceImage, HourSlot, OutboxEmail
 from django.contrib.auth.models import User
 from django.utils.crypto import get_random_string
 from django.core.mail import send_mail
@@ -16,9 +16,15 @@ admin.site.register(SpaceFeature)
 
 @admin.register(HourSlot)
 class HourSlotAdmin(admin.ModelAdmin):
-    list_display = ('code', 'time_range')  
+    list_display = ('code', 'time_range', 'start_time', 'end_time')
     search_fields = ('code', 'time_range')  
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'recipient', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('recipient', 'subject')
+
 class SpaceImageInline(admin.TabularInline):
     model = SpaceImage
     extra = 1
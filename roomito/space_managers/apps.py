@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class SpaceManagersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'space_managers'
+
+    def ready(self):
+        # Registers the signal handlers that invalidate the hour slot registry and the dashboards
+        # and queue the days of the demand rollup.
+        from . import dashboard, demand, hour_slots  # noqa: F401
@@ -0,0 +1,148 @@
+"""
+Summary behind a space manager's landing page (spacemanager/dashboard/).
+
+For each managed space it gives the pending requests and the oldest of them, today's
+approved bookings, and the upcoming events. Requests made before Reservation.created_at
+existed (migration 0020) have no creation time that could be recovered; they are counted
+in ``pending_unknown_age`` and left out of the oldest pending time and age, which would
+otherwise pass them off as recent. All of it comes from one query grouped by
+space, and the result is cached per manager and day. Saving or deleting a reservation,
+schedule, event or space drops the cached summary of the manager concerned once the
+transaction commits. ``settings.MANAGER_DASHBOARD_CACHE_SECONDS`` bounds how stale it
+can get through writes that send no signals (``QuerySet.update()``, raw SQL).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, FilteredRelation, Min, OuterRef, Q, Subquery
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Event, Reservation, Schedule, Space
+
+SPACE_FIELDS = ('pending_requests', 'pending_unknown_age', 'oldest_pending_created_at', 'today_bookings',
+                'upcoming_events', 'next_event_date')
+
+
+def _cache_key(space_manager_id, day):
+    # Versioned: summaries cached before pending_unknown_age existed lack it.
+    return f'manager-dashboard:v2:{space_manager_id}:{day.isoformat()}'
+
+
+def _pending(aggregate):
+    # Correlated per space and served by the Reservation(space, status) index. Joining the
+    # pending reservations next to the upcoming schedules would multiply their rows.
+    return Subquery(
+        Reservation.objects.filter(space=OuterRef('pk'), status='under_review')
+        .order_by().values('space').annotate(value=aggregate).values('value')
+    )
+
+
+def build_dashboard(space_manager_id, day):
+    """The summary for ``day``, straight from the database."""
+    spaces = (
+        Space.objects.filter(space_manager_id=space_manager_id)
+        # Only the schedules from ``day`` on are joined, through the Schedule(space, date) index.
+        .alias(upcoming=FilteredRelation('schedule', condition=Q(schedule__date__gte=day)))
+        .annotate(
+            pending_requests=_pending(Count('id')),
+            pending_unknown_age=_pending(Count('id', filter=Q(created_at__isnull=True))),
+            oldest_pending_created_at=_pending(Min('created_at')),
+            today_bookings=Count('upcoming', filter=Q(upcoming__date=day,
+                                                      upcoming__reservation_instance__status='approved')),
+            upcoming_events=Count('upcoming', filter=Q(upcoming__event_instance__isnull=False)),
+            next_event_date=Min('upcoming__date', filter=Q(upcoming__event_instance__isnull=False)),
+        )
+        .order_by('name', 'id')
+        .values_list('id', 'name', *SPACE_FIELDS)
+    )
+    rows = [dict(zip(('space_id', 'space_name', *SPACE_FIELDS), row)) for row in spaces]
+    for row in rows:
+        # No pending request: the subquery finds no group. Coalescing in SQL would put the
+        # subquery in the GROUP BY and run it once per joined schedule.
+        row['pending_requests'] = row['pending_requests'] or 0
+        row['pending_unknown_age'] = row['pending_unknown_age'] or 0
+    pending_since = [row['oldest_pending_created_at'] for row in rows if row['oldest_pending_created_at']]
+    next_events = [row['next_event_date'] for row in rows if row['next_event_date']]
+    return {
+        'date': day,
+        'pending_requests': sum(row['pending_requests'] for row in rows),
+        'pending_unknown_age': sum(row['pending_unknown_age'] for row in rows),
+        'oldest_pending_created_at': min(pending_since, default=None),
+        'today_bookings': sum(row['today_bookings'] for row in rows),
+        'upcoming_events': sum(row['upcoming_events'] for row in rows),
+        'next_event_date': min(next_events, default=None),
+        'spaces': rows,
+    }
+
+
+def manager_dashboard(space_manager_id):
+    """Today's summary for the manager, from the cache when it is there."""
+    day = timezone.localdate()
+    key = _cache_key(space_manager_id, day)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_dashboard(space_manager_id, day)
+        cache.set(key, summary, settings.MANAGER_DASHBOARD_CACHE_SECONDS)
+    return summary
+
+
+def with_ages(summary, now):
+    """``summary`` plus how long the oldest pending requests have waited at ``now``; ages are never cached."""
+    def age(created_at):
+        return int((now - created_at).total_seconds()) if created_at else None
+
+    return {
+        **summary,
+        'oldest_pending_age_seconds': age(summary['oldest_pending_created_at']),
+        'spaces': [
+            {**row, 'oldest_pending_age_seconds': age(row['oldest_pending_created_at'])}
+            for row in summary['spaces']
+        ],
+    }
+
+
+def invalidate(space_manager_id):
+    if space_manager_id is not None:
+        cache.delete(_cache_key(space_manager_id, timezone.localdate()))
+
+
+def _space_manager_id(instance):
+    if type(instance).space.is_cached(instance):
+        return instance.space.space_manager_id if instance.space else None
+    if instance.space_id is None:
+        return None
+    return Space.objects.filter(pk=instance.space_id).values_list('space_manager_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Reservation, dispatch_uid='roomito.dashboard.reservation')
+@receiver([post_save, post_delete], sender=Schedule, dispatch_uid='roomito.dashboard.schedule')
+@receiver([post_save, post_delete], sender=Event, dispatch_uid='roomito.dashboard.event')
+def space_data_changed(instance, origin=None, **kwargs):
+    if isinstance(origin, Space):
+        # Cascaded from deleting the space, which invalidates the manager once.
+        return
+    space_manager_id = _space_manager_id(instance)
+    # After commit, or a request in between could cache the summary from before the write.
+    transaction.on_commit(lambda: invalidate(space_manager_id))
+
+
+@receiver(pre_save, sender=Space, dispatch_uid='roomito.dashboard.space_owner')
+def space_saving(instance, raw=False, **kwargs):
+    # A space handed to another manager leaves the previous manager's dashboard as well.
+    if instance.pk is not None and not raw:
+        instance._previous_space_manager_id = (
+            Space.objects.filter(pk=instance.pk).values_list('space_manager_id', flat=True).first()
+        )
+
+
+@receiver([post_save, post_delete], sender=Space, dispatch_uid='roomito.dashboard.space')
+def space_changed(instance, **kwargs):
+    space_manager_ids = {instance.space_manager_id, getattr(instance, '_previous_space_manager_id', None)}
+
+    def invalidate_all():
+        for space_manager_id in space_manager_ids:
+            invalidate(space_manager_id)
+
+    transaction.on_commit(invalidate_all)
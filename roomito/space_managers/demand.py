@@ -0,0 +1,260 @@
+"""
+Demand heatmap: which hour slots are asked for, by space type and capacity band.
+
+Approved reservations show the supply that was used. Rejected requests, and under-review
+requests for slots an approved reservation or an event already holds, show demand that
+was not met. ``demand_report`` sums the requested hour slots of every reservation,
+whatever its status, into a weekday x hour-code heatmap per space type and capacity band.
+
+It reads the DemandRollup table, one row per day, space type, capacity band and hour
+code, never the reservations themselves. Saving or deleting a reservation, schedule or
+event, or changing a space's type or capacity, queues the days it touches in
+DemandRollupQueue, in the same transaction. ``refresh`` rebuilds the rollup rows of the
+queued days from their schedules, so each write costs one small insert and a report
+recomputes only what changed since the last one. ``seed_load_data`` queues and rebuilds
+the days it writes; other writes that send no signals (``QuerySet.update()``, raw SQL) need
+``refresh_demand_rollup --rebuild``. While the rollup is empty, e.g. on a database filled
+without signals and never rebuilt, reports are computed from the schedules directly.
+"""
+from bisect import bisect
+from itertools import chain
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import ExtractWeekDay
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .hour_slots import hour_slots
+from .models import DemandRollup, DemandRollupQueue, Event, Reservation, Schedule, Space
+from .utilization import WEEK_ORDER, WEEKDAY_NAMES, coverage, hour_columns
+
+# Lower bounds of the capacity bands. Changing them needs ``refresh_demand_rollup --rebuild``.
+CAPACITY_BANDS = (1, 11, 26, 51, 101, 201)
+STATUSES = ('approved', 'under_review', 'rejected')
+COUNTS = ('approved', 'under_review', 'conflicting', 'rejected')
+FIGURES = ('requested', *COUNTS, 'unmet')
+
+_INTERVAL_FIELDS = ('schedule__space_id', 'schedule__date', 'schedule__start_hour_code', 'schedule__end_hour_code')
+_INTERVAL = np.dtype([('space', np.int64), ('day', np.int64), ('start', np.int32), ('end', np.int32), ('kind', np.int8)])
+# Kind of the intervals of events, after the reservation statuses.
+EVENT = len(STATUSES)
+
+
+def capacity_band(capacity):
+    """Lower bound of the band ``capacity`` falls in."""
+    return CAPACITY_BANDS[max(bisect(CAPACITY_BANDS, capacity) - 1, 0)]
+
+
+def band_label(capacity_from):
+    n = CAPACITY_BANDS.index(capacity_from) if capacity_from in CAPACITY_BANDS else None
+    if n is None or n + 1 == len(CAPACITY_BANDS):
+        return f"{capacity_from}+"
+    return f"{capacity_from}-{CAPACITY_BANDS[n + 1] - 1}"
+
+
+def queue_days(days):
+    days = {day for day in days if day is not None}
+    if days:
+        DemandRollupQueue.objects.bulk_create(DemandRollupQueue(date=day) for day in days)
+
+
+def queue_all():
+    """Queue every day with a schedule, to rebuild the whole rollup."""
+    queue_days(Schedule.objects.order_by().values_list('date', flat=True).distinct())
+
+
+def rollup_rows(days, chunk_size=20000):
+    """DemandRollup rows of ``days``, computed from their schedules."""
+    days = sorted(days)
+    codes = tuple(slot.code for slot in hour_slots())
+    column = hour_columns(codes)
+    origin = np.array([day.toordinal() for day in days], dtype=np.int64)
+
+    kinds = {status: n for n, status in enumerate(STATUSES)}
+    rows = chain(
+        ((*row, kinds.get(status, -1)) for *row, status in Reservation.objects.filter(schedule__date__in=days)
+         .order_by().values_list(*_INTERVAL_FIELDS, 'status').iterator(chunk_size=chunk_size)),
+        ((*row, EVENT) for row in Event.objects.filter(schedule__date__in=days)
+         .order_by().values_list(*_INTERVAL_FIELDS).iterator(chunk_size=chunk_size)),
+    )
+    intervals = np.fromiter(
+        ((space_id, day.toordinal(), start, end, kind) for space_id, day, start, end, kind in rows),
+        dtype=_INTERVAL,
+    )
+    if not len(intervals):
+        return []
+    kind, start, end = intervals['kind'], intervals['start'], intervals['end']
+    day = np.searchsorted(origin, intervals['day'])
+
+    # One cell per space and day that has a schedule.
+    cells, cell = np.unique(intervals['space'] * len(days) + day, return_inverse=True)
+
+    def covered(of):
+        mask = np.isin(kind, of)
+        return coverage(cell[mask], start[mask], end[mask], len(cells), column)
+
+    approved, under_review, rejected = (covered([n]) for n in range(len(STATUSES)))
+    taken = covered([STATUSES.index('approved'), EVENT]) > 0
+    per_cell = np.stack([approved, under_review, under_review * taken, rejected], axis=1)
+
+    # Cells of spaces with the same type and band on the same day add up to one group.
+    space_ids = cells // len(days)
+    profiles, space_profile = [], {}
+    for pk, space_type, capacity in Space.objects.filter(id__in=np.unique(space_ids).tolist()).values_list(
+            'id', 'space_type', 'capacity'):
+        if (key := (space_type, capacity_band(capacity))) not in profiles:
+            profiles.append(key)
+        space_profile[pk] = profiles.index(key)
+    cell_profile = np.array([space_profile[pk] for pk in space_ids.tolist()], dtype=np.int64)
+    groups, group = np.unique((cells % len(days)) * len(profiles) + cell_profile, return_inverse=True)
+    totals = np.zeros((len(groups), len(COUNTS), len(codes)), dtype=np.int64)
+    np.add.at(totals, group, per_cell)
+
+    rows = []
+    for n, hour in zip(*np.nonzero(totals.any(axis=1))):
+        space_type, capacity_from = profiles[groups[n] % len(profiles)]
+        rows.append(DemandRollup(
+            date=days[groups[n] // len(profiles)], space_type=space_type, capacity_from=capacity_from,
+            hour_code=codes[hour], **dict(zip(COUNTS, totals[n, :, hour].tolist())),
+        ))
+    return rows
+
+
+def refresh(batch_size=500):
+    """Rebuild the rollup rows of the queued days; returns how many days were rebuilt."""
+    rebuilt = 0
+    while True:
+        with transaction.atomic():
+            # Locking the oldest entries serializes concurrent refreshes. A day queued by a
+            # write that commits after this point keeps its entry and is rebuilt next time.
+            queued = list(DemandRollupQueue.objects.select_for_update().order_by('id')
+                          .values_list('id', 'date')[:batch_size])
+            if not queued:
+                return rebuilt
+            days = {day for _, day in queued}
+            DemandRollup.objects.filter(date__in=days).delete()
+            DemandRollup.objects.bulk_create(rollup_rows(days), batch_size=5000)
+            DemandRollupQueue.objects.filter(id__in=[pk for pk, _ in queued]).delete()
+        rebuilt += len(days)
+        if len(queued) < batch_size:
+            return rebuilt
+
+
+def _in_range(queryset, date_field, date_from, date_to):
+    if date_from:
+        queryset = queryset.filter(**{f'{date_field}__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{date_field}__lte': date_to})
+    return queryset
+
+
+def live_cells(date_from=None, date_to=None, space_type=None):
+    """What the report's query sums from the rollup, computed from the schedules instead."""
+    days = (_in_range(Schedule.objects.all(), 'date', date_from, date_to)
+            .order_by().values_list('date', flat=True).distinct())
+    totals = {}
+    for row in rollup_rows(days):
+        if space_type and row.space_type != space_type:
+            continue
+        # Numbered like ExtractWeekDay: Sunday = 1.
+        key = (row.space_type, row.capacity_from, row.date.isoweekday() % 7 + 1, row.hour_code)
+        counts = totals.setdefault(key, [0] * len(COUNTS))
+        for n, name in enumerate(COUNTS):
+            counts[n] += getattr(row, name)
+    return [(*key, *counts) for key, counts in totals.items()]
+
+
+def demand_report(date_from=None, date_to=None, space_type=None):
+    """The heatmaps of the days from ``date_from`` to ``date_to``, both optional, after a refresh."""
+    refresh()
+    cells = _in_range(DemandRollup.objects.all(), 'date', date_from, date_to)
+    if space_type:
+        cells = cells.filter(space_type=space_type)
+    cells = list(cells.annotate(weekday=ExtractWeekDay('date'))
+                 .values_list('space_type', 'capacity_from', 'weekday', 'hour_code')
+                 .annotate(*(Sum(name) for name in COUNTS)).order_by())
+    if not cells and not DemandRollup.objects.exists():
+        cells = live_cells(date_from, date_to, space_type)
+
+    codes = [slot.code for slot in hour_slots()]
+    # ExtractWeekDay counts from Sunday = 1; the heatmap rows follow WEEK_ORDER.
+    row = {(weekday + 1) % 7 + 1: WEEK_ORDER.index(weekday) for weekday in range(7)}
+    heatmaps = {}
+    for space_type, capacity_from, weekday, hour_code, *counts in cells:
+        if hour_code not in codes:
+            continue
+        heatmap = heatmaps.setdefault((space_type, capacity_from),
+                                      np.zeros((len(COUNTS), len(WEEK_ORDER), len(codes)), dtype=np.int64))
+        heatmap[:, row[weekday], codes.index(hour_code)] = counts
+
+    groups = []
+    for (space_type, capacity_from), heatmap in sorted(heatmaps.items()):
+        approved, under_review, conflicting, rejected = heatmap
+        figures = dict(zip(FIGURES, (approved + under_review + rejected, approved, under_review, conflicting,
+                                     rejected, rejected + conflicting)))
+        groups.append({
+            'space_type': space_type,
+            'capacity_band': band_label(capacity_from),
+            'capacity_from': capacity_from,
+            'totals': {name: int(values.sum()) for name, values in figures.items()},
+            'heatmaps': {name: values.tolist() for name, values in figures.items()},
+        })
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'weekdays': [WEEKDAY_NAMES[weekday] for weekday in WEEK_ORDER],
+        'hour_codes': codes,
+        'totals': {name: sum(group['totals'][name] for group in groups) for name in FIGURES},
+        'groups': groups,
+    }
+
+
+@receiver(post_init, sender=Schedule, dispatch_uid='roomito.demand.schedule_loaded')
+@receiver(post_init, sender=Space, dispatch_uid='roomito.demand.space_loaded')
+def remember_loaded(instance, **kwargs):
+    # What a save has to compare with: the day a schedule moves away from, the band a space
+    # leaves. Deferred fields are left alone rather than loaded.
+    instance._demand_loaded = tuple(instance.__dict__.get(name) for name in ('date', 'space_type', 'capacity'))
+
+
+def _schedule_day(instance):
+    if type(instance).schedule.is_cached(instance):
+        return instance.schedule.date if instance.schedule else None
+    if instance.schedule_id is None:
+        return None
+    return Schedule.objects.filter(pk=instance.schedule_id).values_list('date', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Reservation, dispatch_uid='roomito.demand.reservation')
+@receiver([post_save, post_delete], sender=Event, dispatch_uid='roomito.demand.event')
+def booking_changed(instance, origin=None, **kwargs):
+    if isinstance(origin, (Schedule, Space)):
+        # Cascaded from deleting the schedule or the space, which queue the days themselves.
+        return
+    queue_days([_schedule_day(instance)])
+
+
+@receiver([post_save, post_delete], sender=Schedule, dispatch_uid='roomito.demand.schedule')
+def schedule_changed(instance, origin=None, **kwargs):
+    if isinstance(origin, Space):
+        return
+    loaded_day = getattr(instance, '_demand_loaded', (None,))[0]
+    queue_days([instance.date, loaded_day])
+    instance._demand_loaded = (instance.date, None, None)
+
+
+@receiver(post_save, sender=Space, dispatch_uid='roomito.demand.space')
+def space_changed(instance, created=False, **kwargs):
+    _, space_type, capacity = getattr(instance, '_demand_loaded', (None, None, None))
+    if created or (space_type == instance.space_type and capacity_band(capacity or 1) == capacity_band(instance.capacity)):
+        return
+    queue_days(Schedule.objects.filter(space=instance).order_by().values_list('date', flat=True).distinct())
+    instance._demand_loaded = (None, instance.space_type, instance.capacity)
+
+
+@receiver(pre_delete, sender=Space, dispatch_uid='roomito.demand.space_deleted')
+def space_deleted(instance, **kwargs):
+    # Before the delete cascades to the schedules, while their days can still be read.
+    queue_days(Schedule.objects.filter(space=instance).order_by().values_list('date', flat=True).distinct())
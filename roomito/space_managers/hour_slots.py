@@ -0,0 +1,137 @@
+"""
+Process-wide registry of the hour slots.
+
+The twelve HourSlot rows are reference data. They are read by nearly every booking
+request and change perhaps once a year, from the admin. ``hour_slots()`` loads them
+once per process into an immutable snapshot. Validating hour codes and rendering
+start/end times then take no queries.
+
+Saving or deleting an HourSlot drops the snapshot of this process and bumps a
+generation number in the cache. Other processes compare against that number at
+most every ``CHECK_INTERVAL`` seconds and reload when it moved.
+"""
+import time
+from datetime import time as Time
+from types import MappingProxyType
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import HourSlot
+
+GENERATION_KEY = 'hour-slots:generation'
+CHECK_INTERVAL = 60
+_FIELDS = ('code', 'time_range', 'start_time', 'end_time')
+
+
+def _label(part):
+    # The API's format: "10:00" is padded to "10:00:00", single-digit hours are left as is.
+    return f"{part}:00" if len(part) == 5 else part
+
+
+class Slot(NamedTuple):
+    code: int
+    time_range: str
+    start_time: Time
+    end_time: Time
+    start_label: str
+    end_label: str
+
+    @classmethod
+    def from_model(cls, slot):
+        parts = slot.time_range.split('-')
+        return cls(slot.code, slot.time_range, slot.start_time, slot.end_time, _label(parts[0]), _label(parts[-1]))
+
+    def instance(self):
+        """A fresh HourSlot, as if loaded from the database, for assigning to a foreign key."""
+        return HourSlot.from_db('default', _FIELDS, (self.code, self.time_range, self.start_time, self.end_time))
+
+
+class HourSlotRegistry:
+    """Immutable snapshot of all hour slots, by code and in code order."""
+
+    __slots__ = ('slots', 'by_code', 'generation')
+
+    def __init__(self, slots, generation):
+        self.slots = tuple(slots)
+        self.by_code = MappingProxyType({slot.code: slot for slot in self.slots})
+        self.generation = generation
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def get(self, code):
+        return self.by_code.get(code)
+
+    def start_label(self, code):
+        slot = self.by_code.get(code)
+        return slot.start_label if slot else None
+
+    def end_label(self, code):
+        slot = self.by_code.get(code)
+        return slot.end_label if slot else None
+
+
+_registry = None
+_checked_at = 0.0
+
+
+def _fresh():
+    registry = _registry
+    if registry is not None and time.monotonic() - _checked_at < CHECK_INTERVAL:
+        return registry
+    return None
+
+
+def hour_slots():
+    """The current registry, loaded on first use and after a change."""
+    global _registry, _checked_at
+    registry = _fresh()
+    if registry is not None:
+        return registry
+    generation = cache.get(GENERATION_KEY, 0)
+    registry = _registry
+    if registry is None or registry.generation != generation:
+        registry = _registry = HourSlotRegistry(
+            (Slot.from_model(slot) for slot in HourSlot.objects.order_by('code')), generation,
+        )
+    _checked_at = time.monotonic()
+    return registry
+
+
+async def ahour_slots():
+    registry = _fresh()
+    if registry is not None:
+        return registry
+    return await sync_to_async(hour_slots)()
+
+
+def schedule_start_time(schedule):
+    """Start time of a schedule as the API renders it; reads the hour code id only."""
+    return hour_slots().start_label(getattr(schedule, 'start_hour_code_id', None))
+
+
+def schedule_end_time(schedule):
+    return hour_slots().end_label(getattr(schedule, 'end_hour_code_id', None))
+
+
+def _bump_generation():
+    global _registry
+    _registry = None
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, timeout=None)
+
+
+@receiver([post_save, post_delete], sender=HourSlot, dispatch_uid='roomito.hour_slots')
+def invalidate(**kwargs):
+    # After commit, or another process could reload the old rows under the new generation.
+    transaction.on_commit(_bump_generation)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from common.schema import build_schema_files, code_version
+import time
+
+
+class Command(BaseCommand):
+    help = "Prebuild the OpenAPI schema served at /api/schema/ for the current code version. Example: manage.py build_openapi_schema"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        version = code_version()
+        artifacts = build_schema_files(version)
+        sizes = ", ".join(f"{fmt}={len(a.body)}B (gzip {len(a.gzipped)}B)" for fmt, a in artifacts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Built schema {version} in {time.perf_counter() - started:.2f}s: {sizes}"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from space_managers.demand import queue_all, refresh
+import time
+
+
+class Command(BaseCommand):
+    help = ("Rebuild the demand rollup of the queued days. Example: manage.py refresh_demand_rollup "
+            "[--rebuild] [--batch-size 500]")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Queue every day with a schedule first, e.g. after seed_load_data or raw SQL writes.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Queue entries rebuilt per transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        started = time.perf_counter()
+        if options["rebuild"]:
+            with transaction.atomic():
+                queue_all()
+        days = refresh(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Done. rebuilt {days} day(s) in {time.perf_counter() - started:.1f}s"))
@@ -0,0 +1,398 @@
+import datetime
+import random
+import time
+from bisect import bisect
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from space_managers.demand import queue_days, refresh
+from space_managers.models import (
+    Event, HourSlot, Reservation, ReservationNotification, Schedule, Space, SpaceFeature, SpaceManager,
+)
+from staffs.models import Staff
+from students.models import Student
+
+FIRST_NAMES = ["علی", "محمد", "حسین", "رضا", "مهدی", "امیر", "سارا", "مریم", "زهرا", "فاطمه", "نرگس", "مهسا",
+               "نیلوفر", "کیان", "آرش", "پارسا", "هستی", "یاسمن", "سینا", "مهیا"]
+LAST_NAMES = ["محمدی", "حسینی", "احمدی", "رضایی", "کریمی", "موسوی", "جعفری", "صادقی", "رحیمی", "کاظمی",
+              "نوری", "قاسمی", "عباسی", "اکبری", "طاهری", "شریفی"]
+
+# (space_type, share of spaces, capacity range, display name, reservation_type weights: event/class/gathering)
+SPACE_KINDS = [
+    ("class", 0.55, (20, 80), "کلاس", (0.15, 0.7, 0.15)),
+    ("labratory", 0.2, (12, 40), "آزمایشگاه", (0.1, 0.8, 0.1)),
+    ("hall", 0.1, (100, 500), "سالن", (0.6, 0.1, 0.3)),
+    ("office", 0.15, (4, 20), "دفتر", (0.2, 0.2, 0.6)),
+]
+RESERVATION_TYPES = ("event", "class", "gathering")
+
+# Demand per hour code (7:00 .. 19:00): a mid-morning peak, a lunch dip and a smaller afternoon peak.
+HOUR_DEMAND = [0.4, 1.0, 1.3, 1.4, 1.1, 0.5, 0.9, 1.2, 1.1, 0.8, 0.5, 0.3]
+# Requests are 1-4 consecutive hour codes long.
+LENGTH_WEIGHTS = [0.5, 0.3, 0.12, 0.08]
+# Requests are made 1 to LEAD_DAYS days before the day they are for.
+LEAD_DAYS = 14
+
+# Academic calendar as (month, day) ranges with a demand multiplier; anything else is summer.
+SEASONS = [
+    ((9, 23), (1, 5), 1.0),    # fall semester
+    ((1, 6), (1, 25), 1.3),    # fall exams
+    ((1, 26), (2, 3), 0.2),    # winter break
+    ((2, 4), (3, 14), 1.0),    # spring semester
+    ((3, 15), (4, 3), 0.1),    # Nowruz holidays
+    ((4, 4), (6, 5), 1.0),     # spring semester
+    ((6, 6), (6, 25), 1.3),    # spring exams
+]
+SUMMER = 0.15
+# Python weekday() -> demand: Saturday to Wednesday are full days, Thursday a half day, Friday the weekend.
+WEEKDAY_DEMAND = {5: 1.0, 6: 1.0, 0: 1.0, 1: 1.0, 2: 1.0, 3: 0.35, 4: 0.03}
+
+UPCOMING_DAYS = 21
+
+
+def season_weight(day):
+    key = (day.month, day.day)
+    for start, end, weight in SEASONS:
+        if (start <= key <= end) if start <= end else (key >= start or key <= end):
+            return weight
+    return SUMMER
+
+
+def spread(total, weights):
+    """Split ``total`` over ``weights`` in whole numbers that add up to exactly ``total``."""
+    cumulative = list(accumulate(weights))
+    scale = total / cumulative[-1]
+    counts, previous = [], 0
+    for value in cumulative:
+        rounded = round(value * scale)
+        counts.append(rounded - previous)
+        previous = rounded
+    return counts
+
+
+class Writer:
+    """Inserts rows (tuples in ``fields`` order) with COPY on PostgreSQL, else with bulk_create."""
+
+    def __init__(self, use_copy, batch_size):
+        self.use_copy = use_copy
+        self.batch_size = batch_size
+
+    def write(self, model, fields, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            columns = ", ".join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+            with connection.cursor() as cursor:
+                with cursor.copy(f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+        else:
+            attnames = [model._meta.get_field(name).attname for name in fields]
+            # The rows carry their own timestamps, which auto_now_add would overwrite with the seeding time.
+            stamped = [field for field in model._meta.concrete_fields
+                       if field.attname in attnames and getattr(field, "auto_now_add", False)]
+            for field in stamped:
+                field.auto_now_add = False
+            try:
+                model.objects.bulk_create((model(**dict(zip(attnames, row))) for row in rows),
+                                          batch_size=self.batch_size)
+            finally:
+                for field in stamped:
+                    field.auto_now_add = True
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate load-test data: space managers, students, staff, spaces, schedules, reservations and events "
+        "with peak hours, semester seasonality and overlapping requests. The same --seed gives the same data. "
+        "Example: manage.py seed_load_data --schedules 2000000 [--seed 1] [--tag load] [--flush]. "
+        "Uses COPY on PostgreSQL and bulk_create elsewhere."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1, help="Random seed; the same seed generates the same rows.")
+        parser.add_argument("--tag", type=str, default="load",
+                            help="Marks the generated rows (email domain, space address) so --flush can find them.")
+        parser.add_argument("--flush", action="store_true", help="Delete rows generated earlier with the same --tag first.")
+        parser.add_argument("--flush-only", action="store_true", help="Delete the rows of --tag and generate nothing.")
+        parser.add_argument("--managers", type=int, default=20)
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--staff", type=int, default=500)
+        parser.add_argument("--spaces", type=int, default=200)
+        parser.add_argument("--features", type=int, default=0, help="Extra space features to create next to the defaults.")
+        parser.add_argument("--schedules", type=int, default=100000,
+                            help="Reservation requests, each with its own schedule. Approved ones also get an event.")
+        parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date(2025, 9, 23),
+                            help="First day of the generated calendar (YYYY-MM-DD).")
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--overlap", type=float, default=0.2,
+                            help="Share of requests aimed at a slot already requested for the same space and day.")
+        parser.add_argument("--password", type=str, default="load-test-password", help="Password of every generated user.")
+        parser.add_argument("--batch-size", type=int, default=20000, help="Rows per insert batch and transaction.")
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL.")
+
+    def handle(self, *args, **options):
+        self.tag = options["tag"]
+        self.email_domain = f"{self.tag}.seed.test"
+        self.address_prefix = f"[{self.tag}]"
+        if options["flush_only"]:
+            self.flush()
+            self.refresh_demand()
+            return
+
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        if options["managers"] < 1 or options["spaces"] < 1 or options["days"] < 1:
+            raise CommandError("--managers, --spaces and --days must be positive.")
+        if options["schedules"] and not (options["students"] or options["staff"]):
+            raise CommandError("Reservations need at least one student or staff member.")
+        self.hour_codes = list(HourSlot.objects.order_by("code").values_list("code", flat=True))
+        if not self.hour_codes:
+            raise CommandError("No hour slots; run migrate first.")
+
+        if options["flush"]:
+            self.flush()
+        elif User.objects.filter(email__endswith=f"@{self.email_domain}").exists():
+            raise CommandError(f"Data tagged '{self.tag}' already exists; pass --flush to replace it.")
+
+        self.rng = random.Random(options["seed"])
+        # A generator of its own, so the rows drawn from self.rng stay what earlier versions made.
+        self.lead_rng = random.Random(f"{options['seed']}-created-at")
+        self.seeded_at = timezone.now()
+        self.writer = Writer(connection.vendor == "postgresql" and not options["no_copy"], options["batch_size"])
+        self.joined = datetime.datetime.combine(options["start"], datetime.time(), tzinfo=datetime.timezone.utc)
+        # One hash for everyone, salted from the seed so reruns produce identical rows.
+        self.password = make_password(options["password"], salt=f"seed{options['seed']}{self.tag}".replace("-", ""))
+
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                managers = self.create_managers(options["managers"])
+                students = self.create_students(options["students"])
+                staff = self.create_staff(options["staff"])
+                spaces = self.create_spaces(options["spaces"], options["features"], managers)
+            self.stdout.write(f"{len(managers)} managers, {len(students)} students, {len(staff)} staff and "
+                              f"{len(spaces)} spaces in {time.perf_counter() - started:.1f}s")
+            totals = self.create_schedules(options, spaces, students, staff)
+        except Exception as e:
+            raise CommandError(f"Seeding failed: {e}. Rerun with --flush to clear partial data.") from e
+        self.reset_sequences()
+        self.refresh_demand()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {elapsed:.1f}s ({'COPY' if self.writer.use_copy else 'bulk_create'}). "
+            + ", ".join(f"{name}={count}" for name, count in totals.items())
+        ))
+
+    def person(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def user_row(self, user_id, username, first_name, last_name):
+        return (user_id, username, first_name, last_name, f"{username}@{self.email_domain}", self.password,
+                True, False, False, self.joined)
+
+    USER_FIELDS = ("id", "username", "first_name", "last_name", "email", "password",
+                   "is_active", "is_staff", "is_superuser", "date_joined")
+
+    def create_managers(self, count):
+        user_id, manager_id = next_id(User), next_id(SpaceManager)
+        users, managers = [], []
+        for n in range(count):
+            first_name, last_name = self.person()
+            username = f"{self.tag}-manager-{n}"
+            users.append(self.user_row(user_id + n, username, first_name, last_name))
+            managers.append((manager_id + n, user_id + n, first_name, last_name, username, f"{username}@{self.email_domain}"))
+        self.writer.write(User, self.USER_FIELDS, users)
+        self.writer.write(SpaceManager, ("id", "user", "first_name", "last_name", "username", "email"), managers)
+        return [row[0] for row in managers]
+
+    def create_students(self, count):
+        user_id, student_pk = next_id(User), next_id(Student)
+        users, students = [], []
+        for n in range(count):
+            first_name, last_name = self.person()
+            # Codes follow the primary key, so runs with different tags never collide.
+            student_id = f"99{student_pk + n:010d}"
+            users.append(self.user_row(user_id + n, student_id, first_name, last_name))
+            students.append((student_pk + n, user_id + n, student_id, f"9{student_pk + n:09d}", "student_cards/seed.jpg",
+                             self.rng.random() < 0.9))
+        self.writer.write(User, self.USER_FIELDS, users)
+        self.writer.write(Student, ("id", "user", "student_id", "national_id", "student_card_photo", "is_approved"), students)
+        return [row[0] for row in students]
+
+    def create_staff(self, count):
+        user_id, staff_id = next_id(User), next_id(Staff)
+        users, staff = [], []
+        for n in range(count):
+            first_name, last_name = self.person()
+            personnel_code = f"7{staff_id + n:09d}"
+            registered = self.rng.random() < 0.7
+            if registered:
+                users.append(self.user_row(user_id + len(users), personnel_code, first_name, last_name))
+            staff.append((staff_id + n, users[-1][0] if registered else None, first_name, last_name,
+                          f"{personnel_code}@{self.email_domain}", personnel_code, f"8{staff_id + n:09d}", registered))
+        self.writer.write(User, self.USER_FIELDS, users)
+        self.writer.write(Staff, ("id", "user", "first_name", "last_name", "email", "personnel_code", "national_id",
+                                  "is_registered"), staff)
+        return [row[0] for row in staff]
+
+    def create_spaces(self, count, extra_features, managers):
+        feature_id = next_id(SpaceFeature)
+        self.writer.write(SpaceFeature, ("id", "name"),
+                          [(feature_id + n, f"{self.tag} feature {n}") for n in range(extra_features)])
+        feature_ids = list(SpaceFeature.objects.order_by("id").values_list("id", flat=True))
+
+        space_id, link_id = next_id(Space), next_id(Space.features.through)
+        kinds = self.rng.choices(SPACE_KINDS, weights=[kind[1] for kind in SPACE_KINDS], k=count)
+        spaces, links = [], []
+        for n, (space_type, _share, (low, high), label, type_weights) in enumerate(kinds):
+            building = self.rng.randint(1, max(count // 25, 1))
+            spaces.append((space_id + n, f"{label} {n + 1}", f"{self.address_prefix} ساختمان {building}",
+                           self.rng.randint(low, high), None, "no description", space_type, self.rng.choice(managers)))
+            for feature in self.rng.sample(feature_ids, k=min(len(feature_ids), self.rng.randint(0, 5))):
+                links.append((link_id + len(links), space_id + n, feature))
+        self.writer.write(Space, ("id", "name", "address", "capacity", "phone_number", "description", "space_type",
+                                  "space_manager"), spaces)
+        self.writer.write(Space.features.through, ("id", "space", "spacefeature"), links)
+
+        # A few spaces draw most of the requests: Zipf-like popularity, in random order.
+        popularity = [1 / (rank + 1) ** 0.8 for rank in range(count)]
+        self.rng.shuffle(popularity)
+        return [(row[0], row[1], type_weights, weight)
+                for row, (*_, type_weights), weight in zip(spaces, kinds, popularity)]
+
+    def create_schedules(self, options, spaces, students, staff):
+        rng = self.rng
+        codes = self.hour_codes
+        first_code, last_code = codes[0], codes[-1]
+        hour_cum = list(accumulate(HOUR_DEMAND[i] if i < len(HOUR_DEMAND) else 0.3 for i in range(len(codes))))
+        length_cum = list(accumulate(LENGTH_WEIGHTS))
+        space_cum = list(accumulate(space[3] for space in spaces))
+
+        days = [options["start"] + datetime.timedelta(days=n) for n in range(options["days"])]
+        per_day = spread(options["schedules"], [season_weight(day) * WEEKDAY_DEMAND[day.weekday()] for day in days])
+        upcoming_from = days[-1] - datetime.timedelta(days=UPCOMING_DAYS)
+        reservee_cum = list(accumulate((0.8 if students else 0, 0.2 if staff else 0)))
+
+        schedule_id, reservation_id, event_id = next_id(Schedule), next_id(Reservation), next_id(Event)
+        schedules, reservations, events = [], [], []
+        totals = dict.fromkeys(("schedules", "approved", "rejected", "under_review", "overlapping"), 0)
+
+        def flush():
+            with transaction.atomic():
+                self.writer.write(Schedule, ("id", "date", "space", "start_hour_code", "end_hour_code"), schedules)
+                self.writer.write(Reservation, ("id", "reservation_type", "reservee_type", "student", "staff",
+                                                "phone_number", "description", "status", "space", "schedule",
+                                                "manager_comment", "created_at"), reservations)
+                self.writer.write(Event, ("id", "title", "event_type", "space", "organizer", "student_organizer",
+                                          "staff_organizer", "description", "schedule"), events)
+            totals["schedules"] += len(schedules)
+            schedules.clear()
+            reservations.clear()
+            events.clear()
+
+        started = time.perf_counter()
+        for day, count in zip(days, per_day):
+            requested = []        # (space index, start, end) of this day's requests so far
+            approved = {}         # space index -> bitmask of approved hour codes
+            decided_share = 1.0 if day < upcoming_from else 0.3
+            for _ in range(count):
+                if requested and rng.random() < options["overlap"]:
+                    space_index, start, end = rng.choice(requested)
+                    shift = rng.choice((-1, 0, 0, 1))
+                    if first_code <= start + shift and end + shift <= last_code:
+                        start, end = start + shift, end + shift
+                    totals["overlapping"] += 1
+                else:
+                    space_index = bisect(space_cum, rng.random() * space_cum[-1])
+                    start = codes[bisect(hour_cum, rng.random() * hour_cum[-1])]
+                    end = min(start + bisect(length_cum, rng.random() * length_cum[-1]), last_code)
+                requested.append((space_index, start, end))
+
+                space_pk, space_name, type_weights, _ = spaces[space_index]
+                mask = ((1 << (end - start + 1)) - 1) << start
+                if rng.random() >= decided_share:
+                    status = "under_review"
+                elif not approved.get(space_index, 0) & mask and rng.random() < 0.85:
+                    status = "approved"
+                    approved[space_index] = approved.get(space_index, 0) | mask
+                else:
+                    status = "rejected"
+                totals[status] += 1
+
+                reservation_type = rng.choices(RESERVATION_TYPES, weights=type_weights)[0]
+                if bisect(reservee_cum, rng.random() * reservee_cum[-1]) == 0:
+                    reservee_type, student, staff_member = "student", rng.choice(students), None
+                else:
+                    reservee_type, student, staff_member = "staff", None, rng.choice(staff)
+
+                schedules.append((schedule_id, day, space_pk, start, end))
+                reservations.append((reservation_id, reservation_type, reservee_type, student, staff_member, None,
+                                     "no description", status, space_pk, schedule_id,
+                                     "" if status in ("approved", "rejected") else None, self.created_at(day)))
+                if status == "approved":
+                    events.append((event_id, f"{reservation_type.title()} at {space_name}", reservation_type, space_pk,
+                                   reservee_type, student, staff_member, "no description", schedule_id))
+                    event_id += 1
+                schedule_id += 1
+                reservation_id += 1
+
+            if len(schedules) >= options["batch_size"]:
+                flush()
+                self.stdout.write(f"  {totals['schedules']} schedules through {day} "
+                                  f"({time.perf_counter() - started:.1f}s)")
+        flush()
+        # COPY and bulk_create send no signals, so the demand rollup has to be told.
+        with transaction.atomic():
+            queue_days(days)
+        totals["events"] = totals["approved"]
+        return totals
+
+    def created_at(self, day):
+        """When a request for ``day`` was made: a few days earlier, in office hours, never after the seeding."""
+        made = datetime.datetime.combine(day - datetime.timedelta(days=self.lead_rng.randint(1, LEAD_DAYS)),
+                                         datetime.time(self.lead_rng.randint(7, 18), self.lead_rng.randrange(60)),
+                                         tzinfo=datetime.timezone.utc)
+        return min(made, self.seeded_at)
+
+    def refresh_demand(self):
+        started = time.perf_counter()
+        days = refresh()
+        self.stdout.write(f"Demand rollup: rebuilt {days} day(s) in {time.perf_counter() - started:.1f}s")
+
+    def reset_sequences(self):
+        models = [User, SpaceManager, Student, Staff, SpaceFeature, Space, Space.features.through,
+                  Schedule, Reservation, Event]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def flush(self):
+        spaces = Space.objects.filter(address__startswith=self.address_prefix)
+        with transaction.atomic():
+            queue_days(Schedule.objects.filter(space__in=spaces).order_by().values_list("date", flat=True).distinct())
+            ReservationNotification.objects.filter(related_reservation__space__in=spaces).update(related_reservation=None)
+            # Bulk deletes, children first: the ORM's cascade collector would load millions of rows.
+            deleted = {
+                "events": Event.objects.filter(space__in=spaces)._raw_delete(connection.alias),
+                "reservations": Reservation.objects.filter(space__in=spaces)._raw_delete(connection.alias),
+                "schedules": Schedule.objects.filter(space__in=spaces)._raw_delete(connection.alias),
+            }
+            Space.features.through.objects.filter(space__in=spaces).delete()
+            deleted["spaces"] = spaces.delete()[0]
+            Staff.objects.filter(email__endswith=f"@{self.email_domain}").delete()
+            deleted["users"] = User.objects.filter(email__endswith=f"@{self.email_domain}").delete()[0]
+            SpaceFeature.objects.filter(name__startswith=f"{self.tag} feature ").delete()
+        self.stdout.write("Flushed " + ", ".join(f"{name}={count}" for name, count in deleted.items()))
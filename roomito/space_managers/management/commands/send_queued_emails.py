@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from space_managers.outbox import send_pending
+from datetime import timedelta
+import time
+
+
+class Command(BaseCommand):
+    help = "Send queued notification emails from the outbox. Example: manage.py send_queued_emails [--batch-size 100] [--loop --interval 10]"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Emails claimed per batch / SMTP connection.")
+        parser.add_argument("--max-attempts", type=int, default=5, help="Mark an email as failed after this many attempts.")
+        parser.add_argument("--backoff", type=float, default=30.0, help="Seconds before retrying a failed email; doubles with every further failure.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox instead of exiting when it is drained.")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds to sleep between polls in --loop mode.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        total_sent, total_failed = 0, 0
+        while True:
+            sent, failed = send_pending(batch_size=batch_size, max_attempts=options["max_attempts"],
+                                        backoff=timedelta(seconds=options["backoff"]))
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                # Failed rows are not due again until their backoff runs out, so this drains.
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Done. sent={total_sent}, failed_attempts={total_failed}"))
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from django.db import migrations, models
+
+
+def fill_times(apps, schema_editor):
+    HourSlot = apps.get_model('space_managers', 'HourSlot')
+    for slot in HourSlot.objects.all():
+        start, end = slot.time_range.split('-')
+        slot.start_time = datetime.strptime(start.strip(), '%H:%M').time()
+        slot.end_time = datetime.strptime(end.strip(), '%H:%M').time()
+        slot.save(update_fields=['start_time', 'end_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_managers', '0017_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hourslot',
+            name='start_time',
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='hourslot',
+            name='end_time',
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_times, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='hourslot',
+            name='start_time',
+            field=models.TimeField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='hourslot',
+            name='end_time',
+            field=models.TimeField(editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_managers', '0018_hourslot_start_time_end_time'),
+        ('staffs', '0004_alter_staff_personnel_code'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['space', 'status'], name='reservation_space_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['date', 'start_hour_code'], name='schedule_date_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['space', 'date'], name='schedule_space_date_idx'),
+        ),
+    ]
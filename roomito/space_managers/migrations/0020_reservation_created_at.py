@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_managers', '0019_reservation_list_indexes'),
+    ]
+
+    operations = [
+        # Added as a plain nullable column first: adding it with auto_now_add would stamp
+        # every existing request with the time of the migration.
+        migrations.AddField(
+            model_name='reservation',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='reservation',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+def queue_scheduled_days(apps, schema_editor):
+    # The rollup starts empty: every day with a schedule is built on the first refresh.
+    Schedule = apps.get_model('space_managers', 'Schedule')
+    DemandRollupQueue = apps.get_model('space_managers', 'DemandRollupQueue')
+    days = Schedule.objects.order_by().values_list('date', flat=True).distinct()
+    DemandRollupQueue.objects.bulk_create(DemandRollupQueue(date=day) for day in days)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_managers', '0020_reservation_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandRollupQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DemandRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('space_type', models.CharField(max_length=20)),
+                ('capacity_from', models.PositiveIntegerField()),
+                ('hour_code', models.PositiveSmallIntegerField()),
+                ('approved', models.PositiveIntegerField(default=0)),
+                ('under_review', models.PositiveIntegerField(default=0)),
+                ('conflicting', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'space_type', 'capacity_from', 'hour_code'), name='demand_rollup_cell_uniq')],
+            },
+        ),
+        migrations.RunPython(queue_scheduled_days, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,7 @@ from django.utils import timezone
 from django.core.validators import MinValueValidator
 from django.db.models.functions import Lower
 from django.db.models import Q
+from datetime import datetime
 
 
 class SpaceManager(models.Model):
@@ -53,6 +54,10 @@ class Space(models.Model):
 
     @property
     def first_image(self):
+        # Use prefetch_related("images") when the list view did it, instead of one query per space.
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('images')
+        if prefetched is not None:
+            return min(prefetched, key=lambda image: image.id, default=None)
         return self.images.order_by('id').first()
 
 
@@ -70,6 +75,9 @@ class SpaceImage(models.Model):
 class HourSlot(models.Model):
     code = models.PositiveSmallIntegerField(primary_key=True)
     time_range = models.CharField(max_length=11, unique=True)  
+    # Parsed from time_range on save; read through space_managers.hour_slots.
+    start_time = models.TimeField(editable=False)
+    end_time = models.TimeField(editable=False)
 
     def __str__(self):
         return self.time_range
@@ -77,6 +85,27 @@ class HourSlot(models.Model):
     class Meta:
         ordering = ['code']
 
+    @staticmethod
+    def parse_time_range(time_range):
+        """"7:00-8:00" -> (time(7, 0), time(8, 0))."""
+        try:
+            start, end = (datetime.strptime(part.strip(), '%H:%M').time() for part in time_range.split('-'))
+        except (AttributeError, ValueError):
+            raise ValidationError("Time range must look like 7:00-8:00.")
+        if end <= start:
+            raise ValidationError("Time range must end after it starts.")
+        return start, end
+
+    def clean(self):
+        self.start_time, self.end_time = self.parse_time_range(self.time_range)
+
+    def save(self, *args, **kwargs):
+        self.clean()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'time_range' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'start_time', 'end_time'}
+        super().save(*args, **kwargs)
+
 
 class Schedule(models.Model):
     start_hour_code = models.ForeignKey(HourSlot, on_delete=models.PROTECT, related_name='start_schedules')
@@ -84,26 +113,34 @@ class Schedule(models.Model):
     date = models.DateField(default=timezone.now)
     space = models.ForeignKey(Space, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # Newest-first order of the manager reservation list, read by a backward scan.
+            models.Index(fields=['date', 'start_hour_code'], name='schedule_date_start_idx'),
+            # Per-space date lookups: conflict checks, availability and date-range filters.
+            models.Index(fields=['space', 'date'], name='schedule_space_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.space.name} - {self.date} - {self.start_hour_code} till {self.end_hour_code}"
 
     def clean(self):
-        if self.end_hour_code.code < self.start_hour_code.code:
+        # HourSlot's primary key is its code, so the *_id columns are the codes themselves.
+        if self.end_hour_code_id < self.start_hour_code_id:
             raise ValidationError("End hour code must be after start hour code.")
 
-        existing = (
+        conflicting = (
             Schedule.objects
-            .filter(space=self.space, date=self.date)
+            .filter(space_id=self.space_id, date=self.date)
             .exclude(pk=self.pk)
             .filter(
                 Q(event_instance__isnull=False) |
                 Q(reservation_instance__status='approved')
             )
+            .filter(start_hour_code__lte=self.end_hour_code_id, end_hour_code__gte=self.start_hour_code_id)
         )
-        for schedule in existing:
-            if (self.start_hour_code.code <= schedule.end_hour_code.code and
-                self.end_hour_code.code >= schedule.start_hour_code.code):
-                raise ValidationError("This time conflicts with another schedule on the same date.")
+        if conflicting.exists():
+            raise ValidationError("This time conflicts with another schedule on the same date.")
 
     @property
     def is_locked(self):
@@ -153,6 +190,11 @@ class Reservation(models.Model):
     responsible_organizer = models.CharField(max_length=100, null=True, blank=True)
     position = models.CharField(max_length=100, null=True, blank=True)
     manager_comment = models.TextField(null=True, blank=True)
+    # Null on requests made before the field existed.
+    created_at = models.DateTimeField(auto_now_add=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['space', 'status'], name='reservation_space_status_idx')]
 
     def __str__(self):
         reservee_name = self.student.user.first_name if self.student else (self.staff.first_name if self.staff else "unknown")
@@ -221,4 +263,64 @@ class ReservationNotification(models.Model):
     related_reservation = models.ForeignKey('Reservation', on_delete=models.SET_NULL, null=True, blank=True)
 
     def __str__(self):
-        return f"Notification for {self.recipient.username} at {self.created_at}"        
\ No newline at end of file
+        return f"Notification for {self.recipient.username} at {self.created_at}"
+
+class OutboxEmail(models.Model):
+    STATUSES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254, null=True, blank=True)
+    recipient = models.EmailField()
+    status = models.CharField(max_length=20, choices=STATUSES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # Due time of the next attempt: pushed back exponentially after a failure, and by a lease
+    # while a sender holds the row as 'sending', so a crashed sender's rows come back.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx')]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
+
+
+class DemandRollup(models.Model):
+    """
+    Requested hour slots of one day, per space type, capacity band and hour code, by
+    reservation status. Maintained by ``space_managers.demand``.
+    """
+    date = models.DateField()
+    space_type = models.CharField(max_length=20)
+    capacity_from = models.PositiveIntegerField()
+    hour_code = models.PositiveSmallIntegerField()
+    approved = models.PositiveIntegerField(default=0)
+    under_review = models.PositiveIntegerField(default=0)
+    # Under-review slots already taken by an approved reservation or an event.
+    conflicting = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'space_type', 'capacity_from', 'hour_code'],
+                                    name='demand_rollup_cell_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.space_type} {self.capacity_from}+ hour {self.hour_code}"
+
+
+class DemandRollupQueue(models.Model):
+    """A day whose DemandRollup rows are out of date; the same day may be queued more than once."""
+    date = models.DateField()
+
+    def __str__(self):
+        return f"{self.date} (queued)"
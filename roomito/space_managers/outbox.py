@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def default_from_email():
+    return getattr(settings, 'DEFAULT_FROM_EMAIL', None) or settings.EMAIL_HOST_USER
+
+
+def queue_emails(items):
+    """Queue ``(subject, message, recipient)`` tuples; call inside the transaction that caused them."""
+    from_email = default_from_email()
+    rows = [
+        OutboxEmail(subject=subject, message=message, from_email=from_email, recipient=recipient)
+        for subject, message, recipient in items
+        if recipient
+    ]
+    OutboxEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def retry_later(item, error, max_attempts, backoff):
+    """Record a failed attempt: retry after an exponential backoff, or give up after ``max_attempts``."""
+    item.last_error = str(error)
+    item.status = 'failed' if item.attempts >= max_attempts else 'pending'
+    item.next_attempt_at = timezone.now() + min(backoff * 2 ** (item.attempts - 1), timedelta(days=1))
+
+
+def claim_batch(batch_size, lease):
+    """
+    Take up to ``batch_size`` due emails in a short transaction of their own: mark them
+    'sending' and count the attempt, so other senders skip them while SMTP runs unlocked.
+    A row whose sender died is due again once its ``lease`` runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=('pending', 'sending'), next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        for item in batch:
+            item.status = 'sending'
+            item.attempts += 1
+            item.next_attempt_at = now + lease
+        OutboxEmail.objects.bulk_update(batch, ['status', 'attempts', 'next_attempt_at'])
+    return batch
+
+
+def send_pending(batch_size=100, max_attempts=5, backoff=timedelta(seconds=30), lease=timedelta(minutes=10)):
+    batch = claim_batch(batch_size, lease)
+    if not batch:
+        return 0, 0
+
+    sent, failed = 0, 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for item in batch:
+            try:
+                EmailMessage(
+                    subject=item.subject,
+                    body=item.message,
+                    from_email=item.from_email,
+                    to=[item.recipient],
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                retry_later(item, e, max_attempts, backoff)
+                failed += 1
+            else:
+                item.status = 'sent'
+                item.sent_at = timezone.now()
+                item.last_error = None
+                sent += 1
+    except Exception as e:
+        # The connection itself failed: the rest of the batch goes back with a retry delay.
+        for item in batch:
+            if item.status == 'sending':
+                retry_later(item, e, max_attempts, backoff)
+                failed += 1
+    finally:
+        connection.close()
+
+    OutboxEmail.objects.bulk_update(batch, ['status', 'last_error', 'sent_at', 'next_attempt_at'])
+    return sent, failed
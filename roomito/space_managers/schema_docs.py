@@ -0,0 +1,1711 @@
+"""OpenAPI documentation (summaries, examples, responses) of the space_managers views.
+
+Keyed by "<View>.<method>" and attached to the handlers marked ``@lazy_schema`` only
+when a schema is generated (common.lazy_schema), so workers never build these objects.
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter, OpenApiResponse
+
+from .serializers import (
+    DemandReportSerializer,
+    ErrorResponseSerializer,
+    EventSerializer,
+    FeatureIdsSerializer,
+    ManagerDashboardSerializer,
+    ManagerSpaceDetailSerializer,
+    ManagerSpaceListSerializer,
+    ReservationCreateSerializer,
+    ReservationDecisionSerializer,
+    ReservationDetailSerializer,
+    ReservationListSerializer,
+    ScheduleAvailabilitySerializer,
+    SpaceCreateSerializer,
+    SpaceFeatureSerializer,
+    SpaceListSerializer,
+    SpaceManagerProfileSerializer,
+    SpaceManagerProfileUpdateSerializer,
+    SpaceSerializer,
+    SpaceUpdateSerializer,
+    SuccessResponseSerializer,
+    UtilizationReportSerializer,
+)
+
+
+UTILIZATION_PARAMETERS = [
+    OpenApiParameter(
+        name='date_from',
+        type=OpenApiTypes.DATE,
+        location=OpenApiParameter.QUERY,
+        description='First day of the report (YYYY-MM-DD, default: 364 days before date_to)',
+        required=False,
+    ),
+    OpenApiParameter(
+        name='date_to',
+        type=OpenApiTypes.DATE,
+        location=OpenApiParameter.QUERY,
+        description='Last day of the report (YYYY-MM-DD, default: today); at most 731 days in all',
+        required=False,
+    ),
+    OpenApiParameter(
+        name='space_type',
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description='Only spaces of this type',
+        required=False,
+        enum=['hall', 'class', 'labratory', 'office'],
+    ),
+    OpenApiParameter(
+        name='space_id',
+        type=OpenApiTypes.INT,
+        location=OpenApiParameter.QUERY,
+        description='Only this space',
+        required=False,
+    ),
+    OpenApiParameter(
+        name='feature',
+        type=OpenApiTypes.INT,
+        location=OpenApiParameter.QUERY,
+        description='Only spaces with this feature ID',
+        required=False,
+    ),
+]
+
+
+SCHEMAS = {
+    'SpaceManagerProfileView': extend_schema(tags=['space_manager']),
+
+    'SpaceManagerProfileView.get': extend_schema(
+        responses={
+            200: OpenApiResponse(
+                response=SpaceManagerProfileSerializer,
+                description="Space manager profile retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value={
+                            "first_name": "string",
+                            "last_name": "string",
+                            "email": "string@example.com",
+                            "username": "string"
+                        },
+                        response_only=True
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication credentials were not provided or invalid.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager.",
+                examples=[
+                    OpenApiExample(
+                        name="NotSpaceManager",
+                        value={"error": "User is not a space manager."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Server error while retrieving profile.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred while retrieving profile."}
+                    )
+                ]
+            )
+        },
+        description="Retrieves the authenticated space manager's profile."
+    ),
+
+    'SpaceManagerProfileUpdateView': extend_schema(tags=['space_manager']),
+
+    'SpaceManagerProfileUpdateView.patch': extend_schema(
+        request=SpaceManagerProfileUpdateSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=SuccessResponseSerializer,
+                description="Profile updated successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="UpdateSuccess",
+                        value={"message": "Profile updated successfully."}
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid input or validation error.",
+                examples=[
+                    OpenApiExample(
+                        name="DuplicateUsername",
+                        value={"username": ["This username is already in use."]}
+                    ),
+                    # OpenApiExample( 
+                    #     name="DuplicateEmail",
+                    #     value={"email": ["This email is already in use."]}
+                    # ),
+                    OpenApiExample(
+                        name="MissingCurrentPassword",
+                        value={"current_password": ["Current password is required to change password."]}
+                    ),
+                    OpenApiExample(
+                        name="IncorrectCurrentPassword",
+                        value={"current_password": ["Current password is incorrect."]}
+                    ),
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication credentials were not provided or invalid.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager.",
+                examples=[
+                    OpenApiExample(
+                        name="NotSpaceManager",
+                        value={"error": "User is not a space manager."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Server error while updating profile.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred while updating profile."}
+                    )
+                ]
+            )
+        },
+        description="Update profile information of the authenticated space manager."
+    ),
+
+    'SpaceListView': extend_schema(tags=['space']),
+
+    'SpaceListView.get': extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='space_type',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Filter spaces by type',
+                required=False,
+                enum=['hall', 'class', 'labratory', 'office'] 
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=SpaceListSerializer(many=True),
+                description="List of all available spaces with details.",
+                examples=[
+                    OpenApiExample(
+                        name="RetrieveSpaceListSuccess",
+                        value=[
+                            {
+                                "id": 1,
+                                "space_type": "hall",
+                                "name": "string",
+                                "address": "string",
+                                "capacity": 50,
+                                "description": "string",
+                                "space_manager": {
+                                    "first_name": "string",
+                                    "last_name": "string",
+                                    "email": "string@example.com",
+                                    "username": "string",
+                                },
+                                "first_image_url": "http://localhost:8000/media/space_photos/1.jpg"
+                            }
+                        ],
+                        response_only=True
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"error": "Authentication credentials were not provided."},
+                        response_only=True
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="No spaces found in the database.",
+                examples=[
+                    OpenApiExample(
+                        name="NotFound",
+                        value={"error": "No spaces available."},
+                        response_only=True
+                    ),
+                    OpenApiExample(
+                        name="InvalidSpaceType",
+                        value={"error": "No spaces found for the specified space type."}  # اگه `space_type` نامعتبر باشه
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerErrorExample",
+                        value={"error": "An unexpected error occurred."}
+                    ),
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Failed to retrieve space data from database."}
+                    )
+                ]
+            )
+        },
+        description="Retrieves the list of all available spaces for authenticated users."
+    ),
+
+    'EventListView': extend_schema(tags=['event']),
+
+    'EventListView.get': extend_schema(
+        description="Retrieves the list of all available events for authenticated users.",
+        responses={
+            200: OpenApiResponse(
+                response=EventSerializer(many=True),
+                description="List of all available events with details.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value=[
+                            {
+                                "id": 1,
+                                "title": "کارگاه Django",
+                                "event_type": "event",
+                                "date": "2025-07-27",
+                                "start_time": "09:00:00",
+                                "end_time": "11:00:00",
+                                "space": {
+                                    "id": 3,
+                                    "space_type": "hall",
+                                    "name": "تالار برآنی",
+                                    "address": "دانشکده ...",
+                                    "capacity": 77,
+                                    "description": "no description",
+                                    "space_manager": {
+                                        "first_name": "Sara",
+                                        "last_name": "Karimi",
+                                        "email": "sara@example.com",
+                                        "username": "s.karimi"
+                                    },
+                                    "phone_number": "0313xxxxx",
+                                    "features": [],
+                                    "images": []
+                                },
+                                "poster_url": None,
+                                "organizer": {
+                                    "role": "staff",
+                                    "display": "Ali Ahmadi - 12345"
+                                },
+                                "description": "معرفی REST در Django"
+                            }
+                        ],
+                        response_only=True
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."},
+                    response_only=True
+                )]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="No events found in the database.",
+                examples=[OpenApiExample(
+                    name="NotFound",
+                    value={"error": "No events available."},
+                    response_only=True
+                )]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error while retrieving events.",
+                examples=[OpenApiExample(
+                    name="ServerError",
+                    value={"error": "An unexpected server error occurred."},
+                    response_only=True
+                )]
+            ),
+        }
+    ),
+
+    'EventDetailView': extend_schema(tags=['event']),
+
+    'EventDetailView.get': extend_schema(
+        description="Retrieve detailed information of a specific event by ID (only for authenticated users).",
+        parameters=[
+            OpenApiParameter(
+                name="event_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+                description="ID of the event to retrieve"
+            )
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=EventSerializer,
+                description="Detailed event data retrieved successfully.",
+                examples=[OpenApiExample(
+                    name="Success",
+                    value={
+                        "id": 10,
+                        "title": "جلسه دفاع",
+                        "event_type": "event",
+                        "date": "2025-08-25",
+                        "start_time": "09:00:00",
+                        "end_time": "11:00:00",
+                        "space": {
+                            "id": 2,
+                            "space_type": "hall",
+                            "name": "سالن ویدئوکنفرانس",
+                            "address": "ساختمان ...",
+                            "capacity": 15,
+                            "description": "no description",
+                            "space_manager": {
+                                "first_name": "Sara",
+                                "last_name": "Karimi",
+                                "email": "sara@example.com",
+                                "username": "s.karimi"
+                            },
+                            "phone_number": None,
+                            "features": [],
+                            "images": []
+                        },
+                        "poster": None,
+                        "description": "دفاع کارشناسی"
+                    },
+                    response_only=True
+                )]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."}
+                )]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Event not found.",
+                examples=[OpenApiExample(
+                    name="NotFound",
+                    value={"error": "Event with this ID does not exist."}
+                )]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error while retrieving events.",
+                examples=[OpenApiExample(
+                    name="ServerError",
+                    value={"error": "An unexpected server error occurred."}
+                )]
+            )
+        }
+    ),
+
+    'SpaceFeatureView': extend_schema(tags=['space_manager']),
+
+    'SpaceFeatureView.get': extend_schema(
+        description="Retrieves the available features for a space managed by the authenticated space manager.",
+        request=None,
+        responses={
+            200: OpenApiResponse(
+                response=SpaceFeatureSerializer(many=True), 
+                description="Space features retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value=[
+                            {"id": 1, "name": "string1"},
+                            {"id": 2, "name": "string2"}
+                        ]
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated or not a space manager.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"error": "Authentication credentials were not provided."}
+                    ),
+                    OpenApiExample(
+                        name="NotSpaceManager",
+                        value={"error": "User is not a space manager."}
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found or user is not the manager.",
+                examples=[
+                    OpenApiExample(
+                        name="NotFound",
+                        value={"error": "Space not found or you are not authorized to manage it."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred."}
+                    ),
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Failed to retrieve feature data from database."}
+                    )
+                ]
+            )
+        }
+    ),
+
+    'SpaceUpdateFeatureView': extend_schema(tags=['space_manager']),
+
+    'SpaceUpdateFeatureView.post': extend_schema(
+        description="Allows a space manager to add existing features to a space using their IDs.",
+        request=FeatureIdsSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=SuccessResponseSerializer,
+                description="Features updated successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value={
+                            "message": "Features updated successfully.",
+                            "updated_features": ["string1", "string2"]
+                        }
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid data or no feature IDs provided.",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidData",
+                        value={"error": "No feature IDs provided."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidFormat",
+                        value={"feature_ids": ["A valid list of integers is required."]}  
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found, user is not the manager, or feature ID is invalid.",
+                examples=[
+                    OpenApiExample(
+                        name="NotFound",
+                        value={"error": "Space not found or you are not authorized to manage it."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidFeature",
+                        value={"error": "One or more feature IDs are invalid: [999]"}
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated or not a space manager.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"error": "Authentication credentials were not provided."}
+                    ),
+                    OpenApiExample(
+                        name="NotSpaceManager",
+                        value={"error": "User is not a space manager."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred."}
+                    ),
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Failed to update features in database."}
+                    )
+                ]
+            )
+        }
+    ),
+
+    'ReservationCreateView': extend_schema(tags=['reservation']),
+
+    'ReservationCreateView.post': extend_schema(
+        description="Create a reservation request for a specific space by authenticated user (student or staff) with a list of consecutive hour codes.",
+        request=ReservationCreateSerializer,
+        responses={
+            201: OpenApiResponse(
+                response=ReservationCreateSerializer,
+                description="Reservation request created successfully and sent to space manager for review."
+            ),
+
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid data provided (serializer-level validation).",
+                examples=[
+                    OpenApiExample(
+                        name="DuplicateHours",
+                        value={"schedule": {"hour_codes": ["Duplicate hour codes are not allowed."]}}
+                    ),
+                    OpenApiExample(
+                        name="NonAscending",
+                        value={"schedule": {"hour_codes": ["Hour codes must be in ascending order."]}}
+                    ),
+                    OpenApiExample(
+                        name="NonConsecutive",
+                        value={"schedule": {"hour_codes": ["Hour codes must be consecutive."]}}
+                    ),
+                    OpenApiExample(
+                        name="InvalidPhoneNumber",
+                        value={"phone_number": ["Phone number must be exactly 11 digits."]}
+                    ),
+                    OpenApiExample(
+                        name="MissingField",
+                        value={"reservation_type": ["This field is required."]}
+                    ),
+                    OpenApiExample(
+                        name="WrongTypeForHourCodes",
+                        value={"schedule": {"hour_codes": { "0": ["Incorrect type. Expected pk value, received str."]}}}
+                    ),
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authenticated but not allowed to perform this action.",
+                examples=[
+                    OpenApiExample(
+                        name="Forbidden",
+                        value={"detail": "You do not have permission to perform this action."}
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found with the given ID.",
+                examples=[
+                    OpenApiExample(
+                        name="NotFound",
+                        value={"error": "Space not found."}
+                    )
+                ]
+            ),
+            409: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Time conflict with existing reservations on the same date/space.",
+                examples=[
+                    OpenApiExample(
+                        name="Conflict",
+                        value={"error": "This time conflicts with another schedule on the same date."}
+                    )
+                ]
+            ),
+            422: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unprocessable entity (e.g., invalid reservation/reservee type, role mismatch).",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidReservationType",
+                        value={"reservation_type": ["Invalid reservation type."]}
+                    ),
+                    OpenApiExample(
+                        name="InvalidReserveeType",
+                        value={"reservee_type": ["You must be a student or staff to create a reservation."]}
+                    ),
+                    OpenApiExample(
+                        name="RoleMismatch",
+                        value={"error": "For the staff reservee type, you must select a staff."}
+                    ),
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error (database/mail/unexpected).",
+                examples=[
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Database connection failed."}
+                    ),
+                    OpenApiExample(
+                        name="EmailError",
+                        value={"error": "Failed to send reservation request to space manager."}
+                    ),
+                    OpenApiExample(
+                        name="UnexpectedError",
+                        value={"error": "An unexpected error occurred."}
+                    )
+                ]
+            ),
+        }
+    ),
+
+    'ManagerReservationListView': extend_schema(tags=['space_manager']),
+
+    'ManagerReservationListView.get': extend_schema(
+        description=(
+            "Retrieve the list of reservation requests for spaces managed by the authenticated space manager, "
+            "newest first. Without `limit` or `cursor` the whole list is returned. With them it is paginated "
+            "by cursor: when more rows follow, the response carries a `Link: <url>; rel=\"next\"` header whose "
+            "URL returns the next page with the same filters. Pages leave out reservations without a schedule."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='status',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Comma-separated statuses to include: under_review, approved, rejected',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='reservation_type',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Comma-separated reservation types to include: event, class, gathering',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='space_id',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Only reservations of this space',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='date_from',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Only reservations on or after this date (YYYY-MM-DD)',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='date_to',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Only reservations on or before this date (YYYY-MM-DD)',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='Page size, 1 to 500. Turns pagination on; with only a cursor, pages hold 50 rows',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='cursor',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Opaque position taken from the next link of the previous page',
+                required=False,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=ReservationListSerializer(many=True),
+                description="The reservation requests, or a page of them, successfully retrieved.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value=[
+                            {
+                                "id": 1,
+                                "space_name": "string",
+                                "date": "2025-08-15",
+                                "start_time": "09:00:00",
+                                "end_time": "11:00:00",
+                                "status_display": "Under Review",
+                                "reservation_type": "event",
+                                "description": "string",
+                                "reservee_name": "string",
+                                "reservee_type": "student",
+                                "phone_number": "09123456789"
+                            }
+                        ]
+                    ),
+                    OpenApiExample(
+                        name="NoReservations",
+                        value=[]
+                    ),
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid filter, limit or cursor.",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidStatus",
+                        value={"error": "Invalid status. Use one or more of: under_review, approved, rejected."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidDate",
+                        value={"error": "Dates must be in YYYY-MM-DD format."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidLimit",
+                        value={"error": "limit must be an integer between 1 and 500."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidCursor",
+                        value={"error": "Invalid cursor."}
+                    ),
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager or has no managed spaces.",
+                examples=[
+                    OpenApiExample(
+                        name="Forbidden_NotManager",
+                        value={"error": "You are not authorized to view this list."}
+                    ),
+                    OpenApiExample(
+                        name="Forbidden_NoManagedSpaces",
+                        value={"error": "You do not manage any spaces."}
+                    ),
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred."}
+                    ),
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Failed to retrieve reservation data from database."}
+                    )
+                ]
+            )
+        }
+    ),
+
+    'ManagerDashboardView': extend_schema(tags=['space_manager']),
+
+    'ManagerDashboardView.get': extend_schema(
+        description=(
+            "Summary for the space manager's landing page, in total and per managed space: pending requests "
+            "and the age of the oldest one, today's approved bookings, and events from today on. "
+            "Requests made before reservations recorded their creation time are counted in "
+            "`pending_unknown_age` and do not count toward the oldest pending time and age. "
+            "Cached per manager and refreshed after any change to their reservations, schedules, events or spaces."
+        ),
+        responses={
+            200: OpenApiResponse(
+                response=ManagerDashboardSerializer,
+                description="Dashboard summary successfully retrieved.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value={
+                            "date": "2025-08-15",
+                            "pending_requests": 3,
+                            "pending_unknown_age": 0,
+                            "oldest_pending_created_at": "2025-08-12T09:30:00Z",
+                            "oldest_pending_age_seconds": 261000,
+                            "today_bookings": 2,
+                            "upcoming_events": 5,
+                            "next_event_date": "2025-08-15",
+                            "spaces": [
+                                {
+                                    "space_id": 1,
+                                    "space_name": "string",
+                                    "pending_requests": 3,
+                                    "pending_unknown_age": 0,
+                                    "oldest_pending_created_at": "2025-08-12T09:30:00Z",
+                                    "oldest_pending_age_seconds": 261000,
+                                    "today_bookings": 2,
+                                    "upcoming_events": 5,
+                                    "next_event_date": "2025-08-15"
+                                }
+                            ]
+                        }
+                    ),
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not authenticated.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager.",
+                examples=[
+                    OpenApiExample(
+                        name="Forbidden",
+                        value={"error": "You are not authorized to view this dashboard."}
+                    )
+                ]
+            ),
+        }
+    ),
+
+    'ManagerUtilizationView': extend_schema(tags=['space_manager']),
+
+    'ManagerUtilizationView.get': extend_schema(
+        description=(
+            "Occupancy of the authenticated manager's spaces over a date range: the share of hour slots "
+            "booked by an event or an approved reservation, per space, weekday, week (from Saturday), "
+            "space type and feature, every weekday/hour slot and the busiest ones, and idle capacity "
+            "(idle slots, and idle slots times capacity)."
+        ),
+        parameters=UTILIZATION_PARAMETERS,
+        responses={
+            200: OpenApiResponse(
+                response=UtilizationReportSerializer,
+                description="Utilization report successfully computed.",
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid date range or filter.",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidDate",
+                        value={"error": "Dates must be in YYYY-MM-DD format."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidRange",
+                        value={"error": "date_from must be on or before date_to, at most 731 days apart."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidSpaceType",
+                        value={"error": "Invalid space type."}
+                    ),
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager.",
+                examples=[
+                    OpenApiExample(
+                        name="Forbidden",
+                        value={"error": "You are not authorized to view this report."}
+                    )
+                ]
+            ),
+        }
+    ),
+
+    'ManagerUtilizationExportView': extend_schema(tags=['space_manager']),
+
+    'ManagerUtilizationExportView.get': extend_schema(
+        description="One section of the utilization report as a CSV download, with the same filters.",
+        parameters=[
+            *UTILIZATION_PARAMETERS,
+            OpenApiParameter(
+                name='breakdown',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Report section to export (default spaces)',
+                required=False,
+                enum=['spaces', 'weekdays', 'weeks', 'space_types', 'features', 'slots', 'peak_slots'],
+            ),
+        ],
+        responses={
+            (200, 'text/csv'): OpenApiResponse(
+                response=OpenApiTypes.STR,
+                description="CSV file, one row per entry of the section.",
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid breakdown, date range or filter.",
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager.",
+            ),
+        }
+    ),
+
+    'ManagerDemandView': extend_schema(tags=['space_manager']),
+
+    'ManagerDemandView.get': extend_schema(
+        description=(
+            "Requested hour slots of every reservation, whatever its status, as weekday x hour-code heatmaps "
+            "per space type and capacity band, across all spaces. Rows follow `weekdays` (from Saturday) and "
+            "columns `hour_codes`. `conflicting` counts under-review slots already held by an approved "
+            "reservation or an event; `unmet` is rejected plus conflicting. Read from a rollup table that is "
+            "brought up to date with the days changed since the last report."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='date_from',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='First day counted (YYYY-MM-DD, default: all history)',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='date_to',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='Last day counted (YYYY-MM-DD, default: all scheduled days)',
+                required=False,
+            ),
+            OpenApiParameter(
+                name='space_type',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Only spaces of this type',
+                required=False,
+                enum=['hall', 'class', 'labratory', 'office'],
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=DemandReportSerializer,
+                description="Demand heatmaps successfully computed.",
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid date or space type.",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidDate",
+                        value={"error": "Dates must be in YYYY-MM-DD format."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidRange",
+                        value={"error": "date_from must be on or before date_to."}
+                    ),
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a space manager.",
+            ),
+        }
+    ),
+
+    'ReservationDecisionView': extend_schema(tags=['space_manager']),
+
+    'ReservationDecisionView.post': extend_schema(
+        description="Approve or reject a reservation request by space manager. If approved, an Event will be created.",
+        request=ReservationDecisionSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=ReservationListSerializer,
+                description="Reservation decision successfully applied."
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid request (e.g., already decided, not authorized).",
+                examples=[
+                    OpenApiExample(
+                        name="AlreadyDecided",
+                        value={"error": "This reservation has already been processed."}
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User not authenticated.",
+                examples=[OpenApiExample(name="Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not the manager of this space.",
+                examples=[OpenApiExample(name="Forbidden", value={"error": "You are not authorized to make a decision for this reservation."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation not found.",
+                examples=[OpenApiExample(name="NotFound", value={"error": "Reservation not found."})]
+            ),
+            409: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Approval refused: the time overlaps an approved reservation or event of the same space.",
+                examples=[OpenApiExample(name="Conflict", value={"error": "This time conflicts with another schedule on the same date."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample(name="ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        }
+    ),
+
+    'SpaceDetailView': extend_schema(tags=['space']),
+
+    'SpaceDetailView.get': extend_schema(
+        description="Retrieve the details of a specific space for the authenticated users.",
+        responses={
+            200: OpenApiResponse(
+                response=SpaceSerializer(),
+                description="Space details retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="success",
+                        value={
+                            "id": 1,
+                            "space_type": "string",
+                            "name": "string",
+                            "address": "string",
+                            "capacity": 50,
+                            "description": "string",
+                            "space_manager": {
+                                "id": 1,
+                                "first_name": "string",
+                                "last_name": "string",
+                                "username": "string",
+                                "email": "string@example.com"
+                            },
+                            "features": [
+                                {"id": 1, "name": "string"},
+                                {"id": 2, "name": "string"}
+                            ],
+                            "images": [
+                                {"id": 1, "url": "http://localhost:8000/media/space_photos/1.jpg"}
+                            ]
+                        }
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication credentials were not provided or are invalid.",
+                examples=[
+                    OpenApiExample(
+                        name="unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid space ID provided (e.g., negative or non-integer value).",
+                examples=[
+                    OpenApiExample(
+                        name="bad_request",
+                        value={"error": "Invalid space ID. Must be a positive integer."}
+                    ),
+                    OpenApiExample(
+                        name="NonInteger",
+                        value={"error": "Space ID must be an integer."}  # اگه `space_id` رشته باشه
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found with the given ID.",
+                examples=[
+                    OpenApiExample(
+                        name="not_found",
+                        value={"error": "Space with ID 10 not found."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="An unexpected internal server error occurred.",
+                examples=[
+                    OpenApiExample(
+                        name="internal_error",
+                        value={"error": "An unexpected error occurred. Please try again later."}
+                    ),
+                    OpenApiExample(
+                        name="DatabaseError",
+                        value={"error": "Failed to retrieve space details from database."}
+                    )
+                ]
+            )
+        }
+    ),
+
+    'ManagerSpaceListView': extend_schema(tags=["space_manager"]),
+
+    'ManagerSpaceListView.get': extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='space_type',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Filter spaces by type',
+                required=False,
+                enum=['hall', 'class', 'labratory', 'office']
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=ManagerSpaceListSerializer(many=True),
+                description="Managed spaces retrieved successfully.",
+                examples=[OpenApiExample(
+                    "Example",
+                    value=[{
+                        "id": 3,
+                        "space_type": "string",
+                        "name": "string",
+                        "address": "string",
+                        "capacity": 50,
+                        "description": "string",
+                        "phone_number": "string",
+                        "first_image_url": "http://localhost:8000/media/space_photos/1.jpg"
+                    }]
+                )]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unauthorized – Authentication credentials were not provided.",
+                examples=[OpenApiExample(
+                    name="UnauthorizedExample",
+                    value={"error": "Authentication credentials were not provided."}
+                )]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Forbidden – User is not the manager of this space.",
+                examples=[OpenApiExample(
+                    name="ForbiddenExample",
+                    value={"error": "You are not a space manager."}
+                )]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Not Found – The requested space does not exist or is not managed by the user.",
+                examples=[OpenApiExample(
+                    name="NotFoundExample",
+                    value={"error": "No spaces managed by you."}
+                )]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample(
+                    name="ServerErrorExample",
+                    value={"error": "An unexpected error occurred."}
+                ),
+                OpenApiExample(
+                    name="DatabaseError",
+                    value={"error": "Failed to retrieve managed spaces from database."}
+                )]
+            )
+        },
+        description="List spaces managed by the authenticated space manager.",
+    ),
+
+    'ManagerSpaceDetailView': extend_schema(tags=["space_manager"]),
+
+    'ManagerSpaceDetailView.get': extend_schema(
+        description="Retrieve details of a specific managed space by ID.",
+        responses={
+            200: OpenApiResponse(
+                response=ManagerSpaceDetailSerializer,
+                description="Space detail retrieved successfully.",
+                examples=[OpenApiExample(
+                    "Example",
+                    value={
+                        "id": 1,
+                        "space_type": "string",
+                        "name": "string",
+                        "address": "string",
+                        "capacity": 50,
+                        "description": "string",
+                        "features": [{"id": 1, "name": "string"}],
+                        "phone_number": "string",
+                        "images": [
+                            {"id": 1, "url": "http://localhost:8000/media/space_photos/1.jpg"}
+                        ]
+                    }
+                )]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unauthorized – Authentication credentials were not provided.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"error": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Forbidden – User is not a space manager.",
+                examples=[OpenApiExample(
+                    name="ForbiddenExample",
+                    value={"error": "You are not a space manager."}
+                )]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Not Found – The requested space does not exist or is not managed by the user.",
+                examples=[OpenApiExample(
+                    name="NotFoundExample",
+                    value={"error": "Space with ID 10 not found or not managed by you."}
+                )]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid space ID provided (e.g., negative or non-integer value).",
+                examples=[
+                    OpenApiExample(
+                        name="bad_request",
+                        value={"error": "Invalid space ID. Must be a positive integer."}
+                    ),
+                    OpenApiExample(
+                        name="NonInteger",
+                        value={"error": "Space ID must be an integer."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample(
+                    name="ServerErrorExample",
+                    value={"error": "An unexpected error occurred."}
+                ),
+                OpenApiExample(
+                    name="DatabaseError",
+                    value={"error": "Failed to retrieve space details from database."}
+                )]
+            )
+        }
+    ),
+
+    'ManagerSpaceCreateView': extend_schema(tags=['space_manager']),
+
+    'ManagerSpaceCreateView.post': extend_schema(
+        description="Create a new space by authenticated space manager.",
+        request={
+            "multipart/form-data": SpaceCreateSerializer,
+            "application/json": SpaceCreateSerializer,
+        },
+        responses={
+            201: OpenApiResponse(
+                response=SpaceSerializer,
+                description="Space created successfully.",
+                examples=[OpenApiExample(
+                    "Success",
+                    value={
+                        "id": 1,
+                        "space_type": "string",
+                        "name": "string",
+                        "address": "string",
+                        "capacity": 50,
+                        "phone_number": "string",
+                        "description": "string",
+                        "features": [
+                            {"id": 1, "name": "string1"},
+                            {"id": 2, "name": "string2"}
+                        ]
+                    }
+                )]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Validation error.",
+                examples=[OpenApiExample(
+                    "BadRequest",
+                    value={"capacity": ["Capacity must be greater than zero."]}
+                ),
+                OpenApiExample(
+                    "MissingRequired",
+                    value={"space_type": ["This field is required."]}
+                ),
+                OpenApiExample(
+                    "InvalidFeatures",
+                    value={"features": ["Invalid pk '999' - object does not exist."]}
+                ),
+                OpenApiExample(
+                    "InvalidImages",
+                    value={"images": ["No file was submitted. Check the encoding type on the form."]}
+                ),
+                OpenApiExample(
+                    "InvalidFormat",
+                    value={"features": ["A valid list of integers or comma-separated string is required."]}
+                )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unauthorized.",
+                examples=[OpenApiExample(
+                    "Unauthorized",
+                    value={"error": "Authentication credentials were not provided."}
+                )]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Forbidden – User is not a space manager.",
+                examples=[OpenApiExample(
+                    "Forbidden",
+                    value={"error": "You are not authorized to create spaces."}
+                )]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Server error.",
+                examples=[OpenApiExample(
+                    "ServerError",
+                    value={"error": "An unexpected error occurred."}
+                ),
+                OpenApiExample(
+                    "DatabaseError",
+                    value={"error": "Failed to save space to database."}
+                ),
+                OpenApiExample(
+                    "ImageError",
+                    value={"error": "Failed to process uploaded images."}
+                )
+                ]
+            )
+        }
+    ),
+
+    'ManagerSpaceUpdateView': extend_schema(tags=["space_manager"]),
+
+    'ManagerSpaceUpdateView.put': extend_schema(
+        description="Partially update a space managed by the authenticated manager.",
+        request=SpaceUpdateSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=SpaceSerializer,
+                description="Space updated successfully.",
+                examples=[OpenApiExample(
+                    "Success",
+                    value={
+                        "id": 1,
+                        "space_type": "string",
+                        "name": "string",
+                        "address": "string",
+                        "capacity": 50,
+                        "phone_number": "09123456789",
+                        "description": "string",
+                        "features": [
+                            {"id": 1, "name": "string1"},
+                            {"id": 2, "name": "string2"}
+                        ],
+                        "images": [
+                            {"id": 1, "url": "/media/space_photos/1.jpg"},
+                            {"id": 2, "url": "/media/space_photos/2.jpg"}
+                        ]
+                    }
+                )]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Validation error.",
+                examples=[
+                    OpenApiExample(
+                        "CapacityError",
+                        value={"capacity": ["Capacity must be greater than zero."]}
+                    ),
+                    OpenApiExample(
+                        "InvalidFeatureError",
+                        value={"features": ["Invalid pk '999' - object does not exist."]}
+                    ),
+                    OpenApiExample(
+                        "MissingRequired",
+                        value={"space_type": ["This field is required."]}
+                    ),
+                    OpenApiExample(
+                        "InvalidImages",
+                        value={"images": ["No file was submitted. Check the encoding type on the form."]}
+                    ),
+                    OpenApiExample(
+                        "InvalidFormat",
+                        value={"features": ["A valid list of integers or comma-separated string is required."]}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Forbidden – Not space manager of this space.",
+                examples=[
+                    OpenApiExample(
+                        "ForbiddenExample",
+                        value={"error": "You are not authorized to update this space."}
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found.",
+                examples=[
+                    OpenApiExample(
+                        "NotFoundExample",
+                        value={"error": "Space with ID 77 not found."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[
+                    OpenApiExample(
+                        "ServerErrorExample",
+                        value={"error": "An unexpected error occurred."}
+                    ),
+                    OpenApiExample(
+                        "DatabaseError",
+                        value={"error": "Failed to update space in database."}
+                    ),
+                    OpenApiExample(
+                        "ImageError",
+                        value={"error": "Failed to process uploaded images."}
+                    )
+                ]
+            ),
+        }
+    ),
+
+    'ScheduleAvailabilityView': extend_schema(tags=['reservation']),
+
+    'ScheduleAvailabilityView.get': extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='date',
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description='The date to check available hours (YYYY-MM-DD)',
+                required=True,
+            ),
+            OpenApiParameter(
+                name='space_id',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description='The ID of the space to check availability for',
+                required=True,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=ScheduleAvailabilitySerializer(many=True),
+                description="List of available hours for the specified date and space.",
+                examples=[
+                    OpenApiExample(
+                        name="Success",
+                        value=[
+                            {"hour_code": 1, "time_range": "7:00-8:00", "is_locked": False},
+                            {"hour_code": 2, "time_range": "8:00-9:00", "is_locked": True},
+                        ]
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid date or space ID format.",
+                examples=[
+                    OpenApiExample(
+                        name="BadRequest",
+                        value={"error": "Date must be in YYYY-MM-DD format."}
+                    ),
+                    OpenApiExample(
+                        name="InvalidSpaceId",
+                        value={"error": "Invalid space ID."}
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication credentials were not provided.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"error": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found.",
+                examples=[
+                    OpenApiExample(
+                        name="NotFound",
+                        value={"error": "Space with ID 10 not found."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred."}
+                    )
+                ]
+            )
+        },
+        description="Retrieve the list of available hours for a specific date and space."
+    ),
+
+    'ReservationDetailView': extend_schema(tags=['space_manager']),
+
+    'ReservationDetailView.get': extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="reservation_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+            )
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=ReservationDetailSerializer,
+                description="Reservation details retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        "Success",
+                        value={
+                            "id": 5,
+                            "reservation_type": "event",
+                            "reservee_type": "student",
+                            "reservee_name": "string",
+                            "phone_number": "09123456789",
+                            "description": "string",
+                            "status": "under_review",
+                            "manager_comment": None,
+                            "space_name": "string",
+                            "schedule_date": "2025-09-01",
+                            "start_time": "10:00:00",
+                            "end_time": "12:00:00",
+                            "hosting_association": "string",
+                            "hosting_organizations": "string",
+                            "responsible_organizer": "string",
+                            "position": "Professor"
+                        }
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User not authenticated.",
+                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Forbidden – Reservation does not belong to a space managed by this user.",
+                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to view this reservation."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Reservation not found.",
+                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Internal server error.",
+                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        },
+        description="Retrieve detailed information of a specific reservation by its ID. Only accessible to the space manager of that reservation's space."
+    ),
+
+    'ManagerSpaceDeleteView': extend_schema(tags=['space_manager']),
+
+    'ManagerSpaceDeleteView.delete': extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="space_id",
+                required=True,
+                type=int,
+                location=OpenApiParameter.PATH,
+            )
+        ],
+        responses={
+            200:OpenApiResponse(
+            response=None,
+                description="Space deleted successfully.",
+                examples=[OpenApiExample("Deleted", value={"message": "Space deleted successfully."})]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unauthorized.",
+                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Forbidden – Not the manager of this space.",
+                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to delete this space."})]
+            ),
+            404: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Space not found.",
+                examples=[OpenApiExample("NotFound", value={"error": "Space not found."})]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error.",
+                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
+            ),
+        },
+        description=(
+            "Delete a space owned by the authenticated space manager. "
+        ),
+    ),
+}
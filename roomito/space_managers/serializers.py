@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from django.contrib.auth.models import User
-from .models import HourSlot, Space, SpaceImage, SpaceManager, Event, SpaceFeature, Schedule, Reservation
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from .hour_slots import hour_slots, schedule_end_time, schedule_start_time
+from .models import Space, SpaceImage, SpaceManager, Event, SpaceFeature, Schedule, Reservation
 from staffs.models import Staff
 from students.models import Student
+from common.authentication import get_space_manager_id, get_staff_id, get_student_id
 from common.validators import validate_password_strength
 from django.core.validators import MinValueValidator
 from django.utils.datastructures import MultiValueDict
@@ -177,13 +184,6 @@ class OrganizerOutSerializer(serializers.Serializer):
     email = serializers.EmailField(allow_null=True, required=False)
 
 
-def _parse_time_range(time_range_str: str, pick: str = "start"):
-    if not time_range_str or "-" not in time_range_str:
-        return None
-    part = time_range_str.split("-")[0 if pick == "start" else -1]
-    return f"{part}:00" if len(part) == 5 else part
-
-
 class EventSerializer(serializers.ModelSerializer):
     space = SpaceSerializer(read_only=True)
     organizer = serializers.SerializerMethodField()  
@@ -224,12 +224,10 @@ class EventSerializer(serializers.ModelSerializer):
         return None
 
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return _parse_time_range(getattr(slot, 'time_range', None), 'start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return _parse_time_range(getattr(slot, 'time_range', None), 'end')
+        return schedule_end_time(obj.schedule)
 
 
 class EventDetailSerializer(serializers.ModelSerializer):
@@ -280,12 +278,10 @@ class EventDetailSerializer(serializers.ModelSerializer):
         return None
 
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return _parse_time_range(getattr(slot, 'time_range', None), 'start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return _parse_time_range(getattr(slot, 'time_range', None), 'end')
+        return schedule_end_time(obj.schedule)
 
 
 class ScheduleAvailabilitySerializer(serializers.Serializer):
@@ -294,9 +290,36 @@ class ScheduleAvailabilitySerializer(serializers.Serializer):
     is_locked = serializers.BooleanField(read_only=True)
 
 
+@extend_schema_field(OpenApiTypes.INT)
+class HourCodeField(serializers.Field):
+    """
+    An hour code in, its HourSlot out, like PrimaryKeyRelatedField(queryset=HourSlot.objects.all())
+    with the same errors, but resolved from the slot registry instead of one query per code.
+    """
+    default_error_messages = {
+        'does_not_exist': serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist'],
+        'incorrect_type': serializers.PrimaryKeyRelatedField.default_error_messages['incorrect_type'],
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            code = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        slot = hour_slots().get(code)
+        if slot is None:
+            self.fail('does_not_exist', pk_value=data)
+        return slot.instance()
+
+    def to_representation(self, value):
+        return value.pk
+
+
 class ScheduleSerializer(serializers.ModelSerializer):
     hour_codes = serializers.ListField(
-        child=serializers.PrimaryKeyRelatedField(queryset=HourSlot.objects.all()),
+        child=HourCodeField(),
         min_length=1,
         max_length=12,
         error_messages={
@@ -328,8 +351,8 @@ class ScheduleSerializer(serializers.ModelSerializer):
         return data
 
     def to_representation(self, instance):
-        start = instance.start_hour_code.code
-        end = instance.end_hour_code.code
+        start = instance.start_hour_code_id
+        end = instance.end_hour_code_id
         return {
             "hour_codes": list(range(start, end + 1)),
             "date": instance.date
@@ -378,14 +401,16 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         user = self.context['request'].user
+        student_id = get_student_id(user)
+        staff_id = get_staff_id(user)
 
-        if hasattr(user, 'student_profile') and user.student_profile is not None:
+        if student_id is not None:
             data['reservee_type'] = 'student'
-            data['student'] = user.student_profile
+            data['student'] = Student(pk=student_id)
             data['staff'] = None
-        elif hasattr(user, 'staff') and user.staff is not None:
+        elif staff_id is not None:
             data['reservee_type'] = 'staff'
-            data['staff'] = user.staff
+            data['staff'] = Staff(pk=staff_id)
             data['student'] = None
         else:
             raise serializers.ValidationError({"reservee_type": ["You must be a student or staff to create a reservation."]})
@@ -439,22 +464,11 @@ class ReservationListSerializer(serializers.ModelSerializer):
             'phone_number',
         ]
 
-    def _parse_time_range(self, time_range_str, pick='start'):
-        if not time_range_str or '-' not in time_range_str:
-            return None
-        parts = time_range_str.split('-')
-        val = parts[0] if pick == 'start' else parts[-1]
-        if len(val) == 5:  
-            return f"{val}:00"
-        return val  
-
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), pick='start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), pick='end')
+        return schedule_end_time(obj.schedule)
 
     def get_reservee_name(self, obj):
         if obj.student and getattr(obj.student, 'user', None):
@@ -470,8 +484,85 @@ class ReservationListSerializer(serializers.ModelSerializer):
         if obj.staff:
             return "staff"
         return "unknown"
-    
-    
+
+
+def _full_name(first_name, last_name):
+    # f"{first} {last}".strip(), with "" as NULL so Coalesce can fall back to "unknown".
+    return NullIf(Trim(Concat(first_name, Value(' '), last_name, output_field=CharField())), Value(''))
+
+
+RESERVEE_NAME = Coalesce(
+    Case(
+        When(student__isnull=False, then=_full_name('student__user__first_name', 'student__user__last_name')),
+        When(staff__isnull=False, then=_full_name('staff__first_name', 'staff__last_name')),
+        output_field=CharField(),
+    ),
+    Value('unknown'),
+)
+RESERVEE_TYPE = Case(
+    When(student__isnull=False, then=Value('student')),
+    When(staff__isnull=False, then=Value('staff')),
+    default=Value('unknown'),
+    output_field=CharField(),
+)
+
+
+def without_missing_relations(row):
+    """
+    Drop ``space_name`` and ``date`` from a projected row when the reservation has no
+    space or no schedule: the serializers' ``space.name`` and ``schedule.date`` sources
+    skip the field then rather than render null.
+    """
+    if row['space_name'] is None:
+        del row['space_name']
+    if row['date'] is None:
+        del row['date']
+    return row
+
+
+def _reservation_list_items(reservations):
+    slots = hour_slots()
+    status_display = dict(Reservation.STATUSES)
+    rows = reservations.values_list(
+        'id', 'space__name', 'schedule__date', 'schedule__start_hour_code', 'schedule__end_hour_code', 'status',
+        'reservation_type', 'description', RESERVEE_NAME, RESERVEE_TYPE, 'phone_number',
+    )
+    for (pk, space_name, date, start_code, end_code, status_value, reservation_type, description,
+         reservee_name, reservee_type, phone_number) in rows:
+        yield (date, start_code, pk), without_missing_relations({
+            'id': pk,
+            'space_name': space_name,
+            'date': date,
+            'start_time': slots.start_label(start_code),
+            'end_time': slots.end_label(end_code),
+            'status_display': status_display.get(status_value, status_value),
+            'reservation_type': reservation_type,
+            'description': description,
+            'reservee_name': reservee_name,
+            'reservee_type': reservee_type,
+            'phone_number': phone_number,
+        })
+
+
+def reservation_list_rows(reservations):
+    """
+    The output of ReservationListSerializer(reservations, many=True), from a single
+    values_list() projection instead of model instances and per-field DRF machinery.
+    Keep the two in step when a field changes.
+    """
+    return [row for _, row in _reservation_list_items(reservations)]
+
+
+def reservation_list_page(reservations, limit):
+    """
+    The first ``limit`` rows of ``reservations`` as reservation_list_rows() builds them,
+    and the (date, start hour code, id) key of the last one if more rows follow, else None.
+    """
+    items = list(_reservation_list_items(reservations[:limit + 1]))
+    next_key = items[limit - 1][0] if len(items) > limit else None
+    return [row for _, row in items[:limit]], next_key
+
+
 class ReservationDecisionSerializer(serializers.Serializer):
     decision = serializers.ChoiceField(choices=['approved', 'rejected'])
     manager_comment = serializers.CharField(required=False, allow_blank=True, max_length=500)
@@ -479,7 +570,7 @@ class ReservationDecisionSerializer(serializers.Serializer):
     def validate(self, data):
         request = self.context['request']
         reservation = self.context['reservation']
-        if not reservation.space or reservation.space.space_manager != request.user.spacemanager:
+        if not reservation.space or reservation.space.space_manager_id != get_space_manager_id(request.user):
             raise serializers.ValidationError({"error": "You are not authorized to make a decision for this reservation."})
         return data
 
@@ -488,27 +579,155 @@ class ReservationDecisionSerializer(serializers.Serializer):
         decision = self.validated_data['decision']
         comment = self.validated_data.get('manager_comment', '')
 
-        if reservation.status != 'under_review':
-            raise serializers.ValidationError({"error": "This reservation has already been processed."})
-        
-        reservation.status = decision
-        reservation.manager_comment = comment
-        reservation.save()
-
-        if decision == 'approved':
-            Event.objects.create(
-                title=f"{reservation.reservation_type.title()} at {reservation.space.name}",
-                event_type=reservation.reservation_type,
-                space=reservation.space,
-                organizer=reservation.reservee_type,
-                student_organizer=reservation.student if reservation.reservee_type == 'student' else None,
-                staff_organizer=reservation.staff if reservation.reservee_type == 'staff' else None,
-                description=reservation.description,
-                schedule=reservation.schedule,
-            )
+        with transaction.atomic():
+            # Row locks, always taken reservation first: a second decision on the same reservation
+            # waits here and then sees it processed, and approvals in one space run one at a time,
+            # so two overlapping requests cannot both find the time free.
+            locked = Reservation.objects.select_for_update().only('status').get(pk=reservation.pk)
+            if locked.status != 'under_review':
+                raise serializers.ValidationError({"error": "This reservation has already been processed."})
+            if decision == 'approved':
+                Space.objects.select_for_update().only('id').get(pk=reservation.space_id)
+                reservation.schedule.clean()
+
+            reservation.status = decision
+            reservation.manager_comment = comment
+            reservation.save()
+
+            if decision == 'approved':
+                Event.objects.create(
+                    title=f"{reservation.reservation_type.title()} at {reservation.space.name}",
+                    event_type=reservation.reservation_type,
+                    space=reservation.space,
+                    organizer=reservation.reservee_type,
+                    student_organizer=reservation.student if reservation.reservee_type == 'student' else None,
+                    staff_organizer=reservation.staff if reservation.reservee_type == 'staff' else None,
+                    description=reservation.description,
+                    schedule=reservation.schedule,
+                )
         return reservation
     
     
+class DashboardSpaceSerializer(serializers.Serializer):
+    space_id = serializers.IntegerField()
+    space_name = serializers.CharField()
+    pending_requests = serializers.IntegerField()
+    pending_unknown_age = serializers.IntegerField()
+    oldest_pending_created_at = serializers.DateTimeField(allow_null=True)
+    oldest_pending_age_seconds = serializers.IntegerField(allow_null=True)
+    today_bookings = serializers.IntegerField()
+    upcoming_events = serializers.IntegerField()
+    next_event_date = serializers.DateField(allow_null=True)
+
+
+class ManagerDashboardSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    pending_requests = serializers.IntegerField()
+    pending_unknown_age = serializers.IntegerField()
+    oldest_pending_created_at = serializers.DateTimeField(allow_null=True)
+    oldest_pending_age_seconds = serializers.IntegerField(allow_null=True)
+    today_bookings = serializers.IntegerField()
+    upcoming_events = serializers.IntegerField()
+    next_event_date = serializers.DateField(allow_null=True)
+    spaces = DashboardSpaceSerializer(many=True)
+
+
+class UtilizationFiguresSerializer(serializers.Serializer):
+    booked_slots = serializers.IntegerField()
+    available_slots = serializers.IntegerField()
+    idle_slots = serializers.IntegerField()
+    utilization_percent = serializers.FloatField(allow_null=True)
+
+
+class UtilizationSummarySerializer(UtilizationFiguresSerializer):
+    spaces = serializers.IntegerField()
+    idle_seat_slots = serializers.IntegerField()
+
+
+class UtilizationSpaceSerializer(UtilizationFiguresSerializer):
+    space_id = serializers.IntegerField()
+    space_name = serializers.CharField()
+    space_type = serializers.CharField()
+    capacity = serializers.IntegerField()
+    idle_seat_slots = serializers.IntegerField()
+    peak_hour_code = serializers.IntegerField(allow_null=True)
+
+
+class UtilizationWeekdaySerializer(UtilizationFiguresSerializer):
+    weekday = serializers.CharField()
+
+
+class UtilizationWeekSerializer(UtilizationFiguresSerializer):
+    week_start = serializers.DateField()
+
+
+class UtilizationSpaceTypeSerializer(UtilizationFiguresSerializer):
+    space_type = serializers.CharField()
+    spaces = serializers.IntegerField()
+
+
+class UtilizationFeatureSerializer(UtilizationFiguresSerializer):
+    feature_id = serializers.IntegerField()
+    feature_name = serializers.CharField()
+    spaces = serializers.IntegerField()
+
+
+class UtilizationSlotSerializer(UtilizationFiguresSerializer):
+    weekday = serializers.CharField()
+    hour_code = serializers.IntegerField()
+    time_range = serializers.CharField(allow_null=True)
+
+
+class UtilizationReportSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    days = serializers.IntegerField()
+    hour_codes = serializers.ListField(child=serializers.IntegerField())
+    summary = UtilizationSummarySerializer()
+    spaces = UtilizationSpaceSerializer(many=True)
+    weekdays = UtilizationWeekdaySerializer(many=True)
+    weeks = UtilizationWeekSerializer(many=True)
+    space_types = UtilizationSpaceTypeSerializer(many=True)
+    features = UtilizationFeatureSerializer(many=True)
+    slots = UtilizationSlotSerializer(many=True)
+    peak_slots = UtilizationSlotSerializer(many=True)
+
+
+class DemandFiguresSerializer(serializers.Serializer):
+    requested = serializers.IntegerField()
+    approved = serializers.IntegerField()
+    under_review = serializers.IntegerField()
+    conflicting = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+    unmet = serializers.IntegerField()
+
+
+class DemandHeatmapsSerializer(serializers.Serializer):
+    requested = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()))
+    approved = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()))
+    under_review = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()))
+    conflicting = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()))
+    rejected = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()))
+    unmet = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()))
+
+
+class DemandGroupSerializer(serializers.Serializer):
+    space_type = serializers.CharField()
+    capacity_band = serializers.CharField()
+    capacity_from = serializers.IntegerField()
+    totals = DemandFiguresSerializer()
+    heatmaps = DemandHeatmapsSerializer()
+
+
+class DemandReportSerializer(serializers.Serializer):
+    date_from = serializers.DateField(allow_null=True)
+    date_to = serializers.DateField(allow_null=True)
+    weekdays = serializers.ListField(child=serializers.CharField())
+    hour_codes = serializers.ListField(child=serializers.IntegerField())
+    totals = DemandFiguresSerializer()
+    groups = DemandGroupSerializer(many=True)
+
+
 class ManagerSpaceListSerializer(serializers.ModelSerializer):
     first_image_url = serializers.SerializerMethodField()
 
@@ -600,7 +819,7 @@ class SpaceCreateSerializer(serializers.ModelSerializer):
         request  = self.context["request"]
 
         space = Space.objects.create(
-            space_manager=request.user.spacemanager,
+            space_manager_id=get_space_manager_id(request.user),
             **validated_data
         )
 
@@ -613,7 +832,6 @@ class SpaceCreateSerializer(serializers.ModelSerializer):
 
         return space
 
-from django.db import transaction
 from django.utils.datastructures import MultiValueDict
 from rest_framework import serializers
 from .models import Space, SpaceFeature, SpaceImage
@@ -744,20 +962,11 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
             'responsible_organizer', 'position'
         ]
 
-    def _parse_time_range(self, time_range_str, pick='start'):
-        if not time_range_str or '-' not in time_range_str:
-            return None
-        parts = time_range_str.split('-')
-        val = parts[0] if pick == 'start' else parts[-1]
-        return f"{val}:00" if len(val) == 5 else val
-
     def get_start_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'start_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), pick='start')
+        return schedule_start_time(obj.schedule)
 
     def get_end_time(self, obj):
-        slot = getattr(getattr(obj, 'schedule', None), 'end_hour_code', None)
-        return self._parse_time_range(getattr(slot, 'time_range', None), pick='end')
+        return schedule_end_time(obj.schedule)
 
     def get_reservee_name(self, obj):
         if obj.student and getattr(obj.student, 'user', None):
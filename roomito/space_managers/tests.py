@@ -1,3 +1,880 @@
-from django.test import TestCase
+import base64
+import csv
+import datetime
+import gzip
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import ResolverMatch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework.views import APIView
+
+from benchmarks.explain_reservation_list import cases, check
+from common.authentication import (
+    RoleClaimsJWTAuthentication, RoleClaimsTokenUser, get_space_manager_id, get_student_id, refresh_token_for,
+)
+from common.db_routing import ReplicaRoutingMiddleware, _pin_key, _request_state, _session_pin_key, bind_user
+from common.pagination import encode_cursor
+from common import schema
+from common.schema import code_version, generate_schema
+from common.serializers import MyReservationListSerializer, my_reservation_list_rows
+from common.sql_profiling import QueryBudgetExceeded, SQLProfilingMiddleware
+from common.throttling import SlidingWindowRateThrottleMixin, SlidingWindowUserRateThrottle
+from common.views import MyReservationsListView
+from space_managers.dashboard import build_dashboard, invalidate, manager_dashboard, with_ages
+from space_managers.demand import demand_report
+from space_managers import outbox
+from space_managers.models import (
+    DemandRollup, DemandRollupQueue, Event, HourSlot, OutboxEmail, Reservation, Schedule, Space, SpaceManager,
+)
+from space_managers.serializers import ReservationListSerializer, reservation_list_rows
+from space_managers.utilization import coverage, hour_columns
+from space_managers.views import ManagerDashboardView, ManagerDemandView, ManagerReservationListView
+from staffs.models import Staff
+from students.models import Student
+
+
+def bearer(user, role, profile_id):
+    return {'HTTP_AUTHORIZATION': f'Bearer {refresh_token_for(user, role, profile_id).access_token}'}
+
+
+def sort_key(reservation):
+    """Where the manager reservation list puts ``reservation``, newest last."""
+    return reservation.schedule.date, reservation.schedule.start_hour_code_id, reservation.id
+
+
+class ReservationFixture:
+    """A manager with three spaces and a student with reservations on them, over four days."""
+
+    @classmethod
+    def setUpTestData(cls):
+        manager_user = User.objects.create_user(username='manager', email='manager@uni.ac.ir')
+        cls.manager = SpaceManager.objects.create(user=manager_user, first_name='Mina', last_name='Karimi',
+                                                  username='manager', email='manager@uni.ac.ir')
+        student_user = User.objects.create_user(username='student', first_name='Sara', last_name='Ahmadi')
+        cls.student = Student.objects.create(user=student_user, student_id='400123456', national_id='0012345678',
+                                             student_card_photo='student_cards/card.jpg', is_approved=True)
+        cls.spaces = [
+            Space.objects.create(name=f'Hall {n}', address='Campus', capacity=30 * n, space_type='hall',
+                                 space_manager=cls.manager)
+            for n in range(1, 4)
+        ]
+        codes = list(HourSlot.objects.order_by('code').values_list('code', flat=True))
+        today = timezone.localdate()
+        cls.reservations = []
+        for n, status in enumerate(['under_review', 'approved', 'rejected'] * 4):
+            space = cls.spaces[n % len(cls.spaces)]
+            schedule = Schedule.objects.create(space=space, date=today + datetime.timedelta(days=n // 3),
+                                               start_hour_code_id=codes[0], end_hour_code_id=codes[1])
+            cls.reservations.append(Reservation.objects.create(
+                reservation_type='class', reservee_type='student', student=cls.student, space=space,
+                schedule=schedule, status=status,
+            ))
+
+    def as_manager(self):
+        return bearer(self.manager.user, 'space_manager', self.manager.id)
+
+    def as_student(self):
+        return bearer(self.student.user, 'student', self.student.id)
+
+
+@override_settings(DATABASE_ROUTERS=['common.db_routing.PrimaryReplicaRouter'], DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', 'replica'}
+    user_id = 987654
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.session_key = 'replica-routing-test-session'
+        self.addCleanup(cache.delete_many, [_pin_key(self.user_id), _session_pin_key(self.session_key)])
+        cache.delete_many([_pin_key(self.user_id), _session_pin_key(self.session_key)])
+
+    def serve(self, method, user_id=None, cookies=None, view=None):
+        """Serves a request through the middleware; returns the alias its reads went to."""
+        routed = []
+
+        def get_response(request):
+            if user_id is not None:
+                bind_user(user_id)
+            if view is not None:
+                view()
+            routed.append(router.db_for_read(Space))
+            return HttpResponse()
+
+        request = getattr(self.factory, method)('/api/')
+        request.COOKIES.update(cookies or {})
+        ReplicaRoutingMiddleware(get_response)(request)
+        return routed[0]
+
+    def test_safe_requests_read_from_the_replica(self):
+        with CaptureQueriesContext(connections['replica']) as replica, \
+                CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary:
+            self.assertEqual(self.serve('get', user_id=self.user_id, view=lambda: Space.objects.count()), 'replica')
+        self.assertEqual(len(replica.captured_queries), 1)
+        self.assertEqual(len(primary.captured_queries), 0)
+
+    def test_unsafe_requests_read_from_the_primary(self):
+        self.assertEqual(self.serve('post', user_id=self.user_id), DEFAULT_DB_ALIAS)
+
+    def test_transactions_read_from_the_primary(self):
+        in_transaction = []
+
+        def view():
+            with transaction.atomic():
+                in_transaction.append(router.db_for_read(Space))
+
+        self.assertEqual(self.serve('get', view=view), 'replica')
+        self.assertEqual(in_transaction, [DEFAULT_DB_ALIAS])
+
+    def test_a_user_reads_from_the_primary_after_a_write(self):
+        self.serve('post', user_id=self.user_id)
+
+        self.assertEqual(self.serve('get', user_id=self.user_id), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.serve('get', user_id=self.user_id + 1), 'replica')
+        cache.delete(_pin_key(self.user_id))  # The pin window is over.
+        self.assertEqual(self.serve('get', user_id=self.user_id), 'replica')
+
+    def test_a_session_reads_from_the_primary_after_a_write(self):
+        cookies = {settings.SESSION_COOKIE_NAME: self.session_key}
+        self.serve('post', cookies=cookies)
+
+        self.assertEqual(self.serve('get', cookies=cookies), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.serve('get', cookies={settings.SESSION_COOKIE_NAME: 'another-session'}), 'replica')
+
+    def test_cache_and_session_tables_are_read_from_the_primary(self):
+        from django.contrib.sessions.models import Session
+
+        cache_entry = DatabaseCache('roomito_cache', {}).cache_model_class
+        self.assertEqual(self.serve('get', view=lambda: None), 'replica')
+        self.assertEqual(router.db_for_read(cache_entry), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_read(Session), DEFAULT_DB_ALIAS)
+
+    def test_routing_state_is_reset_after_each_request(self):
+        self.serve('post', user_id=self.user_id)
+        self.assertIsNone(_request_state.get())
+
+        def fail():
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            self.serve('get', view=fail)
+        self.assertIsNone(_request_state.get())
+        self.assertEqual(router.db_for_read(Space), DEFAULT_DB_ALIAS)
+        # A pinned request does not leak its pin into the next one.
+        self.assertEqual(self.serve('get', user_id=self.user_id + 1), 'replica')
+
+
+class OverBudgetView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    query_budget = 1
+
+    def get(self, request):
+        list(Space.objects.all())
+        list(Space.objects.all())
+        return Response()
+
+
+class QueryBudgetTests(ReservationFixture, TestCase):
+    def get(self, path, auth):
+        response = self.client.get(path, **auth)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, response.wsgi_request.sql_profile.queries
+
+    def test_going_over_budget_raises_under_the_test_runner(self):
+        self.assertEqual(settings.SQL_QUERY_BUDGET_MODE, 'raise')
+        view = OverBudgetView.as_view()
+
+        def get_response(request):
+            request.resolver_match = ResolverMatch(view, (), {})
+            return view(request)
+
+        with self.assertLogs('roomito.sql', 'WARNING'), \
+                self.assertRaisesMessage(QueryBudgetExceeded, 'OverBudgetView ran 2 queries'):
+            SQLProfilingMiddleware(get_response)(RequestFactory().get('/over-budget/'))
+
+    def test_manager_reservation_list_stays_within_budget(self):
+        for query in ('', '?status=under_review,approved&space_id=%d' % self.spaces[0].id, '?limit=5'):
+            _, queries = self.get('/api/spacemanager/reservations/' + query, self.as_manager())
+            self.assertLessEqual(queries, ManagerReservationListView.query_budget, query)
+
+    def test_my_reservations_stays_within_budget(self):
+        response, queries = self.get('/api/myreservations/', self.as_student())
+        self.assertEqual(len(response.json()), len(self.reservations))
+        self.assertLessEqual(queries, MyReservationsListView.query_budget)
+
+    def test_dashboard_stays_within_budget(self):
+        invalidate(self.manager.id)
+        response, queries = self.get('/api/spacemanager/dashboard/', self.as_manager())
+        self.assertEqual(response.json()['pending_requests'], 4)
+        self.assertLessEqual(queries, ManagerDashboardView.query_budget)
+
+        # Served from the cache: only the user is loaded, so a deactivated manager is refused.
+        _, queries = self.get('/api/spacemanager/dashboard/', self.as_manager())
+        self.assertEqual(queries, 1)
+
+
+class SchemaTests(SimpleTestCase):
+    def test_hour_codes_are_integer_arrays(self):
+        components = generate_schema()['components']['schemas']
+        for name in ('Schedule', 'ScheduleRequest', 'ScheduleUpdateRequest'):
+            self.assertEqual(components[name]['properties']['hour_codes']['items'], {'type': 'integer'}, name)
+
+
+class ManagerReservationListTests(ReservationFixture, TestCase):
+    path = '/api/spacemanager/reservations/'
+
+    def test_whole_list_without_limit_or_cursor(self):
+        unscheduled = Reservation.objects.create(reservation_type='class', reservee_type='student',
+                                                 student=self.student, space=self.spaces[0])
+
+        response = self.client.get(self.path, **self.as_manager())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Link', response)
+        self.assertCountEqual([row['id'] for row in response.json()],
+                              [reservation.id for reservation in self.reservations] + [unscheduled.id])
+
+    def test_limit_and_cursor_page_through_the_scheduled_reservations(self):
+        seen, url = [], self.path + '?limit=5'
+        while url:
+            response = self.client.get(url, **self.as_manager())
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json()), 5)
+            seen += [row['id'] for row in response.json()]
+            url = response['Link'].split(';')[0].strip('<>') if 'Link' in response else None
+        newest_first = sorted(self.reservations, key=sort_key, reverse=True)
+        self.assertEqual(seen, [reservation.id for reservation in newest_first])
+
+    def test_cursor_without_limit_gets_default_pages(self):
+        cursor = encode_cursor(sort_key(max(self.reservations, key=sort_key)))
+
+        response = self.client.get(f'{self.path}?cursor={cursor}', **self.as_manager())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), len(self.reservations) - 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', "The plans checked are PostgreSQL's.")
+class ReservationListPlanTests(TestCase):
+    """The list's queries against enough rows, spread over managers and days, for the planner to pick indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        codes = list(HourSlot.objects.order_by('code').values_list('code', flat=True))
+        managers = [
+            SpaceManager.objects.create(user=User.objects.create_user(username=f'manager{n}'), first_name='Mina',
+                                        last_name='Karimi', username=f'manager{n}', email=f'manager{n}@uni.ac.ir')
+            for n in range(20)
+        ]
+        # Like the busiest manager of seed_load_data, the one listed holds many of the spaces.
+        spaces = Space.objects.bulk_create(
+            Space(name=f'Room {n}', address='Campus', capacity=30, space_type='class',
+                  space_manager=managers[0 if n % 2 else n % len(managers)])
+            for n in range(60)
+        )
+        student = Student.objects.create(user=User.objects.create_user(username='student'), student_id='400123456',
+                                          national_id='0012345678', student_card_photo='student_cards/card.jpg')
+        first_day = datetime.date(2025, 1, 1)
+        schedules = Schedule.objects.bulk_create(
+            Schedule(space=space, date=first_day + datetime.timedelta(days=day), start_hour_code_id=code,
+                     end_hour_code_id=code)
+            for day in range(0, 365, 5) for space in spaces for code in codes[::4]
+        )
+        statuses = ('under_review', 'approved', 'rejected')
+        types = ('class', 'event', 'gathering')
+        Reservation.objects.bulk_create(
+            (Reservation(reservation_type=types[n % 3], reservee_type='student', student=student,
+                         space_id=schedule.space_id, schedule=schedule, status=statuses[n % 7 % 3])
+             for n, schedule in enumerate(schedules)),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE space_managers_space, space_managers_schedule, space_managers_reservation')
+        cls.manager = managers[0]
+
+    def test_filtered_and_keyset_queries_use_the_list_indexes(self):
+        with connection.cursor() as cursor:
+            # A few thousand rows are read faster sequentially than through any index; production's
+            # million are not. Ruling sequential scans out leaves the planner the index choice.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for name, filters, after, indexes in cases(self.manager.id):
+            with self.subTest(name):
+                page = ManagerReservationListView.reservations(self.manager.id, filters, after)
+                plan = json.loads(page[:ManagerReservationListView.default_limit + 1].explain(format='json'))[0]
+                self.assertEqual(check(plan, indexes), [])
+
+
+class ManagerDashboardTests(ReservationFixture, TestCase):
+    def test_requests_without_created_at_are_counted_apart_from_the_oldest_age(self):
+        pending = [reservation for reservation in self.reservations if reservation.status == 'under_review']
+        legacy, known = pending[0], pending[1:]
+        # As migration 0020 left the requests made before it.
+        Reservation.objects.filter(pk=legacy.pk).update(created_at=None)
+        oldest = min(Reservation.objects.filter(pk__in=[r.pk for r in known]).values_list('created_at', flat=True))
+
+        summary = with_ages(build_dashboard(self.manager.id, timezone.localdate()), oldest + datetime.timedelta(hours=1))
+
+        self.assertEqual(summary['pending_requests'], len(pending))
+        self.assertEqual(summary['pending_unknown_age'], 1)
+        self.assertEqual(summary['oldest_pending_created_at'], oldest)
+        self.assertEqual(summary['oldest_pending_age_seconds'], 3600)
+        legacy_space = next(row for row in summary['spaces'] if row['space_id'] == legacy.space_id)
+        self.assertEqual(legacy_space['pending_unknown_age'], 1)
+
+    def test_reassigned_space_leaves_both_dashboards(self):
+        other = SpaceManager.objects.create(user=User.objects.create_user(username='other'), username='other')
+        for space_manager_id in (self.manager.id, other.id):
+            invalidate(space_manager_id)
+            self.addCleanup(invalidate, space_manager_id)
+        self.assertEqual(len(manager_dashboard(self.manager.id)['spaces']), 3)
+        self.assertEqual(manager_dashboard(other.id)['spaces'], [])
+
+        space = self.spaces[0]
+        space.space_manager = other
+        with self.captureOnCommitCallbacks(execute=True):
+            space.save()
+
+        self.assertEqual(len(manager_dashboard(self.manager.id)['spaces']), 2)
+        self.assertEqual([row['space_id'] for row in manager_dashboard(other.id)['spaces']], [space.id])
+
+
+class DemandReportTests(TestCase):
+    seed = {'managers': 2, 'students': 20, 'staff': 2, 'spaces': 6, 'schedules': 300, 'days': 14}
+
+    def test_seeded_database_reports_demand_right_away(self):
+        call_command('seed_load_data', tag='demand', stdout=StringIO(), **self.seed)
+
+        report = demand_report()
+
+        self.assertEqual(report['totals']['requested'], sum(
+            end - start + 1 for start, end in Schedule.objects.values_list('start_hour_code', 'end_hour_code')))
+        self.assertTrue(DemandRollup.objects.exists())
+        self.assertFalse(DemandRollupQueue.objects.exists())
+
+    def test_empty_rollup_falls_back_to_the_schedules(self):
+        call_command('seed_load_data', tag='demand', stdout=StringIO(), **self.seed)
+        rolled_up = demand_report(space_type='class')
+        self.assertGreater(rolled_up['totals']['requested'], 0)
+        DemandRollup.objects.all().delete()
+
+        self.assertEqual(demand_report(space_type='class'), rolled_up)
+        self.assertFalse(DemandRollup.objects.exists())
+
+        manager = SpaceManager.objects.select_related('user').first()
+        response = self.client.get('/api/spacemanager/demand/?space_type=class',
+                                   **bearer(manager.user, 'space_manager', manager.id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['totals'], rolled_up['totals'])
+        self.assertLessEqual(response.wsgi_request.sql_profile.queries, ManagerDemandView.query_budget)
+
+
+class ReservationCreateNotificationTests(ReservationFixture, TestCase):
+    def reserve(self):
+        slot = HourSlot.objects.order_by('code').last()
+        body = {'reservation_type': 'class',
+                'schedule': {'date': '2040-01-01', 'hour_codes': [slot.code]}}
+        response = self.client.post(f'/api/{self.spaces[0].id}/reserve/', json.dumps(body),
+                                    content_type='application/json', **self.as_student())
+        return slot, response
+
+    def test_manager_is_told_the_slot_times(self):
+        with mock.patch('space_managers.views.send_mail') as send_mail:
+            slot, response = self.reserve()
+
+        self.assertEqual(response.status_code, 201, response.content)
+        message = send_mail.call_args.kwargs['message']
+        self.assertIn(f'{slot.start_time:%H:%M}', message)
+        self.assertIn(f'{slot.end_time:%H:%M}', message)
+
+    def test_failed_notification_keeps_the_201(self):
+        with mock.patch('space_managers.views.send_mail', side_effect=ConnectionError), \
+                self.assertLogs('space_managers.views', 'ERROR'):
+            _, response = self.reserve()
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(Reservation.objects.filter(pk=response.json()['id']).exists())
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxSendTests(TestCase):
+    def setUp(self):
+        outbox.queue_emails([('subject', 'body', 'a@uni.ac.ir'), ('subject', 'body', 'b@uni.ac.ir')])
+
+    def test_sends_outside_the_claiming_transaction(self):
+        depth = len(connection.atomic_blocks)
+        seen = []
+
+        def send(message):
+            seen.append((len(connection.atomic_blocks), OutboxEmail.objects.get(recipient=message.to[0]).status))
+            return 1
+
+        with mock.patch('django.core.mail.message.EmailMessage.send', autospec=True, side_effect=send):
+            self.assertEqual(outbox.send_pending(), (2, 0))
+
+        self.assertEqual(seen, [(depth, 'sending'), (depth, 'sending')])
+        self.assertEqual(set(OutboxEmail.objects.values_list('status', flat=True)), {'sent'})
+
+    def test_failed_email_backs_off_exponentially_then_gives_up(self):
+        backoff = datetime.timedelta(seconds=30)
+        with mock.patch('django.core.mail.message.EmailMessage.send', side_effect=ConnectionError('refused')):
+            self.assertEqual(outbox.send_pending(max_attempts=3, backoff=backoff), (0, 2))
+            # Not due yet: the next loop of send_queued_emails does not hammer the server.
+            self.assertEqual(outbox.send_pending(max_attempts=3, backoff=backoff), (0, 0))
+
+            delays = []
+            for _ in range(2):
+                OutboxEmail.objects.update(next_attempt_at=timezone.now())
+                before = timezone.now()
+                outbox.send_pending(max_attempts=3, backoff=backoff)
+                delays.append(OutboxEmail.objects.get(recipient='a@uni.ac.ir').next_attempt_at - before)
+
+        email = OutboxEmail.objects.get(recipient='a@uni.ac.ir')
+        self.assertEqual((email.status, email.attempts, email.last_error), ('failed', 3, 'refused'))
+        self.assertGreaterEqual(delays[0], backoff * 2)
+        self.assertGreaterEqual(delays[1], backoff * 4)
+        self.assertLess(delays[1], backoff * 5)
+
+    def test_claim_of_a_dead_sender_is_taken_back_after_its_lease(self):
+        claimed = outbox.claim_batch(batch_size=1, lease=datetime.timedelta(minutes=10))
+        self.assertEqual(outbox.send_pending(), (1, 0))
+
+        OutboxEmail.objects.filter(pk=claimed[0].pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.send_pending(), (1, 0))
+        self.assertEqual(OutboxEmail.objects.get(pk=claimed[0].pk).attempts, 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+
+class RoleClaimsAuthenticationTests(ReservationFixture, TestCase):
+    path = '/api/spacemanager/reservations/'
+
+    def get(self, token):
+        return self.client.get(self.path, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_claims_stand_in_for_the_profile_lookup(self):
+        token = refresh_token_for(self.manager.user, 'space_manager', self.manager.id).access_token
+        user = RoleClaimsJWTAuthentication().get_user(AccessToken(str(token)))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_space_manager_id(user), self.manager.id)
+        self.assertEqual(self.get(token).status_code, 200)
+
+    def test_role_without_its_profile_claim_is_refused(self):
+        token = RefreshToken.for_user(self.manager.user).access_token
+        token['role'] = 'space_manager'
+
+        self.assertEqual(self.get(token).status_code, 403)
+
+    def test_claimed_role_wins_over_the_users_profiles(self):
+        # A manager who logged in as a student holds a student token, not a manager one.
+        self.assertEqual(self.get(refresh_token_for(self.manager.user, 'student', self.student.id).access_token)
+                         .status_code, 403)
+
+    def test_forged_role_claim_fails_the_signature(self):
+        header, payload, signature = str(refresh_token_for(self.student.user, 'student', self.student.id)
+                                         .access_token).split('.')
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        claims.update(role='space_manager', space_manager_id=self.manager.id)
+        forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b'=').decode()
+
+        self.assertEqual(self.get(f'{header}.{forged}.{signature}').status_code, 401)
+
+    def test_tokens_issued_before_role_claims_fall_back_to_the_profile(self):
+        self.assertEqual(self.get(RefreshToken.for_user(self.manager.user).access_token).status_code, 200)
+        self.assertEqual(self.get(RefreshToken.for_user(self.student.user).access_token).status_code, 403)
+
+    def test_unknown_role_falls_back_to_the_profile(self):
+        token = RefreshToken.for_user(self.student.user).access_token
+        token['role'] = 'admin'
+        token['space_manager_id'] = self.manager.id
+        user = RoleClaimsJWTAuthentication().get_user(AccessToken(str(token)))
+
+        self.assertFalse(hasattr(user, 'token_role'))
+        self.assertIsNone(get_space_manager_id(user))
+        self.assertEqual(self.get(token).status_code, 403)
+
+
+class StatelessAuthenticationTests(ReservationFixture, TestCase):
+    def test_read_only_view_never_loads_the_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/space/{self.spaces[0].id}/', **self.as_student())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q['sql'] for q in queries if f'FROM "{User._meta.db_table}"' in q['sql']])
+
+    def test_other_user_attributes_load_the_user_once(self):
+        token = refresh_token_for(self.student.user, 'student', self.student.id).access_token
+        user = RoleClaimsTokenUser(AccessToken(str(token)))
+
+        with self.assertNumQueries(0):
+            self.assertEqual((user.id, get_student_id(user)), (self.student.user.pk, self.student.id))
+        with self.assertNumQueries(1):
+            self.assertEqual((user.first_name, user.last_name), ('Sara', 'Ahmadi'))
+        with self.assertNumQueries(1):
+            self.assertEqual(user.student_profile.student_id, '400123456')
+        self.assertEqual(user, self.student.user)
+        with self.assertRaises(AttributeError):
+            user.no_such_attribute
+
+    def test_manager_views_refuse_a_deactivated_manager(self):
+        auth = self.as_manager()
+        User.objects.filter(pk=self.manager.user.pk).update(is_active=False)
+
+        for path in ('/api/spacemanager/dashboard/', '/api/spacemanager/utilization/',
+                     '/api/spacemanager/demand/'):
+            self.assertEqual(self.client.get(path, **auth).status_code, 401, path)
+
+
+class MinuteThrottle(SlidingWindowRateThrottleMixin, SimpleRateThrottle):
+    scope = 'test'
+    rate = '10/min'
+
+    def get_cache_key(self, request, view):
+        return 'throttle_test_client'
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [MinuteThrottle]
+
+    def get(self, request):
+        return Response()
+
+
+class SlidingWindowThrottleTests(SimpleTestCase):
+    start = 6000.0  # The start of a one-minute window.
+
+    def setUp(self):
+        self.cache = LocMemCache('sliding-window-throttle-tests', {})
+        self.addCleanup(self.cache.clear)
+        self.clock = self.start
+        patcher = mock.patch.multiple(MinuteThrottle, cache=self.cache, timer=lambda throttle: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def hit(self, times=1, at=None):
+        """Sends ``times`` requests at ``at`` seconds into the test; returns the number allowed."""
+        if at is not None:
+            self.clock = self.start + at
+        return sum(MinuteThrottle().allow_request(None, None) for _ in range(times))
+
+    def test_limit_does_not_reset_at_the_window_edge(self):
+        self.assertEqual(self.hit(12, at=59.9), 10)
+        # A fixed window would admit another ten here; the full previous window still counts.
+        self.assertEqual(self.hit(at=60), 0)
+        # A tenth of it has slid out: room for one request.
+        self.assertEqual(self.hit(2, at=66), 1)
+
+    def test_previous_window_weighs_by_the_part_still_inside(self):
+        self.hit(10, at=0)
+        # Half of the previous window has slid out: five of its ten requests still count.
+        self.assertEqual(self.hit(10, at=90), 5)
+        throttle = MinuteThrottle()
+        throttle.allow_request(None, None)
+        self.assertEqual((throttle.previous, throttle.current, throttle.estimate()), (10, 5, 10))
+
+    def test_wait_is_the_time_until_a_request_is_admitted(self):
+        self.hit(10, at=0)
+        self.hit(5, at=90)
+        throttle = MinuteThrottle()
+        self.assertFalse(throttle.allow_request(None, None))
+        # 10 * (1 - elapsed / 60) + 5 leaves room for a whole request once elapsed reaches 36 seconds.
+        self.assertAlmostEqual(throttle.wait(), 6)
+        self.clock += throttle.wait()
+        throttle = MinuteThrottle()
+        self.assertTrue(throttle.allow_request(None, None))
+        self.assertAlmostEqual(throttle.estimate(), 9)
+
+    def test_wait_for_the_next_window_when_nothing_slides_out(self):
+        self.hit(10, at=10)
+        throttle = MinuteThrottle()
+        self.assertFalse(throttle.allow_request(None, None))
+        self.assertAlmostEqual(throttle.wait(), 50)
+
+    def test_throttled_response_carries_retry_after(self):
+        self.hit(10, at=0)
+        self.hit(5, at=90)
+        response = ThrottledView.as_view()(RequestFactory().get('/throttled/'))
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '6')
+
+    def test_rates_as_written_in_the_settings(self):
+        for rate, parsed in [('100/hour', (100, 3600)), ('1000000/hour', (1000000, 3600)),
+                             ('1/minute', (1, 60)), ('30/min', (30, 60)), ('5/second', (5, 1)), ('500/day', (500, 86400))]:
+            self.assertEqual(MinuteThrottle().parse_rate(rate), parsed, rate)
+
+        # DRF binds the rates, THROTTLE_RATE_USER included, to the class when it is imported.
+        self.assertEqual(SlidingWindowUserRateThrottle.THROTTLE_RATES, settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'])
+        with mock.patch.dict(SlidingWindowUserRateThrottle.THROTTLE_RATES, user='30/minute'):
+            throttle = SlidingWindowUserRateThrottle()
+        self.assertEqual((throttle.num_requests, throttle.duration), (30, 60))
+
+
+class CoverageTests(SimpleTestCase):
+    codes = (1, 2, 3, 4, 5)
+
+    def test_hour_columns(self):
+        self.assertEqual(hour_columns((3, 4, 5)).tolist(), [-1, -1, -1, 0, 1, 2])
+
+    def test_overlaps_empty_cells_and_range_edges(self):
+        cells, starts, ends = zip(
+            (0, 1, 3), (0, 2, 4),  # overlapping in cell 0
+            (2, 1, 5),             # the whole range
+            (3, 5, 5), (3, 1, 1),  # the last and the first hour alone
+        )
+        covered = coverage(np.array(cells), np.array(starts), np.array(ends), 4, hour_columns(self.codes))
+
+        self.assertEqual(covered.tolist(), [
+            [1, 2, 2, 1, 0],
+            [0, 0, 0, 0, 0],
+            [1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 1],
+        ])
+
+    def test_no_intervals(self):
+        empty = np.array([], dtype=np.int32)
+        self.assertEqual(coverage(empty, empty, empty, 2, hour_columns(self.codes)).tolist(), [[0] * 5] * 2)
+
+
+class ManagerUtilizationTests(TestCase):
+    """Two days of a manager's two spaces, one of them never booked, against hand-computed figures."""
+
+    first_day = datetime.date(2040, 1, 7)
+    query = '?date_from=2040-01-07&date_to=2040-01-08'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = SpaceManager.objects.create(user=User.objects.create_user(username='manager'), username='manager')
+        other = SpaceManager.objects.create(user=User.objects.create_user(username='other'), username='other')
+        student = Student.objects.create(user=User.objects.create_user(username='student'), student_id='400100200',
+                                         national_id='0012345600', is_approved=True)
+        cls.hall = Space.objects.create(name='A Hall', address='Campus', capacity=20, space_type='hall',
+                                        space_manager=cls.manager)
+        cls.room = Space.objects.create(name='B Room', address='Campus', capacity=10, space_type='class',
+                                        space_manager=cls.manager)
+        elsewhere = Space.objects.create(name='C Hall', address='Campus', capacity=50, space_type='hall',
+                                         space_manager=other)
+
+        def schedule(space, days, start, end):
+            return Schedule.objects.create(space=space, date=cls.first_day + datetime.timedelta(days=days),
+                                           start_hour_code_id=start, end_hour_code_id=end)
+
+        def reserve(space, days, start, end, status='approved'):
+            Reservation.objects.create(reservation_type='class', reservee_type='student', student=student,
+                                       space=space, schedule=schedule(space, days, start, end), status=status)
+
+        reserve(cls.hall, 0, 1, 3)
+        # Schedule.save() refuses the overlap at code 3; rows saved before that check can still hold one.
+        talk = schedule(cls.hall, 0, 4, 5)
+        Schedule.objects.filter(pk=talk.pk).update(start_hour_code_id=3)
+        Event.objects.create(title='Talk', event_type='event', space=cls.hall, schedule=talk,
+                             organizer='student', student_organizer=student)
+        reserve(cls.hall, 0, 8, 9, status='rejected')
+        reserve(cls.hall, 0, 10, 11, status='under_review')
+        reserve(cls.hall, 1, 12, 12)
+        reserve(cls.hall, -1, 1, 12)  # the day before the range
+        reserve(cls.hall, 2, 1, 12)   # the day after it
+        reserve(elsewhere, 0, 1, 12)
+
+    def setUp(self):
+        self.auth = bearer(self.manager.user, 'space_manager', self.manager.id)
+
+    def test_figures_per_space(self):
+        report = self.client.get('/api/spacemanager/utilization/' + self.query, **self.auth).json()
+
+        # Codes 1-5 on the first day (the overlap at 3 counted once) and 12 on the second: 6 of 2 x 12.
+        self.assertEqual([(row['space_id'], row['booked_slots'], row['available_slots'], row['utilization_percent'],
+                           row['idle_seat_slots'], row['peak_hour_code']) for row in report['spaces']],
+                         [(self.hall.id, 6, 24, 25.0, 18 * 20, 1), (self.room.id, 0, 24, 0.0, 24 * 10, None)])
+        self.assertEqual(report['summary'], {'spaces': 2, 'booked_slots': 6, 'available_slots': 48, 'idle_slots': 42,
+                                             'utilization_percent': 12.5, 'idle_seat_slots': 600})
+        self.assertEqual({row['space_type']: row['booked_slots'] for row in report['space_types']},
+                         {'hall': 6, 'class': 0})
+        first_day = next(row for row in report['slots']
+                         if row['weekday'] == 'saturday' and row['hour_code'] == 3)
+        self.assertEqual((first_day['booked_slots'], first_day['available_slots']), (1, 2))
+
+    def test_export(self):
+        response = self.client.get('/api/spacemanager/utilization/export/' + self.query, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'],
+                         'attachment; filename="utilization-spaces-2040-01-07-2040-01-08.csv"')
+        body = response.content.decode('utf-8')
+        self.assertTrue(body.startswith('\ufeff'))
+        rows = list(csv.DictReader(StringIO(body[1:])))
+        self.assertEqual([(row['space_name'], row['booked_slots'], row['utilization_percent'], row['peak_hour_code'])
+                          for row in rows], [('A Hall', '6', '25.0', '1'), ('B Room', '0', '0.0', '')])
+
+        response = self.client.get('/api/spacemanager/utilization/export/' + self.query + '&breakdown=weekdays',
+                                   **self.auth)
+        rows = list(csv.DictReader(StringIO(response.content.decode('utf-8-sig'))))
+        self.assertEqual([row['weekday'] for row in rows[:2]], ['saturday', 'sunday'])
+        self.assertEqual([row['booked_slots'] for row in rows[:2]], ['5', '1'])
+
+    def test_export_refuses_bad_parameters(self):
+        for query in ('&breakdown=rooms', '&date_from=2040-01-09', '&date_to=2040-13-01'):
+            response = self.client.get('/api/spacemanager/utilization/export/' + self.query + query, **self.auth)
+            self.assertEqual(response.status_code, 400, query)
+
+
+class MetricsEndpointTests(TestCase):
+    def scrape(self, **headers):
+        return self.client.get('/metrics', **headers)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_refused_without_a_token_when_debug_is_off(self):
+        self.assertEqual(self.scrape().status_code, 403)
+
+    @override_settings(DEBUG=True, METRICS_TOKEN='')
+    def test_open_without_a_token_in_debug(self):
+        self.assertEqual(self.scrape().status_code, 200)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='scrape-secret')
+    def test_token_is_checked(self):
+        self.assertEqual(self.scrape().status_code, 403)
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.scrape(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'roomito_email_outbox_depth', response.content)
+
+
+class ManagerReservationDetailTests(ReservationFixture, TestCase):
+    def test_missing_reservation_is_a_404(self):
+        response = self.client.get('/api/spacemanager/reservations/0/', **self.as_manager())
+        self.assertEqual(response.status_code, 404)
+
+    def test_unexpected_error_is_logged(self):
+        with mock.patch('space_managers.views.ReservationDetailSerializer', side_effect=RuntimeError('boom')), \
+                self.assertLogs('space_managers.views', 'ERROR') as logs:
+            response = self.client.get(f'/api/spacemanager/reservations/{self.reservations[0].id}/',
+                                       **self.as_manager())
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('RuntimeError: boom', logs.output[0])
+
+
+class ReservationListProjectionTests(ReservationFixture, TestCase):
+    """The values_list() projections render exactly what the serializers they replace did."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        staff = Staff.objects.create(first_name='Reza', last_name='Nadi', email='reza@uni.ac.ir', personnel_code='P1')
+        nameless = Student.objects.create(user=User.objects.create_user(username='nameless'), student_id='400999999',
+                                          national_id='0012349999', is_approved=True)
+        space = cls.spaces[0]
+        unscheduled = dict(reservation_type='class', space=space)
+        Reservation.objects.create(reservee_type='staff', staff=staff, **unscheduled)
+        Reservation.objects.create(reservee_type='student', student=nameless, phone_number='09120000000', **unscheduled)
+        Reservation.objects.create(reservee_type='student', student=cls.student, description='No space, no time',
+                                   reservation_type='event')
+        Reservation.objects.create(reservee_type='student', student=cls.student, **unscheduled)
+
+    def render(self, rows):
+        return json.loads(JSONRenderer().render(rows))
+
+    def test_manager_list(self):
+        reservations = Reservation.objects.filter(space__space_manager=self.manager).order_by('id')
+        self.assertEqual(
+            self.render(reservation_list_rows(reservations)),
+            self.render(ReservationListSerializer(reservations.select_related('space', 'schedule', 'student__user',
+                                                                               'staff'), many=True).data),
+        )
+
+    def test_my_reservations(self):
+        reservations = Reservation.objects.filter(student=self.student).order_by('id')
+        rows = self.render(my_reservation_list_rows(reservations))
+
+        self.assertEqual(rows, self.render(MyReservationListSerializer(reservations, many=True).data))
+        self.assertEqual([sorted(set(MyReservationListSerializer.Meta.fields) - set(row)) for row in rows[-2:]],
+                         [['date', 'space_name'], ['date']])
+
+
+class PrebuiltSchemaViewTests(TestCase):
+    path = '/api/schema/?format=json'
+    body = b'{"openapi": "3.0.3", "paths": {}}'
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        settings_override = override_settings(OPENAPI_SCHEMA_DIR=str(self.dir), CODE_VERSION='test-version')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Forget the version and the artifacts this process already computed, now and after the test.
+        code_version.cache_clear()
+        self.addCleanup(code_version.cache_clear)
+        artifacts = mock.patch.dict(schema._artifacts, clear=True)
+        artifacts.start()
+        self.addCleanup(artifacts.stop)
+
+    def prebuild(self):
+        (self.dir / 'openapi-test-version.json').write_bytes(self.body)
+
+    def test_served_from_the_prebuilt_file(self):
+        self.prebuild()
+        with mock.patch.object(schema, 'generate_schema', side_effect=AssertionError('generated')):
+            response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.body)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_matching_etag_is_a_304(self):
+        self.prebuild()
+        etag = self.client.get(self.path)['ETag']
+
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual((response.content, response['ETag']), (b'', etag))
+        self.assertEqual(self.client.get(self.path, HTTP_IF_NONE_MATCH='"other", ' + etag).status_code, 304)
+        self.assertEqual(self.client.get(self.path, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_gzip_only_when_accepted(self):
+        self.prebuild()
+        compressed = self.client.get(self.path, HTTP_ACCEPT_ENCODING='br, gzip')
+        plain = self.client.get(self.path, HTTP_ACCEPT_ENCODING='identity')
+
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), self.body)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(plain.content, self.body)
+        for response in (compressed, plain):
+            self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(compressed['ETag'], plain['ETag'])
+
+    def test_missing_file_is_generated_and_stale_versions_removed(self):
+        (self.dir / 'openapi-old-version.json').write_bytes(b'stale')
+        (self.dir / 'openapi-old-version.yaml').write_bytes(b'stale')
+
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(path.name for path in self.dir.iterdir()),
+                         ['openapi-test-version.json', 'openapi-test-version.yaml'])
+        self.assertEqual(response.content, (self.dir / 'openapi-test-version.json').read_bytes())
+        # The documentation kept in common.schema_docs is in the generated schema.
+        self.assertEqual(json.loads(response.content)['paths']['/api/login/']['post']['tags'], ['auth'])
@@ -0,0 +1,257 @@
+"""
+Occupancy analytics: how much of their bookable time the spaces are actually booked.
+
+An hour slot of a space on a day is booked when a schedule covering it has an event or
+an approved reservation, the same rule the conflict check applies. ``Occupancy.load``
+streams the schedule intervals of the events and of the approved reservations of a
+set of spaces over a date range and paints them into a boolean array of shape
+(spaces, days, hour codes).
+``utilization_report`` reduces that array with NumPy into utilization per space,
+weekday, week, space type and feature, the busiest weekday/hour slots, and idle
+capacity. The ORM never loops over schedules.
+"""
+import csv
+from datetime import timedelta
+from typing import NamedTuple
+
+from itertools import chain
+
+import numpy as np
+
+from .hour_slots import hour_slots
+from .models import Event, Reservation, Space
+
+# Python weekday() numbers in the order of the Iranian week, Saturday first.
+WEEK_ORDER = (5, 6, 0, 1, 2, 3, 4)
+WEEKDAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+PEAK_SLOTS = 10
+
+_FIGURES = ('booked_slots', 'available_slots', 'idle_slots', 'utilization_percent')
+# Row sections of the report and their columns, in CSV order.
+SECTIONS = {
+    'spaces': ('space_id', 'space_name', 'space_type', 'capacity', *_FIGURES, 'idle_seat_slots', 'peak_hour_code'),
+    'weekdays': ('weekday', *_FIGURES),
+    'weeks': ('week_start', *_FIGURES),
+    'space_types': ('space_type', 'spaces', *_FIGURES),
+    'features': ('feature_id', 'feature_name', 'spaces', *_FIGURES),
+    'slots': ('weekday', 'hour_code', 'time_range', *_FIGURES),
+    'peak_slots': ('weekday', 'hour_code', 'time_range', *_FIGURES),
+}
+
+_INTERVAL_FIELDS = ('space_id', 'schedule__date', 'schedule__start_hour_code', 'schedule__end_hour_code')
+_INTERVAL = np.dtype([('space', np.int32), ('day', np.int32), ('start', np.int32), ('end', np.int32)])
+
+
+def hour_columns(codes):
+    """Array mapping each hour code to its column in ``codes``, -1 for codes not there."""
+    # Hour codes are consecutive, so a schedule covers the columns of its start code to its end code.
+    column = np.full(max(codes, default=0) + 1, -1, dtype=np.int32)
+    column[list(codes)] = np.arange(len(codes), dtype=np.int32)
+    return column
+
+
+def coverage(cells, starts, ends, size, column):
+    """
+    How many intervals cover each hour of each of ``size`` cells, as a (size, hours) array.
+    Interval n lies in cell ``cells[n]`` and runs from hour code ``starts[n]`` to ``ends[n]``.
+    """
+    # +1 at the first column of each interval and -1 just past the last; a running sum
+    # along the hour axis then counts the intervals over each slot.
+    width = int((column >= 0).sum()) + 1
+    cells = np.asarray(cells, dtype=np.int64) * width
+    edges = (np.bincount(cells + column[starts], minlength=size * width)
+             - np.bincount(cells + column[ends] + 1, minlength=size * width))
+    return edges.reshape(size, width).cumsum(axis=1)[:, :-1]
+
+
+class SpaceRow(NamedTuple):
+    id: int
+    name: str
+    space_type: str
+    capacity: int
+
+
+class Occupancy:
+    """Booked hour slots of ``spaces`` from ``first_day`` on, one row per space, one column per hour code."""
+
+    __slots__ = ('spaces', 'first_day', 'codes', 'booked')
+
+    def __init__(self, spaces, first_day, codes, booked):
+        self.spaces = spaces
+        self.first_day = first_day
+        self.codes = codes
+        self.booked = booked
+
+    @property
+    def days(self):
+        return self.booked.shape[1]
+
+    @classmethod
+    def load(cls, spaces, first_day, last_day, chunk_size=20000):
+        spaces = list(spaces)
+        codes = tuple(slot.code for slot in hour_slots())
+        days = (last_day - first_day).days + 1
+        column = hour_columns(codes)
+        position = {space.id: n for n, space in enumerate(spaces)}
+        origin = first_day.toordinal()
+
+        # Two queries, each driven by an index on the space: one on schedules with an OR over
+        # their event and reservation joins has to hash the whole reservation table. A schedule
+        # with both is painted twice, which changes nothing.
+        in_range = {'space_id__in': list(position), 'schedule__date__gte': first_day, 'schedule__date__lte': last_day}
+        rows = chain.from_iterable(
+            queryset.filter(**in_range).order_by().values_list(*_INTERVAL_FIELDS).iterator(chunk_size=chunk_size)
+            for queryset in (Reservation.objects.filter(status='approved'), Event.objects.all())
+        )
+        intervals = np.fromiter(
+            ((position[space_id], day.toordinal() - origin, start, end) for space_id, day, start, end in rows),
+            dtype=_INTERVAL,
+        )
+
+        cell = intervals['space'].astype(np.int64) * days + intervals['day']
+        covered = coverage(cell, intervals['start'], intervals['end'], len(spaces) * days, column)
+        booked = covered.reshape(len(spaces), days, len(codes)) > 0
+        return cls(spaces, first_day, codes, booked)
+
+
+def _rate(booked, available):
+    return round(100 * booked / available, 2) if available else None
+
+
+def _figures(booked, available):
+    booked, available = int(booked), int(available)
+    return {
+        'booked_slots': booked,
+        'available_slots': available,
+        'idle_slots': available - booked,
+        'utilization_percent': _rate(booked, available),
+    }
+
+
+def utilization_report(occupancy, features=()):
+    """
+    Utilization figures of ``occupancy`` by section. ``features`` are (space_id,
+    feature_id, feature_name) triples for the spaces of the occupancy.
+    """
+    booked = occupancy.booked
+    spaces, codes = occupancy.spaces, occupancy.codes
+    space_count, days, hours = booked.shape
+    slots = hour_slots()
+
+    by_space_day = booked.sum(axis=2, dtype=np.int64)            # spaces x days
+    by_space = by_space_day.sum(axis=1)                          # spaces
+    by_space_hour = booked.sum(axis=1, dtype=np.int64)           # spaces x hours
+    by_day_hour = booked.sum(axis=0, dtype=np.int64)             # days x hours
+    per_space = days * hours
+    capacity = np.array([space.capacity for space in spaces], dtype=np.int64)
+
+    ordinals = occupancy.first_day.toordinal() + np.arange(days)
+    weekday = (ordinals - 1) % 7                                 # date.fromordinal(1) is a Monday
+    days_per_weekday = np.bincount(weekday, minlength=7)
+    booked_per_weekday = np.bincount(weekday, weights=by_day_hour.sum(axis=1), minlength=7)
+    weekday_hour = np.zeros((7, hours), dtype=np.int64)
+    np.add.at(weekday_hour, weekday, by_day_hour)
+
+    # Weeks start on Saturday.
+    week_start = ordinals - (weekday - 5) % 7
+    weeks, week = np.unique(week_start, return_inverse=True)
+    days_per_week = np.bincount(week, minlength=len(weeks))
+    booked_per_week = np.bincount(week, weights=by_day_hour.sum(axis=1), minlength=len(weeks))
+
+    type_names = [value for value, _ in Space.SPACE_TYPES]
+    space_type = np.array([type_names.index(space.space_type) if space.space_type in type_names else -1
+                           for space in spaces], dtype=np.int64)
+    listed_types = space_type >= 0
+    spaces_per_type = np.bincount(space_type[listed_types], minlength=len(type_names))
+    booked_per_type = np.bincount(space_type[listed_types], weights=by_space[listed_types], minlength=len(type_names))
+
+    position = {space.id: n for n, space in enumerate(spaces)}
+    feature_names = {feature_id: name for _, feature_id, name in features}
+    feature_ids = sorted(feature_names, key=feature_names.get)
+    feature_column = {feature_id: n for n, feature_id in enumerate(feature_ids)}
+    membership = np.zeros((space_count, len(feature_ids)), dtype=np.int64)
+    for space_id, feature_id, _ in features:
+        membership[position[space_id], feature_column[feature_id]] = 1
+    booked_per_feature = by_space @ membership
+    spaces_per_feature = membership.sum(axis=0)
+
+    weekday_rows = []
+    for day in WEEK_ORDER:
+        weekday_rows.append({'weekday': WEEKDAY_NAMES[day],
+                             **_figures(booked_per_weekday[day], days_per_weekday[day] * hours * space_count)})
+
+    slot_rows = []
+    for day in WEEK_ORDER:
+        for column, code in enumerate(codes):
+            slot = slots.get(code)
+            slot_rows.append({
+                'weekday': WEEKDAY_NAMES[day],
+                'hour_code': code,
+                'time_range': slot.time_range if slot else None,
+                **_figures(weekday_hour[day, column], days_per_weekday[day] * space_count),
+            })
+    peak_slots = sorted((row for row in slot_rows if row['booked_slots']),
+                        key=lambda row: (-row['utilization_percent'], -row['booked_slots']))[:PEAK_SLOTS]
+
+    space_rows = []
+    for n, space in enumerate(spaces):
+        peak = int(by_space_hour[n].argmax()) if by_space[n] else None
+        figures = _figures(by_space[n], per_space)
+        space_rows.append({
+            'space_id': space.id,
+            'space_name': space.name,
+            'space_type': space.space_type,
+            'capacity': space.capacity,
+            **figures,
+            'idle_seat_slots': figures['idle_slots'] * space.capacity,
+            'peak_hour_code': codes[peak] if peak is not None else None,
+        })
+
+    total_booked, total_available = by_space.sum(), per_space * space_count
+    return {
+        'date_from': occupancy.first_day,
+        'date_to': occupancy.first_day + timedelta(days=days - 1),
+        'days': days,
+        'hour_codes': list(codes),
+        'summary': {
+            'spaces': space_count,
+            **_figures(total_booked, total_available),
+            'idle_seat_slots': int(((per_space - by_space) * capacity).sum()),
+        },
+        'spaces': space_rows,
+        'weekdays': weekday_rows,
+        'weeks': [
+            {'week_start': occupancy.first_day + timedelta(days=int(start) - occupancy.first_day.toordinal()),
+             **_figures(booked_per_week[n], days_per_week[n] * hours * space_count)}
+            for n, start in enumerate(weeks)
+        ],
+        'space_types': [
+            {'space_type': name, 'spaces': int(spaces_per_type[n]),
+             **_figures(booked_per_type[n], spaces_per_type[n] * per_space)}
+            for n, name in enumerate(type_names) if spaces_per_type[n]
+        ],
+        'features': [
+            {'feature_id': feature_id, 'feature_name': feature_names[feature_id],
+             'spaces': int(spaces_per_feature[n]),
+             **_figures(booked_per_feature[n], spaces_per_feature[n] * per_space)}
+            for n, feature_id in enumerate(feature_ids)
+        ],
+        'slots': slot_rows,
+        'peak_slots': peak_slots,
+    }
+
+
+def build_report(spaces, first_day, last_day):
+    """utilization_report() of the ``spaces`` queryset from ``first_day`` to ``last_day``, in four queries."""
+    rows = [SpaceRow(*row) for row in spaces.order_by('name', 'id').values_list('id', 'name', 'space_type', 'capacity')]
+    features = Space.features.through.objects.filter(space_id__in=[row.id for row in rows]).values_list(
+        'space_id', 'spacefeature_id', 'spacefeature__name',
+    )
+    return utilization_report(Occupancy.load(rows, first_day, last_day), list(features))
+
+
+def write_csv(report, section, out):
+    """Write the rows of one report section to the text stream ``out`` as CSV."""
+    writer = csv.DictWriter(out, fieldnames=SECTIONS[section])
+    writer.writeheader()
+    writer.writerows(report[section])
@@ -1,21 +1,32 @@
-from django.http import Http404
+import logging
+
+from django.http import Http404, HttpResponse
+from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample, OpenApiParameter
-from .models import HourSlot, Reservation, Schedule, Space, Event, SpaceFeature, ReservationNotification, SpaceImage, SpaceManager
+from common.lazy_schema import lazy_schema
+from .dashboard import manager_dashboard, with_ages
+from .demand import demand_report
+from .hour_slots import ahour_slots, hour_slots
+from .utilization import SECTIONS, build_report, write_csv
+from .models import Reservation, Schedule, Space, Event, SpaceFeature, ReservationNotification, SpaceImage
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.mail import send_mail
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from drf_spectacular.types import OpenApiTypes
 from django.utils import timezone
 from django.db import transaction
 from django.db.models import Q
+from asgiref.sync import sync_to_async
+from common.async_views import AsyncAPIView
+from common.authentication import StatelessRoleClaimsJWTAuthentication, get_space_manager_id
+from common.pagination import InvalidCursor, decode_cursor, encode_cursor, next_page_link, parse_limit
+from common.metrics import RESERVATIONS_CONFLICTED, RESERVATIONS_CREATED, RESERVATIONS_DECIDED
+from common.permissions import IsSpaceManagerUser
 
 from .serializers import (
-    ErrorResponseSerializer,
     ManagerSpaceDetailSerializer,
     ManagerSpaceListSerializer,
     ReservationDecisionSerializer,
@@ -24,7 +35,6 @@ from .serializers import (
     SpaceSerializer,
     SpaceUpdateFeatureSerializer,
     SpaceUpdateSerializer,
-    SuccessResponseSerializer,
     SpaceManagerProfileSerializer,
     SpaceListSerializer,
     EventSerializer,
@@ -33,71 +43,21 @@ from .serializers import (
     SpaceFeatureSerializer,
     SpaceUpdateFeatureSerializer,
     ReservationCreateSerializer,
-    ReservationListSerializer,
     SpaceCreateSerializer,
-    FeatureIdsSerializer
+    FeatureIdsSerializer,
+    ManagerDashboardSerializer,
+    reservation_list_page,
+    reservation_list_rows,
 )
 
-class IsSpaceManagerUser(IsAuthenticated):
-    def has_permission(self, request, view):
-        return super().has_permission(request, view) and hasattr(request.user, 'spacemanager')
-    
+logger = logging.getLogger(__name__)
 
-@extend_schema(tags=['space_manager'])
+
+@lazy_schema
 class SpaceManagerProfileView(APIView):
     permission_classes = [IsSpaceManagerUser]
 
-    @extend_schema(
-        responses={
-            200: OpenApiResponse(
-                response=SpaceManagerProfileSerializer,
-                description="Space manager profile retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="Success",
-                        value={
-                            "first_name": "string",
-                            "last_name": "string",
-                            "email": "string@example.com",
-                            "username": "string"
-                        },
-                        response_only=True
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication credentials were not provided or invalid.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not a space manager.",
-                examples=[
-                    OpenApiExample(
-                        name="NotSpaceManager",
-                        value={"error": "User is not a space manager."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Server error while retrieving profile.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred while retrieving profile."}
-                    )
-                ]
-            )
-        },
-        description="Retrieves the authenticated space manager's profile."
-    )
+    @lazy_schema
     def get(self, request):
         user = request.user
 
@@ -109,78 +69,11 @@ class SpaceManagerProfileView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)  
     
 
-@extend_schema(tags=['space_manager'])    
+@lazy_schema
 class SpaceManagerProfileUpdateView(APIView):
     permission_classes = [IsSpaceManagerUser]
 
-    @extend_schema(
-        request=SpaceManagerProfileUpdateSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Profile updated successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="UpdateSuccess",
-                        value={"message": "Profile updated successfully."}
-                    )
-                ]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid input or validation error.",
-                examples=[
-                    OpenApiExample(
-                        name="DuplicateUsername",
-                        value={"username": ["This username is already in use."]}
-                    ),
-                    # OpenApiExample( 
-                    #     name="DuplicateEmail",
-                    #     value={"email": ["This email is already in use."]}
-                    # ),
-                    OpenApiExample(
-                        name="MissingCurrentPassword",
-                        value={"current_password": ["Current password is required to change password."]}
-                    ),
-                    OpenApiExample(
-                        name="IncorrectCurrentPassword",
-                        value={"current_password": ["Current password is incorrect."]}
-                    ),
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication credentials were not provided or invalid.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not a space manager.",
-                examples=[
-                    OpenApiExample(
-                        name="NotSpaceManager",
-                        value={"error": "User is not a space manager."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Server error while updating profile.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred while updating profile."}
-                    )
-                ]
-            )
-        },
-        description="Update profile information of the authenticated space manager."
-    )    
+    @lazy_schema
     
     def patch(self, request):
         spaceManager = request.user.spacemanager
@@ -196,198 +89,43 @@ class SpaceManagerProfileUpdateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
 
-@extend_schema(tags=['space'])      
+@lazy_schema
 class SpaceListView(APIView):
+    authentication_classes = [StatelessRoleClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budget = 5
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name='space_type',
-                type=OpenApiTypes.STR,
-                location=OpenApiParameter.QUERY,
-                description='Filter spaces by type',
-                required=False,
-                enum=['hall', 'class', 'labratory', 'office'] 
-            ),
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=SpaceListSerializer(many=True),
-                description="List of all available spaces with details.",
-                examples=[
-                    OpenApiExample(
-                        name="RetrieveSpaceListSuccess",
-                        value=[
-                            {
-                                "id": 1,
-                                "space_type": "hall",
-                                "name": "string",
-                                "address": "string",
-                                "capacity": 50,
-                                "description": "string",
-                                "space_manager": {
-                                    "first_name": "string",
-                                    "last_name": "string",
-                                    "email": "string@example.com",
-                                    "username": "string",
-                                },
-                                "first_image_url": "http://localhost:8000/media/space_photos/1.jpg"
-                            }
-                        ],
-                        response_only=True
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"error": "Authentication credentials were not provided."},
-                        response_only=True
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="No spaces found in the database.",
-                examples=[
-                    OpenApiExample(
-                        name="NotFound",
-                        value={"error": "No spaces available."},
-                        response_only=True
-                    ),
-                    OpenApiExample(
-                        name="InvalidSpaceType",
-                        value={"error": "No spaces found for the specified space type."}  # اگه `space_type` نامعتبر باشه
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerErrorExample",
-                        value={"error": "An unexpected error occurred."}
-                    ),
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Failed to retrieve space data from database."}
-                    )
-                ]
-            )
-        },
-        description="Retrieves the list of all available spaces for authenticated users."
-    )
+    @lazy_schema
     
     def get(self, request):
-        space_type = request.query_params.get('space_type', None)
-
-        qs = Space.objects.select_related("space_manager", "space_manager__user").prefetch_related("images").order_by("id")
-
-        if space_type:
-            qs = qs.filter(space_type=space_type)
+        qs = self.get_queryset(request)
 
         if not qs.exists():
             return Response({"error": "No spaces available."}, status=status.HTTP_404_NOT_FOUND)
 
         data = SpaceListSerializer(qs, many=True, context={'request': request}).data
         return Response(data, status=status.HTTP_200_OK)
+
+    def get_queryset(self, request):
+        space_type = request.query_params.get('space_type', None)
+
+        qs = Space.objects.select_related("space_manager", "space_manager__user").prefetch_related("images").order_by("id")
+
+        if space_type:
+            qs = qs.filter(space_type=space_type)
+        return qs
     
 
-@extend_schema(tags=['event'])
+@lazy_schema
 class EventListView(APIView):
+    authentication_classes = [StatelessRoleClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budget = 6
 
-    @extend_schema(
-        description="Retrieves the list of all available events for authenticated users.",
-        responses={
-            200: OpenApiResponse(
-                response=EventSerializer(many=True),
-                description="List of all available events with details.",
-                examples=[
-                    OpenApiExample(
-                        name="Success",
-                        value=[
-                            {
-                                "id": 1,
-                                "title": "کارگاه Django",
-                                "event_type": "event",
-                                "date": "2025-07-27",
-                                "start_time": "09:00:00",
-                                "end_time": "11:00:00",
-                                "space": {
-                                    "id": 3,
-                                    "space_type": "hall",
-                                    "name": "تالار برآنی",
-                                    "address": "دانشکده ...",
-                                    "capacity": 77,
-                                    "description": "no description",
-                                    "space_manager": {
-                                        "first_name": "Sara",
-                                        "last_name": "Karimi",
-                                        "email": "sara@example.com",
-                                        "username": "s.karimi"
-                                    },
-                                    "phone_number": "0313xxxxx",
-                                    "features": [],
-                                    "images": []
-                                },
-                                "poster_url": None,
-                                "organizer": {
-                                    "role": "staff",
-                                    "display": "Ali Ahmadi - 12345"
-                                },
-                                "description": "معرفی REST در Django"
-                            }
-                        ],
-                        response_only=True
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[OpenApiExample(
-                    name="Unauthorized",
-                    value={"detail": "Authentication credentials were not provided."},
-                    response_only=True
-                )]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="No events found in the database.",
-                examples=[OpenApiExample(
-                    name="NotFound",
-                    value={"error": "No events available."},
-                    response_only=True
-                )]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error while retrieving events.",
-                examples=[OpenApiExample(
-                    name="ServerError",
-                    value={"error": "An unexpected server error occurred."},
-                    response_only=True
-                )]
-            ),
-        }
-    )
+    @lazy_schema
     def get(self, request):
         try:
-            events = (
-                Event.objects
-                .select_related(
-                    "space",
-                    "schedule", "schedule__start_hour_code", "schedule__end_hour_code",
-                    "student_organizer__user",  
-                    "staff_organizer"           
-                )
-            )
+            events = self.get_queryset()
             if not events.exists():
                 return Response({"error": "No events available."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -396,92 +134,30 @@ class EventListView(APIView):
         except Exception:
             return Response({"error": "An unexpected server error occurred."},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get_queryset(self):
+        return (
+            Event.objects
+            .select_related(
+                "space", "space__space_manager",
+                "schedule", "student_organizer__user",  
+                "staff_organizer"           
+            )
+            .prefetch_related("space__features", "space__images")
+        )
  
 
-@extend_schema(tags=['event'])
+@lazy_schema
 class EventDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        description="Retrieve detailed information of a specific event by ID (only for authenticated users).",
-        parameters=[
-            OpenApiParameter(
-                name="event_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-                description="ID of the event to retrieve"
-            )
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=EventSerializer,
-                description="Detailed event data retrieved successfully.",
-                examples=[OpenApiExample(
-                    name="Success",
-                    value={
-                        "id": 10,
-                        "title": "جلسه دفاع",
-                        "event_type": "event",
-                        "date": "2025-08-25",
-                        "start_time": "09:00:00",
-                        "end_time": "11:00:00",
-                        "space": {
-                            "id": 2,
-                            "space_type": "hall",
-                            "name": "سالن ویدئوکنفرانس",
-                            "address": "ساختمان ...",
-                            "capacity": 15,
-                            "description": "no description",
-                            "space_manager": {
-                                "first_name": "Sara",
-                                "last_name": "Karimi",
-                                "email": "sara@example.com",
-                                "username": "s.karimi"
-                            },
-                            "phone_number": None,
-                            "features": [],
-                            "images": []
-                        },
-                        "poster": None,
-                        "description": "دفاع کارشناسی"
-                    },
-                    response_only=True
-                )]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[OpenApiExample(
-                    name="Unauthorized",
-                    value={"detail": "Authentication credentials were not provided."}
-                )]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Event not found.",
-                examples=[OpenApiExample(
-                    name="NotFound",
-                    value={"error": "Event with this ID does not exist."}
-                )]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error while retrieving events.",
-                examples=[OpenApiExample(
-                    name="ServerError",
-                    value={"error": "An unexpected server error occurred."}
-                )]
-            )
-        }
-    )
+    @lazy_schema
     def get(self, request, event_id):
         try:
             event = get_object_or_404(
                 Event.objects.select_related(
                     "space",
-                    "schedule", "schedule__start_hour_code", "schedule__end_hour_code",
-                    "student_organizer__user",   
+                    "schedule", "student_organizer__user",   
                     "staff_organizer"            
                 ),
                 id=event_id
@@ -497,67 +173,12 @@ class EventDetailView(APIView):
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
 
-@extend_schema(tags=['space_manager'])
+@lazy_schema
 class SpaceFeatureView(APIView):
     permission_classes = [IsSpaceManagerUser]
+    query_budget = 5
 
-    @extend_schema(
-        description="Retrieves the available features for a space managed by the authenticated space manager.",
-        request=None,
-        responses={
-            200: OpenApiResponse(
-                response=SpaceFeatureSerializer(many=True), 
-                description="Space features retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="Success",
-                        value=[
-                            {"id": 1, "name": "string1"},
-                            {"id": 2, "name": "string2"}
-                        ]
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated or not a space manager.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"error": "Authentication credentials were not provided."}
-                    ),
-                    OpenApiExample(
-                        name="NotSpaceManager",
-                        value={"error": "User is not a space manager."}
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found or user is not the manager.",
-                examples=[
-                    OpenApiExample(
-                        name="NotFound",
-                        value={"error": "Space not found or you are not authorized to manage it."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred."}
-                    ),
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Failed to retrieve feature data from database."}
-                    )
-                ]
-            )
-        }
-    )
+    @lazy_schema
     def get(self, request, space_id):
         try:
             space = get_object_or_404(Space, id=space_id, space_manager__user=request.user)
@@ -576,85 +197,11 @@ class SpaceFeatureView(APIView):
             )
             
 
-@extend_schema(tags=['space_manager'])
+@lazy_schema
 class SpaceUpdateFeatureView(APIView):
     permission_classes = [IsSpaceManagerUser]
 
-    @extend_schema(
-        description="Allows a space manager to add existing features to a space using their IDs.",
-        request=FeatureIdsSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Features updated successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="Success",
-                        value={
-                            "message": "Features updated successfully.",
-                            "updated_features": ["string1", "string2"]
-                        }
-                    )
-                ]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid data or no feature IDs provided.",
-                examples=[
-                    OpenApiExample(
-                        name="InvalidData",
-                        value={"error": "No feature IDs provided."}
-                    ),
-                    OpenApiExample(
-                        name="InvalidFormat",
-                        value={"feature_ids": ["A valid list of integers is required."]}  
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found, user is not the manager, or feature ID is invalid.",
-                examples=[
-                    OpenApiExample(
-                        name="NotFound",
-                        value={"error": "Space not found or you are not authorized to manage it."}
-                    ),
-                    OpenApiExample(
-                        name="InvalidFeature",
-                        value={"error": "One or more feature IDs are invalid: [999]"}
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated or not a space manager.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"error": "Authentication credentials were not provided."}
-                    ),
-                    OpenApiExample(
-                        name="NotSpaceManager",
-                        value={"error": "User is not a space manager."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred."}
-                    ),
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Failed to update features in database."}
-                    )
-                ]
-            )
-        }
-    )
+    @lazy_schema
     def post(self, request, space_id):
         space = get_object_or_404(Space, id=space_id, space_manager__user=request.user)
         
@@ -669,127 +216,11 @@ class SpaceUpdateFeatureView(APIView):
             return Response
                         
                         
-@extend_schema(tags=['reservation'])
+@lazy_schema
 class ReservationCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        description="Create a reservation request for a specific space by authenticated user (student or staff) with a list of consecutive hour codes.",
-        request=ReservationCreateSerializer,
-        responses={
-            201: OpenApiResponse(
-                response=ReservationCreateSerializer,
-                description="Reservation request created successfully and sent to space manager for review."
-            ),
-
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid data provided (serializer-level validation).",
-                examples=[
-                    OpenApiExample(
-                        name="DuplicateHours",
-                        value={"schedule": {"hour_codes": ["Duplicate hour codes are not allowed."]}}
-                    ),
-                    OpenApiExample(
-                        name="NonAscending",
-                        value={"schedule": {"hour_codes": ["Hour codes must be in ascending order."]}}
-                    ),
-                    OpenApiExample(
-                        name="NonConsecutive",
-                        value={"schedule": {"hour_codes": ["Hour codes must be consecutive."]}}
-                    ),
-                    OpenApiExample(
-                        name="InvalidPhoneNumber",
-                        value={"phone_number": ["Phone number must be exactly 11 digits."]}
-                    ),
-                    OpenApiExample(
-                        name="MissingField",
-                        value={"reservation_type": ["This field is required."]}
-                    ),
-                    OpenApiExample(
-                        name="WrongTypeForHourCodes",
-                        value={"schedule": {"hour_codes": { "0": ["Incorrect type. Expected pk value, received str."]}}}
-                    ),
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authenticated but not allowed to perform this action.",
-                examples=[
-                    OpenApiExample(
-                        name="Forbidden",
-                        value={"detail": "You do not have permission to perform this action."}
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found with the given ID.",
-                examples=[
-                    OpenApiExample(
-                        name="NotFound",
-                        value={"error": "Space not found."}
-                    )
-                ]
-            ),
-            409: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Time conflict with existing reservations on the same date/space.",
-                examples=[
-                    OpenApiExample(
-                        name="Conflict",
-                        value={"error": "This time conflicts with another schedule on the same date."}
-                    )
-                ]
-            ),
-            422: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unprocessable entity (e.g., invalid reservation/reservee type, role mismatch).",
-                examples=[
-                    OpenApiExample(
-                        name="InvalidReservationType",
-                        value={"reservation_type": ["Invalid reservation type."]}
-                    ),
-                    OpenApiExample(
-                        name="InvalidReserveeType",
-                        value={"reservee_type": ["You must be a student or staff to create a reservation."]}
-                    ),
-                    OpenApiExample(
-                        name="RoleMismatch",
-                        value={"error": "For the staff reservee type, you must select a staff."}
-                    ),
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error (database/mail/unexpected).",
-                examples=[
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Database connection failed."}
-                    ),
-                    OpenApiExample(
-                        name="EmailError",
-                        value={"error": "Failed to send reservation request to space manager."}
-                    ),
-                    OpenApiExample(
-                        name="UnexpectedError",
-                        value={"error": "An unexpected error occurred."}
-                    )
-                ]
-            ),
-        }
-    )
+    @lazy_schema
     def post(self, request, space_id):
         space = get_object_or_404(Space, id=space_id)
 
@@ -801,37 +232,35 @@ class ReservationCreateView(APIView):
             serializer.is_valid(raise_exception=True)
             reservation = serializer.save()
         except DjangoValidationError as e:
+            RESERVATIONS_CONFLICTED.labels(serializer.validated_data['reservation_type']).inc()
             return Response({"error": e.message if hasattr(e, "message") else e.messages[0]},
                             status=status.HTTP_409_CONFLICT)
         except Exception as e:
             return Response({"error": f"An unexpected error occurred: {str(e)}"},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        RESERVATIONS_CREATED.labels(reservation.reservee_type, reservation.reservation_type).inc()
 
-        def _parse_time_range(time_range_str, pick='start'):
-            if not time_range_str or '-' not in time_range_str:
-                return None
-            parts = time_range_str.split('-')
-            return parts[0] if pick == 'start' else parts[-1]
-        
         if space.space_manager and space.space_manager.email:
+            # The reservation is committed: a failed notification is logged, never turned into
+            # an error response the client would retry into a duplicate request.
             try:
-                start_time = _parse_time_range(reservation.schedule.start_hour_code.time_range, 'start')
-                end_time   = _parse_time_range(reservation.schedule.end_hour_code.time_range, 'end')
+                slots = hour_slots()
+                start = slots.get(reservation.schedule.start_hour_code_id)
+                end = slots.get(reservation.schedule.end_hour_code_id)
+                hours = f'از ساعت {start.start_time:%H:%M} تا {end.end_time:%H:%M} ' if start and end else ''
 
                 send_mail(
                     subject='درخواست رزرو جدید',
                     message=(
                         f'درخواستی جدید برای رزرو {space.name} در تاریخ {reservation.schedule.date} '
-                        f'از ساعت {start_time} تا {end_time} ثبت شده است.'
+                        f'{hours}ثبت شده است.'
                     ),
                     from_email="mahyajfri37@gmail.com",
                     recipient_list=[space.space_manager.email],
                     fail_silently=True,
                 )
-
-            except Exception as e:
-                return Response({"error": f"Failed to send reservation request to space manager: {str(e)}"},
-                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            except Exception:
+                logger.exception("Could not notify the space manager of reservation %s", reservation.pk)
 
         return Response(
             ReservationCreateSerializer(reservation, context={'request': request}).data,
@@ -839,157 +268,234 @@ class ReservationCreateView(APIView):
         )
         
 
-@extend_schema(tags=['space_manager'])
+@lazy_schema
 class ManagerReservationListView(APIView):
     permission_classes = [IsSpaceManagerUser]
+    query_budget = 5
+    # Pagination is opt-in: without limit or cursor the whole list comes back, as it did
+    # before pages existed. A cursor without a limit gets pages of default_limit rows.
+    default_limit = 50
+    max_limit = 500
 
-    @extend_schema(
-        description="Retrieve the list of reservation requests for spaces managed by the authenticated space manager.",
-        responses={
-            200: OpenApiResponse(
-                response=ReservationListSerializer(many=True),
-                description="List of reservation requests successfully retrieved.",
-                examples=[
-                    OpenApiExample(
-                        name="Success",
-                        value=[
-                            {
-                                "id": 1,
-                                "space_name": "string",
-                                "date": "2025-08-15",
-                                "start_time": "09:00:00",
-                                "end_time": "11:00:00",
-                                "status_display": "Under Review",
-                                "reservation_type": "event",
-                                "description": "string",
-                                "reservee_name": "string",
-                                "reservee_type": "student",
-                                "phone_number": "09123456789"
-                            }
-                        ]
-                    ),
-                    OpenApiExample(
-                        name="NoReservations",
-                        value=[]
-                    ),
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not authenticated.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not a space manager or has no managed spaces.",
-                examples=[
-                    OpenApiExample(
-                        name="Forbidden_NotManager",
-                        value={"error": "You are not authorized to view this list."}
-                    ),
-                    OpenApiExample(
-                        name="Forbidden_NoManagedSpaces",
-                        value={"error": "You do not manage any spaces."}
-                    ),
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred."}
-                    ),
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Failed to retrieve reservation data from database."}
-                    )
-                ]
-            )
-        }
-    )
+    @lazy_schema
     def get(self, request):
-        user = request.user
-        try:
-            space_manager = user.spacemanager
-        except SpaceManager.DoesNotExist:
+        space_manager_id = get_space_manager_id(request.user)
+        if space_manager_id is None:
             return Response({"error": "You are not authorized to view this list."},
                             status=status.HTTP_403_FORBIDDEN)
 
-        managed_spaces = Space.objects.filter(space_manager=space_manager)
-
-        if not managed_spaces.exists():
-            return Response([],
-                            status=status.HTTP_200_OK)
-
+        params = self.parse_params(request)
+        if isinstance(params, Response):
+            return params
+        filters, limit, after = params
+        if limit is None:
+            reservations = self.reservations(space_manager_id, filters, paginated=False)
+            return Response(reservation_list_rows(reservations), status=status.HTTP_200_OK)
+
+        rows, next_key = reservation_list_page(self.reservations(space_manager_id, filters, after), limit)
+        response = Response(rows, status=status.HTTP_200_OK)
+        if next_key is not None:
+            response['Link'] = next_page_link(request, encode_cursor(next_key))
+        return response
+
+    @classmethod
+    def reservations(cls, space_manager_id, filters=None, after=None, paginated=True):
+        # Newest first, straight off the Schedule(date, start_hour_code) index. Pages leave
+        # out reservations without a schedule: they have no date to put in a cursor, and
+        # keeping them would stop PostgreSQL from reading the order off the index. A manager
+        # without spaces simply gets no rows.
         reservations = (
             Reservation.objects
-            .filter(space__in=managed_spaces)
-            .select_related(
-                'space',
-                'schedule',
-                'schedule__start_hour_code',
-                'schedule__end_hour_code',
-                'student', 'student__user',
-                'staff'
-            )
-            .order_by('-schedule__date', '-schedule__start_hour_code__code', '-id')
+            .filter(space__space_manager_id=space_manager_id, **(filters or {}))
+            .order_by('-schedule__date', '-schedule__start_hour_code', '-id')
         )
+        if paginated:
+            reservations = reservations.filter(schedule__isnull=False)
+        if after is not None:
+            reservations = reservations.filter(cls.after_key(*after))
+        return reservations
+
+    def parse_params(self, request):
+        params = request.query_params
+        filters = {}
+
+        for name, choices in (('status', Reservation.STATUSES), ('reservation_type', Reservation.RESERVATION_TYPES)):
+            raw = params.get(name)
+            if not raw:
+                continue
+            values = raw.split(',')
+            allowed = [value for value, _ in choices]
+            if any(value not in allowed for value in values):
+                return Response({"error": f"Invalid {name}. Use one or more of: {', '.join(allowed)}."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            filters[f'{name}__in'] = values
+
+        space_id = params.get('space_id')
+        if space_id:
+            try:
+                filters['space_id'] = int(space_id)
+            except ValueError:
+                return Response({"error": "Invalid space ID."}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = ReservationListSerializer(reservations, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
+        try:
+            for name, lookup in (('date_from', 'schedule__date__gte'), ('date_to', 'schedule__date__lte')):
+                if params.get(name):
+                    filters[lookup] = timezone.datetime.strptime(params[name], '%Y-%m-%d').date()
+        except ValueError:
+            return Response({"error": "Dates must be in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = parse_limit(params.get('limit'), None, self.max_limit)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        after = None
+        if params.get('cursor'):
+            try:
+                day, start_code, pk = decode_cursor(params['cursor'], 3)
+                after = (timezone.datetime.strptime(day, '%Y-%m-%d').date(), int(start_code), int(pk))
+            except (InvalidCursor, TypeError, ValueError):
+                return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            limit = limit or self.default_limit
+        return filters, limit, after
+
+    @staticmethod
+    def after_key(day, start_code, pk):
+        """Rows that sort after (day, start_code, pk) in the list's descending order."""
+        # The redundant date bound is what lets the index scan start at the cursor.
+        return Q(schedule__date__lte=day) & (
+            Q(schedule__date__lt=day)
+            | Q(schedule__date=day, schedule__start_hour_code__lt=start_code)
+            | Q(schedule__date=day, schedule__start_hour_code=start_code, id__lt=pk)
+        )
+
+
+@lazy_schema
+class ManagerDashboardView(APIView):
+    # Read-only and cached: a cache hit runs only the user query of the authentication.
+    permission_classes = [IsSpaceManagerUser]
+    query_budget = 2
+
+    @lazy_schema
+    def get(self, request):
+        space_manager_id = get_space_manager_id(request.user)
+        if space_manager_id is None:
+            return Response({"error": "You are not authorized to view this dashboard."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        summary = with_ages(manager_dashboard(space_manager_id), timezone.now())
+        return Response(ManagerDashboardSerializer(summary).data, status=status.HTTP_200_OK)
+
+
+@lazy_schema
+class ManagerUtilizationView(APIView):
+    permission_classes = [IsSpaceManagerUser]
+    query_budget = 6
+    default_days = 365
+    max_days = 731
+
+    @lazy_schema
+    def get(self, request):
+        report = self.build(request)
+        if isinstance(report, Response):
+            return report
+        return Response(report, status=status.HTTP_200_OK)
+
+    def build(self, request):
+        """The utilization report for the query parameters, or the error Response."""
+        space_manager_id = get_space_manager_id(request.user)
+        if space_manager_id is None:
+            return Response({"error": "You are not authorized to view this report."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        try:
+            date_to = (timezone.datetime.strptime(params['date_to'], '%Y-%m-%d').date()
+                       if params.get('date_to') else timezone.localdate())
+            date_from = (timezone.datetime.strptime(params['date_from'], '%Y-%m-%d').date()
+                         if params.get('date_from') else date_to - timezone.timedelta(days=self.default_days - 1))
+        except ValueError:
+            return Response({"error": "Dates must be in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= (date_to - date_from).days < self.max_days:
+            return Response({"error": f"date_from must be on or before date_to, at most {self.max_days} days apart."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        spaces = Space.objects.filter(space_manager_id=space_manager_id)
+        space_type = params.get('space_type')
+        if space_type:
+            if space_type not in dict(Space.SPACE_TYPES):
+                return Response({"error": "Invalid space type."}, status=status.HTTP_400_BAD_REQUEST)
+            spaces = spaces.filter(space_type=space_type)
+        try:
+            if params.get('space_id'):
+                spaces = spaces.filter(id=int(params['space_id']))
+            if params.get('feature'):
+                spaces = spaces.filter(features__id=int(params['feature']))
+        except ValueError:
+            return Response({"error": "space_id and feature must be integers."}, status=status.HTTP_400_BAD_REQUEST)
 
-@extend_schema(tags=['space_manager'])
+        return build_report(spaces, date_from, date_to)
+
+
+@lazy_schema
+class ManagerUtilizationExportView(ManagerUtilizationView):
+
+    @lazy_schema
+    def get(self, request):
+        section = request.query_params.get('breakdown', 'spaces')
+        if section not in SECTIONS:
+            return Response({"error": f"Invalid breakdown. Use one of: {', '.join(SECTIONS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        report = self.build(request)
+        if isinstance(report, Response):
+            return report
+
+        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = (
+            f'attachment; filename="utilization-{section}-{report["date_from"]}-{report["date_to"]}.csv"'
+        )
+        # A byte order mark, so spreadsheet programs read the Persian names as UTF-8.
+        response.write('\ufeff')
+        write_csv(report, section, response)
+        return response
+
+
+@lazy_schema
+class ManagerDemandView(APIView):
+    # Across every space, not only the manager's: unmet demand is what new rooms are planned
+    # from. The user query and two more when no day is queued, six more to rebuild the queued
+    # days, five more to compute the report from the schedules while the rollup is empty.
+    permission_classes = [IsSpaceManagerUser]
+    query_budget = 10
+
+    @lazy_schema
+    def get(self, request):
+        if get_space_manager_id(request.user) is None:
+            return Response({"error": "You are not authorized to view this report."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        try:
+            date_from, date_to = (
+                timezone.datetime.strptime(params[name], '%Y-%m-%d').date() if params.get(name) else None
+                for name in ('date_from', 'date_to')
+            )
+        except ValueError:
+            return Response({"error": "Dates must be in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+        if date_from and date_to and date_from > date_to:
+            return Response({"error": "date_from must be on or before date_to."}, status=status.HTTP_400_BAD_REQUEST)
+        space_type = params.get('space_type')
+        if space_type and space_type not in dict(Space.SPACE_TYPES):
+            return Response({"error": "Invalid space type."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(demand_report(date_from, date_to, space_type), status=status.HTTP_200_OK)
+
+
+@lazy_schema
 class ReservationDecisionView(APIView):
     permission_classes = [IsSpaceManagerUser]
 
-    @extend_schema(
-        description="Approve or reject a reservation request by space manager. If approved, an Event will be created.",
-        request=ReservationDecisionSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=ReservationListSerializer,
-                description="Reservation decision successfully applied."
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid request (e.g., already decided, not authorized).",
-                examples=[
-                    OpenApiExample(
-                        name="AlreadyDecided",
-                        value={"error": "This reservation has already been processed."}
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User not authenticated.",
-                examples=[OpenApiExample(name="Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not the manager of this space.",
-                examples=[OpenApiExample(name="Forbidden", value={"error": "You are not authorized to make a decision for this reservation."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation not found.",
-                examples=[OpenApiExample(name="NotFound", value={"error": "Reservation not found."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample(name="ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        }
-    )
+    @lazy_schema
     def post(self, request, reservation_id):
         reservation = get_object_or_404(Reservation, id=reservation_id)
 
@@ -1002,7 +508,13 @@ class ReservationDecisionView(APIView):
             context={'request': request, 'reservation': reservation}
         )
         serializer.is_valid(raise_exception=True)
-        updated_reservation = serializer.save()
+        try:
+            updated_reservation = serializer.save()
+        except DjangoValidationError as e:
+            RESERVATIONS_CONFLICTED.labels(reservation.reservation_type).inc()
+            return Response({"error": e.message if hasattr(e, "message") else e.messages[0]},
+                            status=status.HTTP_409_CONFLICT)
+        RESERVATIONS_DECIDED.labels(updated_reservation.status).inc()
 
         if updated_reservation.status == "approved":
             message = "Reservation approved successfully and added to events list."
@@ -1012,94 +524,13 @@ class ReservationDecisionView(APIView):
         return Response({"message": message}, status=status.HTTP_200_OK)
 
 
-@extend_schema(tags=['space'])
+@lazy_schema
 class SpaceDetailView(APIView):
+    authentication_classes = [StatelessRoleClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budget = 5
 
-    @extend_schema(
-        description="Retrieve the details of a specific space for the authenticated users.",
-        responses={
-            200: OpenApiResponse(
-                response=SpaceSerializer(),
-                description="Space details retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="success",
-                        value={
-                            "id": 1,
-                            "space_type": "string",
-                            "name": "string",
-                            "address": "string",
-                            "capacity": 50,
-                            "description": "string",
-                            "space_manager": {
-                                "id": 1,
-                                "first_name": "string",
-                                "last_name": "string",
-                                "username": "string",
-                                "email": "string@example.com"
-                            },
-                            "features": [
-                                {"id": 1, "name": "string"},
-                                {"id": 2, "name": "string"}
-                            ],
-                            "images": [
-                                {"id": 1, "url": "http://localhost:8000/media/space_photos/1.jpg"}
-                            ]
-                        }
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication credentials were not provided or are invalid.",
-                examples=[
-                    OpenApiExample(
-                        name="unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid space ID provided (e.g., negative or non-integer value).",
-                examples=[
-                    OpenApiExample(
-                        name="bad_request",
-                        value={"error": "Invalid space ID. Must be a positive integer."}
-                    ),
-                    OpenApiExample(
-                        name="NonInteger",
-                        value={"error": "Space ID must be an integer."}  # اگه `space_id` رشته باشه
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found with the given ID.",
-                examples=[
-                    OpenApiExample(
-                        name="not_found",
-                        value={"error": "Space with ID 10 not found."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="An unexpected internal server error occurred.",
-                examples=[
-                    OpenApiExample(
-                        name="internal_error",
-                        value={"error": "An unexpected error occurred. Please try again later."}
-                    ),
-                    OpenApiExample(
-                        name="DatabaseError",
-                        value={"error": "Failed to retrieve space details from database."}
-                    )
-                ]
-            )
-        }
-    )
+    @lazy_schema
     def get(self, request, space_id: int):
         try:
             if space_id <= 0:
@@ -1135,87 +566,20 @@ class SpaceDetailView(APIView):
             )
                         
 
-@extend_schema(tags=["space_manager"])
+@lazy_schema
 class ManagerSpaceListView(APIView):
     permission_classes = [IsSpaceManagerUser]
+    query_budget = 6
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name='space_type',
-                type=OpenApiTypes.STR,
-                location=OpenApiParameter.QUERY,
-                description='Filter spaces by type',
-                required=False,
-                enum=['hall', 'class', 'labratory', 'office']
-            ),
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=ManagerSpaceListSerializer(many=True),
-                description="Managed spaces retrieved successfully.",
-                examples=[OpenApiExample(
-                    "Example",
-                    value=[{
-                        "id": 3,
-                        "space_type": "string",
-                        "name": "string",
-                        "address": "string",
-                        "capacity": 50,
-                        "description": "string",
-                        "phone_number": "string",
-                        "first_image_url": "http://localhost:8000/media/space_photos/1.jpg"
-                    }]
-                )]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unauthorized – Authentication credentials were not provided.",
-                examples=[OpenApiExample(
-                    name="UnauthorizedExample",
-                    value={"error": "Authentication credentials were not provided."}
-                )]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Forbidden – User is not the manager of this space.",
-                examples=[OpenApiExample(
-                    name="ForbiddenExample",
-                    value={"error": "You are not a space manager."}
-                )]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Not Found – The requested space does not exist or is not managed by the user.",
-                examples=[OpenApiExample(
-                    name="NotFoundExample",
-                    value={"error": "No spaces managed by you."}
-                )]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample(
-                    name="ServerErrorExample",
-                    value={"error": "An unexpected error occurred."}
-                ),
-                OpenApiExample(
-                    name="DatabaseError",
-                    value={"error": "Failed to retrieve managed spaces from database."}
-                )]
-            )
-        },
-        description="List spaces managed by the authenticated space manager.",
-    )
+    @lazy_schema
     def get(self, request):
-        try:
-            manager = request.user.spacemanager
-        except Exception:
+        manager_id = get_space_manager_id(request.user)
+        if manager_id is None:
             return Response({"error": "You are not a space manager."}, status=status.HTTP_403_FORBIDDEN)
 
         space_type = request.query_params.get('space_type', None)
 
-        queryset = Space.objects.filter(space_manager=manager).prefetch_related("images").order_by("id")
+        queryset = Space.objects.filter(space_manager_id=manager_id).prefetch_related("images").order_by("id")
         
         if space_type:
             queryset = queryset.filter(space_type=space_type)
@@ -1227,90 +591,14 @@ class ManagerSpaceListView(APIView):
         return Response(data, status=status.HTTP_200_OK)
     
 
-@extend_schema(tags=["space_manager"])
+@lazy_schema
 class ManagerSpaceDetailView(APIView):
     permission_classes = [IsAuthenticated, IsSpaceManagerUser]
 
-    @extend_schema(
-        description="Retrieve details of a specific managed space by ID.",
-        responses={
-            200: OpenApiResponse(
-                response=ManagerSpaceDetailSerializer,
-                description="Space detail retrieved successfully.",
-                examples=[OpenApiExample(
-                    "Example",
-                    value={
-                        "id": 1,
-                        "space_type": "string",
-                        "name": "string",
-                        "address": "string",
-                        "capacity": 50,
-                        "description": "string",
-                        "features": [{"id": 1, "name": "string"}],
-                        "phone_number": "string",
-                        "images": [
-                            {"id": 1, "url": "http://localhost:8000/media/space_photos/1.jpg"}
-                        ]
-                    }
-                )]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unauthorized – Authentication credentials were not provided.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"error": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Forbidden – User is not a space manager.",
-                examples=[OpenApiExample(
-                    name="ForbiddenExample",
-                    value={"error": "You are not a space manager."}
-                )]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Not Found – The requested space does not exist or is not managed by the user.",
-                examples=[OpenApiExample(
-                    name="NotFoundExample",
-                    value={"error": "Space with ID 10 not found or not managed by you."}
-                )]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid space ID provided (e.g., negative or non-integer value).",
-                examples=[
-                    OpenApiExample(
-                        name="bad_request",
-                        value={"error": "Invalid space ID. Must be a positive integer."}
-                    ),
-                    OpenApiExample(
-                        name="NonInteger",
-                        value={"error": "Space ID must be an integer."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample(
-                    name="ServerErrorExample",
-                    value={"error": "An unexpected error occurred."}
-                ),
-                OpenApiExample(
-                    name="DatabaseError",
-                    value={"error": "Failed to retrieve space details from database."}
-                )]
-            )
-        }
-    )
+    @lazy_schema
     def get(self, request, space_id: int):
-        manager = getattr(request.user, 'spacemanager', None)
-        if not manager:
+        manager_id = get_space_manager_id(request.user)
+        if manager_id is None:
             return Response({"error": "You are not a space manager."}, status=status.HTTP_403_FORBIDDEN)
 
         try:
@@ -1324,7 +612,7 @@ class ManagerSpaceDetailView(APIView):
                 Space.objects
                 .prefetch_related("features", "images")
                 .select_related("space_manager", "space_manager__user"),
-                pk=space_id, space_manager=manager
+                pk=space_id, space_manager_id=manager_id
             )
             data = ManagerSpaceDetailSerializer(space, context={'request': request}).data
             return Response(data, status=status.HTTP_200_OK)
@@ -1341,211 +629,32 @@ class ManagerSpaceDetailView(APIView):
             )
                     
                     
-@extend_schema(tags=['space_manager'])
+@lazy_schema
 class ManagerSpaceCreateView(APIView):
     permission_classes = [IsSpaceManagerUser]
     parser_classes = [MultiPartParser, FormParser, JSONParser]  
 
-    @extend_schema(
-        description="Create a new space by authenticated space manager.",
-        request={
-            "multipart/form-data": SpaceCreateSerializer,
-            "application/json": SpaceCreateSerializer,
-        },
-        responses={
-            201: OpenApiResponse(
-                response=SpaceSerializer,
-                description="Space created successfully.",
-                examples=[OpenApiExample(
-                    "Success",
-                    value={
-                        "id": 1,
-                        "space_type": "string",
-                        "name": "string",
-                        "address": "string",
-                        "capacity": 50,
-                        "phone_number": "string",
-                        "description": "string",
-                        "features": [
-                            {"id": 1, "name": "string1"},
-                            {"id": 2, "name": "string2"}
-                        ]
-                    }
-                )]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Validation error.",
-                examples=[OpenApiExample(
-                    "BadRequest",
-                    value={"capacity": ["Capacity must be greater than zero."]}
-                ),
-                OpenApiExample(
-                    "MissingRequired",
-                    value={"space_type": ["This field is required."]}
-                ),
-                OpenApiExample(
-                    "InvalidFeatures",
-                    value={"features": ["Invalid pk '999' - object does not exist."]}
-                ),
-                OpenApiExample(
-                    "InvalidImages",
-                    value={"images": ["No file was submitted. Check the encoding type on the form."]}
-                ),
-                OpenApiExample(
-                    "InvalidFormat",
-                    value={"features": ["A valid list of integers or comma-separated string is required."]}
-                )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unauthorized.",
-                examples=[OpenApiExample(
-                    "Unauthorized",
-                    value={"error": "Authentication credentials were not provided."}
-                )]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Forbidden – User is not a space manager.",
-                examples=[OpenApiExample(
-                    "Forbidden",
-                    value={"error": "You are not authorized to create spaces."}
-                )]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Server error.",
-                examples=[OpenApiExample(
-                    "ServerError",
-                    value={"error": "An unexpected error occurred."}
-                ),
-                OpenApiExample(
-                    "DatabaseError",
-                    value={"error": "Failed to save space to database."}
-                ),
-                OpenApiExample(
-                    "ImageError",
-                    value={"error": "Failed to process uploaded images."}
-                )
-                ]
-            )
-        }
-    )
+    @lazy_schema
     def post(self, request):
         serializer = SpaceCreateSerializer(data=request.data, context={"request": request})
         try:
             serializer.is_valid(raise_exception=True)
             space = serializer.save()
-        except Exception as e:
+        except DRFValidationError as e:
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            print("Unexpected error:", str(e))
+        except Exception:
+            logger.exception("Could not create a space")
             return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response(SpaceSerializer(space, context={"request": request}).data, status=status.HTTP_201_CREATED)
 
 
-@extend_schema(tags=["space_manager"])
+@lazy_schema
 class ManagerSpaceUpdateView(APIView):
     permission_classes = [IsSpaceManagerUser]
     parser_classes = [MultiPartParser, FormParser]
 
-    @extend_schema(
-        description="Partially update a space managed by the authenticated manager.",
-        request=SpaceUpdateSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=SpaceSerializer,
-                description="Space updated successfully.",
-                examples=[OpenApiExample(
-                    "Success",
-                    value={
-                        "id": 1,
-                        "space_type": "string",
-                        "name": "string",
-                        "address": "string",
-                        "capacity": 50,
-                        "phone_number": "09123456789",
-                        "description": "string",
-                        "features": [
-                            {"id": 1, "name": "string1"},
-                            {"id": 2, "name": "string2"}
-                        ],
-                        "images": [
-                            {"id": 1, "url": "/media/space_photos/1.jpg"},
-                            {"id": 2, "url": "/media/space_photos/2.jpg"}
-                        ]
-                    }
-                )]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Validation error.",
-                examples=[
-                    OpenApiExample(
-                        "CapacityError",
-                        value={"capacity": ["Capacity must be greater than zero."]}
-                    ),
-                    OpenApiExample(
-                        "InvalidFeatureError",
-                        value={"features": ["Invalid pk '999' - object does not exist."]}
-                    ),
-                    OpenApiExample(
-                        "MissingRequired",
-                        value={"space_type": ["This field is required."]}
-                    ),
-                    OpenApiExample(
-                        "InvalidImages",
-                        value={"images": ["No file was submitted. Check the encoding type on the form."]}
-                    ),
-                    OpenApiExample(
-                        "InvalidFormat",
-                        value={"features": ["A valid list of integers or comma-separated string is required."]}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Forbidden – Not space manager of this space.",
-                examples=[
-                    OpenApiExample(
-                        "ForbiddenExample",
-                        value={"error": "You are not authorized to update this space."}
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found.",
-                examples=[
-                    OpenApiExample(
-                        "NotFoundExample",
-                        value={"error": "Space with ID 77 not found."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[
-                    OpenApiExample(
-                        "ServerErrorExample",
-                        value={"error": "An unexpected error occurred."}
-                    ),
-                    OpenApiExample(
-                        "DatabaseError",
-                        value={"error": "Failed to update space in database."}
-                    ),
-                    OpenApiExample(
-                        "ImageError",
-                        value={"error": "Failed to process uploaded images."}
-                    )
-                ]
-            ),
-        }
-    )
+    @lazy_schema
     def put(self, request, space_id):
         try:
             space = Space.objects.select_related("space_manager__user").get(id=space_id)
@@ -1568,89 +677,29 @@ class ManagerSpaceUpdateView(APIView):
         return Response(SpaceSerializer(updated_space, context={"request": request}).data, status=status.HTTP_200_OK)
         
 
-@extend_schema(tags=['reservation'])
+@lazy_schema
 class ScheduleAvailabilityView(APIView):
     permission_classes = [IsAuthenticated]  
+    query_budget = 6
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name='date',
-                type=OpenApiTypes.DATE,
-                location=OpenApiParameter.QUERY,
-                description='The date to check available hours (YYYY-MM-DD)',
-                required=True,
-            ),
-            OpenApiParameter(
-                name='space_id',
-                type=OpenApiTypes.INT,
-                location=OpenApiParameter.QUERY,
-                description='The ID of the space to check availability for',
-                required=True,
-            ),
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=ScheduleAvailabilitySerializer(many=True),
-                description="List of available hours for the specified date and space.",
-                examples=[
-                    OpenApiExample(
-                        name="Success",
-                        value=[
-                            {"hour_code": 1, "time_range": "7:00-8:00", "is_locked": False},
-                            {"hour_code": 2, "time_range": "8:00-9:00", "is_locked": True},
-                        ]
-                    )
-                ]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid date or space ID format.",
-                examples=[
-                    OpenApiExample(
-                        name="BadRequest",
-                        value={"error": "Date must be in YYYY-MM-DD format."}
-                    ),
-                    OpenApiExample(
-                        name="InvalidSpaceId",
-                        value={"error": "Invalid space ID."}
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication credentials were not provided.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"error": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found.",
-                examples=[
-                    OpenApiExample(
-                        name="NotFound",
-                        value={"error": "Space with ID 10 not found."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred."}
-                    )
-                ]
-            )
-        },
-        description="Retrieve the list of available hours for a specific date and space."
-    )
+    @lazy_schema
     def get(self, request):
+        params = self.parse_params(request)
+        if isinstance(params, Response):
+            return params
+        date, space_id, exclude_res_id = params
+
+        space = Space.objects.filter(id=space_id).first()
+        if not space:
+            return Response({"error": f"Space with ID {space_id} not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        locked_codes = set()
+        for sch in self.locked_schedules(space, date, exclude_res_id):
+            locked_codes.update(range(sch.start_hour_code_id, sch.end_hour_code_id + 1))
+
+        return self.availability_response(hour_slots(), locked_codes)
+
+    def parse_params(self, request):
         date_str = request.query_params.get('date')
         space_id = request.query_params.get('space_id')
         exclude_res_id = request.query_params.get('exclude_reservation_id')
@@ -1665,16 +714,14 @@ class ScheduleAvailabilityView(APIView):
                 return Response({"error": "Invalid space ID."}, status=status.HTTP_400_BAD_REQUEST)
         except (ValueError, TypeError):
             return Response({"error": "Date must be in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+        return date, space_id, exclude_res_id
 
-        space = Space.objects.filter(id=space_id).first()
-        if not space:
-            return Response({"error": f"Space with ID {space_id} not found."}, status=status.HTTP_404_NOT_FOUND)
-
+    def locked_schedules(self, space, date, exclude_res_id):
         qs = (
             Schedule.objects
             .filter(space=space, date=date)
             .filter(Q(event_instance__isnull=False) | Q(reservation_instance__status='approved'))
-            .select_related('start_hour_code', 'end_hour_code')
+            .only('start_hour_code', 'end_hour_code')
         )
 
         if exclude_res_id:
@@ -1683,157 +730,66 @@ class ScheduleAvailabilityView(APIView):
                 qs = qs.exclude(reservation_instance__id=exclude_res_id)
             except (TypeError, ValueError):
                 pass  
+        return qs
 
-        locked_codes = set()
-        for sch in qs:
-            start = sch.start_hour_code.code
-            end = sch.end_hour_code.code
-            locked_codes.update(range(start, end + 1))
-
-        hour_slots = HourSlot.objects.all() 
+    def availability_response(self, slots, locked_codes):
         payload = [{
             "hour_code": slot.code,
             "time_range": slot.time_range,
             "is_locked": (slot.code in locked_codes),
-        } for slot in hour_slots]
+        } for slot in slots]
 
         serializer = ScheduleAvailabilitySerializer(payload, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     
-@extend_schema(tags=['space_manager'])
+@lazy_schema
 class ReservationDetailView(APIView):
     permission_classes = [IsSpaceManagerUser]
+    query_budget = 6
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name="reservation_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-            )
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=ReservationDetailSerializer,
-                description="Reservation details retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        "Success",
-                        value={
-                            "id": 5,
-                            "reservation_type": "event",
-                            "reservee_type": "student",
-                            "reservee_name": "string",
-                            "phone_number": "09123456789",
-                            "description": "string",
-                            "status": "under_review",
-                            "manager_comment": None,
-                            "space_name": "string",
-                            "schedule_date": "2025-09-01",
-                            "start_time": "10:00:00",
-                            "end_time": "12:00:00",
-                            "hosting_association": "string",
-                            "hosting_organizations": "string",
-                            "responsible_organizer": "string",
-                            "position": "Professor"
-                        }
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User not authenticated.",
-                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Forbidden – Reservation does not belong to a space managed by this user.",
-                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to view this reservation."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Reservation not found.",
-                examples=[OpenApiExample("NotFound", value={"error": "Reservation with this ID does not exist."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Internal server error.",
-                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        },
-        description="Retrieve detailed information of a specific reservation by its ID. Only accessible to the space manager of that reservation's space."
-    )
+    @lazy_schema
     def get(self, request, reservation_id):
         try:
-            reservation = get_object_or_404(Reservation, id=reservation_id)
+            reservation = get_object_or_404(
+                Reservation.objects
+                .select_related(
+                    "space__space_manager",
+                    "schedule",
+                    "student__user", "staff",
+                )
+                .prefetch_related("space__features", "space__images"),
+                id=reservation_id,
+            )
 
-            if not request.user.is_authenticated or not hasattr(request.user, 'spacemanager'):
+            space_manager_id = get_space_manager_id(request.user)
+            if space_manager_id is None:
                 return Response({"error": "Authentication required."}, status=status.HTTP_401_UNAUTHORIZED)
 
-            if reservation.space.space_manager != request.user.spacemanager:
+            if reservation.space.space_manager_id != space_manager_id:
                 return Response({"error": "You are not authorized to view this reservation."}, status=status.HTTP_403_FORBIDDEN)
 
             serializer = ReservationDetailSerializer(reservation)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
-        except Reservation.DoesNotExist:
+        except (Reservation.DoesNotExist, Http404):
             return Response({"error": "Reservation with this ID does not exist."}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            print("Unexpected error:", str(e))
+        except Exception:
+            logger.exception("Could not load reservation %s", reservation_id)
             return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     
-@extend_schema(tags=['space_manager'])
+@lazy_schema
 class ManagerSpaceDeleteView(APIView):
     permission_classes = [IsSpaceManagerUser]   
     
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name="space_id",
-                required=True,
-                type=int,
-                location=OpenApiParameter.PATH,
-            )
-        ],
-        responses={
-            200:OpenApiResponse(
-            response=None,
-                description="Space deleted successfully.",
-                examples=[OpenApiExample("Deleted", value={"message": "Space deleted successfully."})]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unauthorized.",
-                examples=[OpenApiExample("Unauthorized", value={"detail": "Authentication credentials were not provided."})]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Forbidden – Not the manager of this space.",
-                examples=[OpenApiExample("Forbidden", value={"error": "You are not authorized to delete this space."})]
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Space not found.",
-                examples=[OpenApiExample("NotFound", value={"error": "Space not found."})]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Unexpected server error.",
-                examples=[OpenApiExample("ServerError", value={"error": "An unexpected error occurred."})]
-            ),
-        },
-        description=(
-            "Delete a space owned by the authenticated space manager. "
-        ),
-    )
+    @lazy_schema
     def delete(self, request, space_id):
         try:
             space = get_object_or_404(Space, id=space_id)
 
-            if not hasattr(request.user, "spacemanager") or space.space_manager != request.user.spacemanager:
+            space_manager_id = get_space_manager_id(request.user)
+            if space_manager_id is None or space.space_manager_id != space_manager_id:
                 return Response({"error": "You are not authorized to delete this space."},
                                 status=status.HTTP_403_FORBIDDEN)
 
@@ -1845,4 +801,54 @@ class ManagerSpaceDeleteView(APIView):
         except Space.DoesNotExist:
             return Response({"error": "Space not found."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Async variants of the high-fan-out read endpoints, routed instead of the sync views
+# when ASYNC_READ_VIEWS is on. Rows are fetched with the async ORM; serialization runs
+# in a worker thread because the serializers may still touch lazy relations.
+
+class AsyncSpaceListView(AsyncAPIView, SpaceListView):
+    async def get(self, request):
+        spaces = [space async for space in self.get_queryset(request)]
+        if not spaces:
+            return Response({"error": "No spaces available."}, status=status.HTTP_404_NOT_FOUND)
+
+        data = await sync_to_async(
+            lambda: SpaceListSerializer(spaces, many=True, context={'request': request}).data
+        )()
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AsyncEventListView(AsyncAPIView, EventListView):
+    async def get(self, request):
+        try:
+            events = [event async for event in self.get_queryset()]
+            if not events:
+                return Response({"error": "No events available."}, status=status.HTTP_404_NOT_FOUND)
+
+            data = await sync_to_async(
+                lambda: EventSerializer(events, many=True, context={"request": request}).data
+            )()
+            return Response(data, status=status.HTTP_200_OK)
+        except Exception:
+            return Response({"error": "An unexpected server error occurred."},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncScheduleAvailabilityView(AsyncAPIView, ScheduleAvailabilityView):
+    async def get(self, request):
+        params = self.parse_params(request)
+        if isinstance(params, Response):
+            return params
+        date, space_id, exclude_res_id = params
+
+        space = await Space.objects.filter(id=space_id).afirst()
+        if not space:
+            return Response({"error": f"Space with ID {space_id} not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        locked_codes = set()
+        async for sch in self.locked_schedules(space, date, exclude_res_id):
+            locked_codes.update(range(sch.start_hour_code_id, sch.end_hour_code_id + 1))
+
+        return self.availability_response(await ahour_slots(), locked_codes)
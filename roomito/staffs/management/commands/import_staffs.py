@@ -1,10 +1,19 @@
+import django
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
-from django.core.validators import EmailValidator, ValidationError as DjangoValidationError
 from django.db import transaction
-from openpyxl import load_workbook
+from common.tabular import INPUT_FORMATS, read_records
 from staffs.models import Staff
-import re
+from staffs.normalization import (
+    clean_name,
+    normalize_batch,
+    normalize_username_from_email,
+    pick_best_email,
+)
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import json
+import time
 
 
 HEADER_MAPS = [
@@ -12,102 +21,89 @@ HEADER_MAPS = [
     {"first_name": "نام", "last_name": "نام خانوادگی", "email": "ایمیل"},
 ]
 
-_email_validator = EmailValidator()
 
-AT_PATTERNS = [
-    r"\s*\[\s*at\s*\]\s*", r"\s*\(\s*at\s*\)\s*", r"\s*\{\s*at\s*\}\s*",
-    r"\s+at\s+", r"\sat\s", r" at ",
-]
-DOT_PATTERNS = [
-    r"\s*\[\s*dot\s*\]\s*", r"\s*\(\s*dot\s*\)\s*", r"\s*\{\s*dot\s*\}\s*",
-    r"\s+dot\s+", r"\sdot\s", r" dot ",
-    r"\s*\[\s*\.\s*\]\s*", r"\s*\(\s*\.\s*\)\s*", r"\s*\{\s*\.\s*\}\s*",
-]
-
-SPLIT_REGEX = re.compile(r"[,\;/\s]+")
-
-CLEAN_CHARS_REGEX = re.compile(r"[^a-zA-Z0-9._%+\-@]+")
-
-def normalize_raw_email(raw: str) -> str | None:
-    if not raw:
-        return None
-    s = str(raw).strip()
-
-    if not s:
-        return None
-
-    s = s.replace("＠", "@")
-
-    low = s.lower()
-
-    for pat in AT_PATTERNS:
-        low = re.sub(pat, "@", low, flags=re.IGNORECASE)
+class StaffImportPlan:
+    """In-memory view of existing staff emails and usernames used by --bulk and --dry-run."""
 
-    for pat in DOT_PATTERNS:
-        low = re.sub(pat, ".", low, flags=re.IGNORECASE)
+    def __init__(self, update_existing: bool):
+        self.update_existing = update_existing
+        self.staff_by_email = {}
+        self.taken_usernames = set()
 
-    low = low.replace("[at]", "@").replace("(at)", "@").replace("{at}", "@")
-    low = low.replace("[dot]", ".").replace("(dot)", ".").replace("{dot}", ".")
+    def load(self):
+        for staff in Staff.objects.only("id", "first_name", "last_name", "email", "user_id").order_by("pk").iterator():
+            self.staff_by_email.setdefault((staff.email or "").lower(), staff)
+        self.taken_usernames = set(User.objects.values_list("username", flat=True).iterator())
 
-    low = re.sub(r"\s*@\s*", "@", low)
-    low = re.sub(r"\s*\.\s*", ".", low)
+    def resolve(self, normalized: dict) -> dict:
+        first_name = normalized["first_name"]
+        last_name  = normalized["last_name"]
+        email_cell = normalized["email_cell"]
 
-    low = CLEAN_CHARS_REGEX.sub("", low)
+        best_email = normalized["best_email"]
+        if not best_email:
+            return {"action": "skip", "reason": "invalid_email", "email": email_cell}
 
-    if low.count("@") > 1:
-        first = low.split("@", 1)
-        right = first[1].replace("@", "")
-        low = first[0] + "@" + right
+        staff = self.staff_by_email.get(best_email)
 
-    return low or None
+        if staff:
+            if not self.update_existing:
+                return {"action": "skip", "reason": "exists", "email": best_email, "staff_id": staff.pk}
 
+            changes = {}
+            for field, value in (("first_name", first_name), ("last_name", last_name), ("email", best_email)):
+                if value and getattr(staff, field) != value:
+                    changes[field] = [getattr(staff, field), value]
+                    setattr(staff, field, value)
+            return {"action": "update", "email": best_email, "staff_id": staff.pk, "changes": changes, "staff": staff}
 
-def pick_best_email(candidate_field: str) -> str | None:
-    
-    if not candidate_field:
-        return None
+        username = normalize_username_from_email(best_email) or f"user_{best_email.split('@')[0]}"
 
-    parts = [p for p in SPLIT_REGEX.split(candidate_field) if p]
-    normalized_valids = []
-
-    for part in parts:
-        norm = normalize_raw_email(part)
-        if not norm:
-            continue
-        try:
-            _email_validator(norm)
-            normalized_valids.append(norm)
-        except DjangoValidationError:
-            continue
-
-    if not normalized_valids:
-        return None
-
-    def score(email: str) -> tuple:
-        domain = email.split("@")[-1].lower()
-        if domain.endswith("ui.ac.ir"):
-            return (0, email)
-        if domain.endswith(".ac.ir"):
-            return (1, email)
-        return (2, email)
-
-    normalized_valids.sort(key=score)
-    return normalized_valids[0]
+        base_username = username
+        suf = 1
+        while username in self.taken_usernames:
+            suf += 1
+            username = f"{base_username}{suf}"
+        self.taken_usernames.add(username)
 
+        user = User(
+            username=username,
+            email=best_email,
+            first_name=first_name,
+            last_name=last_name,
+        )
+        user.set_unusable_password()
+
+        staff = Staff(
+            user=None,
+            first_name=first_name,
+            last_name=last_name,
+            email=best_email,
+            is_registered=False,
+        )
+        self.staff_by_email[best_email] = staff
+        return {"action": "create", "email": best_email, "username": username, "user": user, "staff": staff}
 
-def normalize_username_from_email(email: str) -> str | None:
-    if not email or "@" not in email:
-        return None
-    base = email.split("@")[0].lower()
-    base = re.sub(r"[^a-z0-9._-]+", "", base)
-    return base or None
+    def forget(self, staffs, users):
+        """Undo resolve() for rows whose chunk rolled back, so later rows can reuse their emails and usernames."""
+        for staff in staffs:
+            if self.staff_by_email.get(staff.email) is staff:
+                del self.staff_by_email[staff.email]
+        for user in users:
+            self.taken_usernames.discard(user.username)
 
 
 class Command(BaseCommand):
-    help = "Import staffs from an Excel file (.xlsx). Example: manage.py import_staffs /path/to/file.xlsx [--update] [--sheet Sheet1]"
+    help = (
+        "Import staffs from an Excel (.xlsx), CSV or NDJSON file. Example: manage.py import_staffs /path/to/file.xlsx "
+        "[--update] [--sheet Sheet1] [--format csv] [--bulk] [--batch-size 1000] [--workers 4] "
+        "[--dry-run] [--report report.ndjson]"
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument("xlsx_path", type=str, help="Path to .xlsx file (container path if using Docker)")
+        # Still named xlsx_path, for callers passing it to call_command() by keyword.
+        parser.add_argument("xlsx_path", metavar="path", type=str,
+                            help="Path to .xlsx/.csv/.ndjson file (container path if using Docker)")
         parser.add_argument(
             "--update",
             action="store_true",
@@ -117,57 +113,82 @@ class Command(BaseCommand):
             "--sheet",
             type=str,
             default=None,
-            help="Optional sheet name. If omitted, the first sheet will be used."
+            help="Optional sheet name (.xlsx only). If omitted, the first sheet will be used."
+        )
+        parser.add_argument(
+            "--format",
+            choices=INPUT_FORMATS,
+            default=None,
+            help="Input format. If omitted, it is inferred from the file extension."
+        )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Resolve existing emails/usernames in memory and write with bulk_create/bulk_update in chunks."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per chunk (and per transaction) in --bulk mode."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Read the whole file, then normalize emails in batches of --batch-size across N processes "
+                 "(requires --bulk or --dry-run)."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not write anything; stream one NDJSON line per row describing what would be created, updated or skipped."
+        )
+        parser.add_argument(
+            "--report",
+            type=str,
+            default="-",
+            help="Where to write the --dry-run NDJSON report ('-' for stdout)."
         )
 
-    @transaction.atomic
     def handle(self, *args, **options):
         path = options["xlsx_path"]
         update_existing = options["update"]
-        sheet_name = options["sheet"]
-
-        try:
-            wb = load_workbook(filename=path, read_only=True, data_only=True)
-        except Exception as e:
-            raise CommandError(f"Cannot open Excel file: {e}")
-
-        try:
-            ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
-        except Exception as e:
-            raise CommandError(f"Cannot open worksheet: {e}")
-
-        headers = []
-        for cell in ws[1]:
-            v = cell.value
-            headers.append((v.strip() if isinstance(v, str) else v))
-
-        header_map = None
-        for m in HEADER_MAPS:
-            if all(mv in headers for mv in m.values()):
-                header_map = m
-                break
-
-        if not header_map:
-            raise CommandError(
-                f"Cannot detect headers. Got: {headers}\n"
-                f"Expected one of maps like: {HEADER_MAPS}"
-            )
-
-        idx = {key: headers.index(colname) for key, colname in header_map.items()}
-
+        batch_size = options["batch_size"]
+        workers = options["workers"]
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        if workers < 0:
+            raise CommandError("--workers must be zero or a positive integer.")
+        if workers and not (options["bulk"] or options["dry_run"]):
+            raise CommandError("--workers requires --bulk or --dry-run.")
+
+        records = read_records(path, options["format"], HEADER_MAPS, sheet_name=options["sheet"])
+
+        if options["dry_run"] or options["bulk"]:
+            timings = {}
+            rows = self._normalized_rows(records, workers, batch_size, timings)
+            if options["dry_run"]:
+                self._dry_run(rows, update_existing, options["report"], timings)
+            else:
+                self._import_bulk(rows, update_existing, batch_size, timings)
+            self.stderr.write("Stages: " + ", ".join(f"{name}={secs:.2f}s" for name, secs in timings.items()))
+        else:
+            with transaction.atomic():
+                self._import_rows(records, update_existing)
+
+    def _import_rows(self, records, update_existing):
         created, updated, skipped, errors = 0, 0, 0, 0
-        row_no = 1
 
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_no += 1
+        for row_no, record in records:
             try:
-                raw_first_name = row[idx["first_name"]]
-                raw_last_name  = row[idx["last_name"]]
-                raw_email      = row[idx["email"]]
+                if isinstance(record, Exception):
+                    raise record
 
-                first_name = (raw_first_name or "").strip() if isinstance(raw_first_name, str) else (str(raw_first_name).strip() if raw_first_name else "")
-                last_name  = (raw_last_name or "").strip() if isinstance(raw_last_name, str) else (str(raw_last_name).strip() if raw_last_name else "")
-                email_cell = (raw_email or "").strip()
+                first_name = clean_name(record["first_name"])
+                last_name  = clean_name(record["last_name"])
+                email_cell = (record["email"] or "").strip()
 
                 best_email = pick_best_email(email_cell)
                 if not best_email:
@@ -216,7 +237,7 @@ class Command(BaseCommand):
                 user.save()
 
                 Staff.objects.create(
-                    user=None,  
+                    user=None,
                     first_name=first_name,
                     last_name=last_name,
                     email=best_email,
@@ -231,3 +252,171 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(
             f"Done. created={created}, updated={updated}, skipped={skipped}, errors={errors}"
         ))
+
+    def _normalized_rows(self, records, workers, batch_size, timings):
+        timings.setdefault("read", 0.0)
+        timings.setdefault("normalize", 0.0)
+
+        if workers:
+            started = time.perf_counter()
+            batches = []
+            while batch := list(islice(records, batch_size)):
+                batches.append(batch)
+            parsed = time.perf_counter()
+            # Workers started with spawn import Django afresh; setting it up keeps the normalizers'
+            # use of django.core.validators independent of the start method.
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+                results = list(pool.map(normalize_batch, batches))
+            timings["read"] += parsed - started
+            timings["normalize"] += time.perf_counter() - parsed
+            return (item for batch in results for item in batch)
+
+        def stream():
+            while True:
+                started = time.perf_counter()
+                item = next(records, None)
+                parsed = time.perf_counter()
+                timings["read"] += parsed - started
+                if item is None:
+                    return
+                normalized = normalize_batch([item])[0]
+                timings["normalize"] += time.perf_counter() - parsed
+                yield normalized
+
+        return stream()
+
+    def _import_bulk(self, rows_in, update_existing, batch_size, timings):
+        started = time.perf_counter()
+
+        plan = StaffImportPlan(update_existing)
+        plan.load()
+
+        loaded = time.perf_counter()
+        timings["load"] = loaded - started
+        timings["write"] = 0.0
+        self.stdout.write(
+            f"Loaded {len(plan.staff_by_email)} staff emails and {len(plan.taken_usernames)} usernames in {loaded - started:.2f}s"
+        )
+
+        created, updated, skipped, errors = 0, 0, 0, 0
+        chunks = 0
+        rows = 0
+        pending_users, pending_staffs, dirty_staffs = [], [], {}
+        chunk_created, chunk_updated = 0, 0
+        row_no = 0
+
+        def flush():
+            nonlocal created, updated, errors, chunks, chunk_created, chunk_updated
+            if not chunk_created and not chunk_updated:
+                return
+            flush_started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create(pending_users, batch_size=batch_size)
+                    Staff.objects.bulk_create(pending_staffs, batch_size=batch_size)
+                    if dirty_staffs:
+                        Staff.objects.bulk_update(
+                            list(dirty_staffs.values()), ["first_name", "last_name", "email"], batch_size=batch_size
+                        )
+                        linked_users = [
+                            User(pk=s.user_id, first_name=s.first_name, last_name=s.last_name, email=s.email)
+                            for s in dirty_staffs.values() if s.user_id
+                        ]
+                        User.objects.bulk_update(linked_users, ["first_name", "last_name", "email"], batch_size=batch_size)
+            except Exception as e:
+                errors += chunk_created + chunk_updated
+                plan.forget(pending_staffs, pending_users)
+                self.stdout.write(self.style.ERROR(f"Chunk ending at row {row_no}: error -> {e}"))
+            else:
+                created += chunk_created
+                updated += chunk_updated
+                chunks += 1
+            chunk_created, chunk_updated = 0, 0
+            pending_users.clear()
+            pending_staffs.clear()
+            dirty_staffs.clear()
+            timings["write"] += time.perf_counter() - flush_started
+
+        timings["plan"] = 0.0
+        for row_no, record in rows_in:
+            if chunk_created + chunk_updated >= batch_size:
+                flush()
+
+            rows += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+
+                resolving = time.perf_counter()
+                entry = plan.resolve(record)
+                timings["plan"] += time.perf_counter() - resolving
+
+                if entry["action"] == "skip":
+                    skipped += 1
+                    if entry["reason"] == "invalid_email":
+                        self.stdout.write(self.style.WARNING(f"Row {row_no}: invalid email '{entry['email']}' -> skipped"))
+                elif entry["action"] == "update":
+                    # Rows created earlier in this run are written by bulk_create with the new values.
+                    staff = entry["staff"]
+                    if staff.pk:
+                        dirty_staffs[staff.pk] = staff
+                    chunk_updated += 1
+                else:
+                    pending_users.append(entry["user"])
+                    pending_staffs.append(entry["staff"])
+                    chunk_created += 1
+
+            except Exception as e:
+                errors += 1
+                self.stdout.write(self.style.ERROR(f"Row {row_no}: error -> {e}"))
+
+        flush()
+
+        elapsed = sum(timings.values())
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. created={created}, updated={updated}, skipped={skipped}, errors={errors}"
+        ))
+        self.stdout.write(
+            f"Processed {rows} rows in {elapsed:.2f}s ({rate:.0f} rows/s, {chunks} chunk(s) of up to {batch_size} rows)"
+        )
+
+    def _dry_run(self, rows_in, update_existing, report_path, timings):
+        started = time.perf_counter()
+
+        plan = StaffImportPlan(update_existing)
+        plan.load()
+
+        loaded = time.perf_counter()
+        timings["load"] = loaded - started
+
+        counts = {"create": 0, "update": 0, "skip": 0, "error": 0}
+        out = self.stdout if report_path == "-" else open(report_path, "w", encoding="utf-8")
+
+        try:
+            timings["plan"] = 0.0
+            for row_no, record in rows_in:
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    resolving = time.perf_counter()
+                    entry = plan.resolve(record)
+                    timings["plan"] += time.perf_counter() - resolving
+                    entry.pop("staff", None)
+                    entry.pop("user", None)
+                except Exception as e:
+                    entry = {"action": "error", "error": str(e)}
+
+                counts[entry["action"]] += 1
+                out.write(json.dumps({"row": row_no, **entry}, ensure_ascii=False) + "\n")
+
+            finished = time.perf_counter()
+            out.write(json.dumps({"summary": {**counts, "elapsed_seconds": round(finished - started, 3)}}) + "\n")
+        finally:
+            if out is not self.stdout:
+                out.close()
+
+        self.stderr.write(
+            f"Dry run. would create={counts['create']}, update={counts['update']}, "
+            f"skip={counts['skip']}, errors={counts['error']}"
+        )
@@ -0,0 +1,138 @@
+from django.core.validators import EmailValidator, ValidationError as DjangoValidationError
+import re
+
+
+_email_validator = EmailValidator()
+
+AT_PATTERNS = [
+    r"\s*\[\s*at\s*\]\s*", r"\s*\(\s*at\s*\)\s*", r"\s*\{\s*at\s*\}\s*",
+    r"\s+at\s+", r"\sat\s", r" at ",
+]
+DOT_PATTERNS = [
+    r"\s*\[\s*dot\s*\]\s*", r"\s*\(\s*dot\s*\)\s*", r"\s*\{\s*dot\s*\}\s*",
+    r"\s+dot\s+", r"\sdot\s", r" dot ",
+    r"\s*\[\s*\.\s*\]\s*", r"\s*\(\s*\.\s*\)\s*", r"\s*\{\s*\.\s*\}\s*",
+]
+
+AT_REGEXES = [re.compile(pat, re.IGNORECASE) for pat in AT_PATTERNS]
+DOT_REGEXES = [re.compile(pat, re.IGNORECASE) for pat in DOT_PATTERNS]
+
+SPLIT_REGEX = re.compile(r"[,\;/\s]+")
+
+CLEAN_CHARS_REGEX = re.compile(r"[^a-zA-Z0-9._%+\-@]+")
+
+AT_SPACING_REGEX = re.compile(r"\s*@\s*")
+DOT_SPACING_REGEX = re.compile(r"\s*\.\s*")
+
+USERNAME_CLEAN_REGEX = re.compile(r"[^a-z0-9._-]+")
+
+def normalize_raw_email(raw: str) -> str | None:
+    if not raw:
+        return None
+    s = str(raw).strip()
+
+    if not s:
+        return None
+
+    s = s.replace("＠", "@")
+
+    low = s.lower()
+
+    # Every AT pattern needs a literal "at" and every DOT pattern a "dot" or
+    # a bracketed ".", so most clean addresses skip the substitution passes.
+    if "at" in low:
+        for rx in AT_REGEXES:
+            low = rx.sub("@", low)
+
+    if "dot" in low or "[" in low or "(" in low or "{" in low:
+        for rx in DOT_REGEXES:
+            low = rx.sub(".", low)
+
+    low = low.replace("[at]", "@").replace("(at)", "@").replace("{at}", "@")
+    low = low.replace("[dot]", ".").replace("(dot)", ".").replace("{dot}", ".")
+
+    low = AT_SPACING_REGEX.sub("@", low)
+    low = DOT_SPACING_REGEX.sub(".", low)
+
+    low = CLEAN_CHARS_REGEX.sub("", low)
+
+    if low.count("@") > 1:
+        first = low.split("@", 1)
+        right = first[1].replace("@", "")
+        low = first[0] + "@" + right
+
+    return low or None
+
+
+def _email_score(email: str) -> tuple:
+    domain = email.split("@")[-1].lower()
+    if domain.endswith("ui.ac.ir"):
+        return (0, email)
+    if domain.endswith(".ac.ir"):
+        return (1, email)
+    return (2, email)
+
+
+def pick_best_email(candidate_field: str) -> str | None:
+
+    if not candidate_field:
+        return None
+
+    parts = [p for p in SPLIT_REGEX.split(candidate_field) if p]
+    normalized_valids = []
+
+    for part in parts:
+        norm = normalize_raw_email(part)
+        if not norm:
+            continue
+        try:
+            _email_validator(norm)
+            normalized_valids.append(norm)
+        except DjangoValidationError:
+            continue
+
+    if not normalized_valids:
+        return None
+
+    return min(normalized_valids, key=_email_score)
+
+
+def normalize_username_from_email(email: str) -> str | None:
+    if not email or "@" not in email:
+        return None
+    base = email.split("@")[0].lower()
+    base = USERNAME_CLEAN_REGEX.sub("", base)
+    return base or None
+
+
+def clean_name(raw) -> str:
+    if isinstance(raw, str):
+        return raw.strip()
+    return str(raw).strip() if raw else ""
+
+
+def normalize_record(record: dict) -> dict:
+    first_name = clean_name(record["first_name"])
+    last_name  = clean_name(record["last_name"])
+    email_cell = (record["email"] or "").strip()
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email_cell": email_cell,
+        "best_email": pick_best_email(email_cell),
+    }
+
+
+def normalize_batch(batch: list) -> list:
+    # Runs in worker processes. Only uses Django's EmailValidator, and import_staffs sets Django
+    # up in each worker, so it also works with the spawn start method.
+    out = []
+    for row_no, record in batch:
+        if isinstance(record, Exception):
+            out.append((row_no, record))
+            continue
+        try:
+            out.append((row_no, normalize_record(record)))
+        except Exception as e:
+            out.append((row_no, e))
+    return out
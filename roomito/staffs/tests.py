@@ -1,3 +1,65 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from common.tabular import read_records
+from staffs.management.commands.import_staffs import HEADER_MAPS, StaffImportPlan
+
+
+def normalized(email, first_name="Sara", last_name="Ahmadi"):
+    return {"first_name": first_name, "last_name": last_name, "email_cell": email, "best_email": email}
+
+
+class StaffImportPlanTests(TestCase):
+    def test_new_rows_get_unique_usernames(self):
+        User.objects.create_user(username="sara.ahmadi", email="other@uni.ac.ir")
+        plan = StaffImportPlan(update_existing=False)
+        plan.load()
+
+        first = plan.resolve(normalized("sara.ahmadi@uni.ac.ir"))
+        second = plan.resolve(normalized("sara.ahmadi@staff.uni.ac.ir"))
+
+        self.assertEqual(first["action"], "create")
+        self.assertNotEqual(first["username"], "sara.ahmadi")
+        self.assertNotEqual(first["username"], second["username"])
+
+    def test_forget_releases_emails_and_usernames_of_a_rolled_back_chunk(self):
+        plan = StaffImportPlan(update_existing=False)
+        plan.load()
+        entry = plan.resolve(normalized("reza.karimi@uni.ac.ir"))
+
+        plan.forget([entry["staff"]], [entry["user"]])
+        retried = plan.resolve(normalized("reza.karimi@uni.ac.ir"))
+
+        self.assertEqual(retried["action"], "create")
+        self.assertEqual(retried["username"], entry["username"])
+
+
+class NdjsonReaderTests(SimpleTestCase):
+    def write(self, text):
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_unknown_keys_fail_before_streaming(self):
+        path = self.write('not json\n{"name": "x", "mail": "y"}\n')
+        with self.assertRaisesMessage(CommandError, "Cannot detect headers"):
+            read_records(path, None, HEADER_MAPS)
+
+    def test_rows_before_and_after_the_first_object_are_kept(self):
+        path = self.write(
+            'bad\n{"first_name": "A", "last_name": "B", "email": "a@uni.ac.ir"}\n\n[1]\n'
+            '{"email": "c@uni.ac.ir"}\n'
+        )
+        rows = list(read_records(path, None, HEADER_MAPS))
+
+        self.assertEqual([row_no for row_no, _ in rows], [1, 2, 4, 5])
+        self.assertIsInstance(rows[0][1], ValueError)
+        self.assertEqual(rows[1][1], {"first_name": "A", "last_name": "B", "email": "a@uni.ac.ir"})
+        self.assertIsInstance(rows[2][1], ValueError)
+        self.assertEqual(rows[3][1], {"first_name": None, "last_name": None, "email": "c@uni.ac.ir"})
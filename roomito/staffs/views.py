@@ -5,15 +5,13 @@ from django.contrib.auth.models import User
 from django.core.mail import send_mail
 from django.utils.crypto import get_random_string
 from rest_framework_simplejwt.tokens import RefreshToken
-from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
+from common.lazy_schema import lazy_schema
 from django.core.cache import cache
 from .models import Staff
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import update_session_auth_hash
 from .serializers import (
     StaffRegisterSerializer,
-    ErrorResponseSerializer,
-    SuccessResponseSerializer,
     StaffProfileUpdateSerializer,
     StaffProfileSerializer
 )
@@ -25,62 +23,18 @@ from django.utils.crypto import get_random_string
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
 
 from staffs.models import Staff
-from .serializers import StaffRegisterSerializer, SuccessResponseSerializer, ErrorResponseSerializer
+from .serializers import StaffRegisterSerializer
 
 
 def _norm(s: str) -> str:
     return (s or "").strip()
 
 
-@extend_schema(tags=['auth'])
+@lazy_schema
 class StaffRegisterView(APIView):
-    @extend_schema(
-        request=StaffRegisterSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Successful registration",
-                examples=[OpenApiExample(
-                    name="Success",
-                    value={"message": "The temporary password has been sent to the email."},
-                )],
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Validation error",
-                examples=[
-                    OpenApiExample(name="MissingField", value={"first_name": ["This field is required."]}),
-                    OpenApiExample(name="MissingField", value={"last_name": ["This field is required."]}),
-                    OpenApiExample(name="InvalidNationalId", value={"national_id": ["National ID must be exactly 10 digits."]}),
-                    OpenApiExample(name="InvalidPersonnelCode", value={"personnel_code": ["Personnel code cannot be more than 10 characters."]}),
-                    OpenApiExample(name="InvalidEmail", value={"email": ["Enter a valid email address."]}),
-                    OpenApiExample(name="DuplicatePersonnelCode", value={"personnel_code": ["This personnel code already exists."]}),
-                    OpenApiExample(name="DuplicateNationalId", value={"national_id": ["This national ID already exists."]}),
-                    OpenApiExample(name="AlreadyRegistered", value={"error": "This staff is already registered."}),
-                ],
-            ),
-            404: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Staff not found or email/name mismatch",
-                examples=[OpenApiExample(
-                    name="StaffNotFound",
-                    value={"error": "Staff not found or details do not match the registered data."},
-                )],
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Server error while sending email or persisting data",
-                examples=[
-                    OpenApiExample(name="EmailSendError", value={"error": "Failed to send verification email."}),
-                    OpenApiExample(name="AccountConflict", value={"error": "Account conflict. Contact admin."}),
-                ],
-            ),
-        },
-        description="Staff registration via university email + personnel code. Creates/updates the User(username=personnel_code), sets a temporary password, links Staff→User, emails the password."
-    )
+    @lazy_schema
     @transaction.atomic
     def post(self, request):
         serializer = StaffRegisterSerializer(data=request.data)
@@ -179,98 +133,11 @@ class StaffRegisterView(APIView):
                         status=status.HTTP_200_OK)
 
 
-@extend_schema(tags=['staff'])
+@lazy_schema
 class StaffProfileUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        request=StaffProfileUpdateSerializer,
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Profile updated successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="UpdateSuccess",
-                        value={"message": "Profile updated successfully."}
-                    )
-                ]
-            ),
-            400: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Invalid input or validation error.",
-                examples=[
-                    OpenApiExample(
-                        name="DuplicatePersonnelCode",
-                        value={"personnel_code": ["This personnel code is already in use."]}
-                    ),
-                    OpenApiExample(
-                        name="DuplicateNationalId",
-                        value={"national_id": ["This national ID is already in use."]}
-                    ),
-                    OpenApiExample(
-                        name="InvalidNationalId",
-                        value={"national_id": ["National ID must be exactly 10 digits."]}
-                    ),
-                    OpenApiExample(
-                        name="InvalidPersonnelCode",
-                        value={"personnel_code": ["Personnel code cannot be more than 10 characters."]}
-                    ),
-                    OpenApiExample(
-                        name="InvalidEmail",
-                        value={"email": ["Enter a valid email address."]}
-                    ),
-                    # OpenApiExample(
-                    # name="ValidationError",
-                    # value={"email": ["This email is already in use."]}
-                    # ),
-                    OpenApiExample(
-                        name="InvalidEmail",
-                        value={"email": ["Enter a valid email address."]}
-                    ),
-                    OpenApiExample(
-                        name="MissingCurrentPassword",
-                        value={"current_password": ["Current password is required to change password."]}
-                    ),
-                    OpenApiExample(
-                        name="IncorrectCurrentPassword",
-                        value={"current_password": ["Current password is incorrect."]}
-                    ),
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication credentials were not provided or invalid.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not a Staff.",
-                examples=[
-                    OpenApiExample(
-                        name="NotStaff",
-                        value={"error": "User is not a Staff."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Server error while updating profile.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred while updating profile."}
-                    )
-                ]
-            )
-        },
-        description="Update profile informations of the authenticated Staff."
-    )
+    @lazy_schema
     def patch(self, request):
         user = request.user
         try:
@@ -297,62 +164,11 @@ class StaffProfileUpdateView(APIView):
         return Response({"message": "Profile updated successfully."}, status=status.HTTP_200_OK)
     
     
-@extend_schema(tags=['staff'])
+@lazy_schema
 class StaffProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @extend_schema(
-        responses={
-            200: OpenApiResponse(
-                response=SuccessResponseSerializer,
-                description="Staff profile retrieved successfully.",
-                examples=[
-                    OpenApiExample(
-                        name="StaffProfileExample",
-                        value={
-                            "first_name": "string",
-                            "last_name": "string",
-                            "email": "string@example.com",
-                            "personnel_code": "string",
-                            "national_id": "string"
-                        },
-                        response_only=True
-                    )
-                ]
-            ),
-            401: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="Authentication credentials were not provided or invalid.",
-                examples=[
-                    OpenApiExample(
-                        name="Unauthorized",
-                        value={"detail": "Authentication credentials were not provided."}
-                    )
-                ]
-            ),
-            403: OpenApiResponse(
-                response=ErrorResponseSerializer,
-                description="User is not a Staff.",
-                examples=[
-                    OpenApiExample(
-                        name="NotStaff",
-                        value={"error": "User is not a staff."}
-                    )
-                ]
-            ),
-            500: OpenApiResponse(
-                response=None,
-                description="Server error while retrieving profile.",
-                examples=[
-                    OpenApiExample(
-                        name="ServerError",
-                        value={"error": "An unexpected error occurred while retrieving profile."}
-                    )
-                ]
-            )
-        },
-        description="Retrieves the authenticated Staff's profile."
-    )
+    @lazy_schema
     def get(self, request):
         user = request.user
 
@@ -0,0 +1,43 @@
+from django.db import transaction
+
+from space_managers.outbox import queue_emails
+from .models import Student
+
+
+APPROVAL_SUBJECT = "تأیید ثبت‌نام دانشجو در رومیتو"
+
+
+def approval_message(user):
+    return (
+        f"دانشجوی گرامی {user.first_name} {user.last_name}،\n"
+        "ثبت‌نام شما توسط مدیر سامانه تأیید شد. اکنون می‌توانید وارد حساب کاربری خود شوید."
+    )
+
+
+def approve_students(student_ids, batch_size=500):
+    """
+    Approve students in chunks of ``batch_size``, one short transaction each.
+    Notification emails are queued in the outbox with the chunk instead of being sent inline.
+    Returns ``(approved, queued)``.
+    """
+    ids = list(student_ids)
+    approved, queued = 0, 0
+
+    for i in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            students = list(
+                Student.objects
+                .select_for_update(of=('self',))
+                .select_related('user')
+                .filter(pk__in=ids[i:i + batch_size], is_approved=False)
+            )
+            for student in students:
+                student.is_approved = True
+            Student.objects.bulk_update(students, ['is_approved'])
+            queued += queue_emails(
+                (APPROVAL_SUBJECT, approval_message(student.user), student.user.email)
+                for student in students
+            )
+        approved += len(students)
+
+    return approved, queued
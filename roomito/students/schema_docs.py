@@ -0,0 +1,243 @@
+"""OpenAPI documentation of the student registration and profile views. See common.lazy_schema."""
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse
+
+from .serializers import (
+    ErrorResponseSerializer,
+    StudentProfileSerializer,
+    StudentProfileUpdateSerializer,
+    StudentRegistrationSerializer,
+    SuccessRegistrationResponseSerializer,
+    SuccessResponseSerializer,
+)
+
+
+SCHEMAS = {
+    'StudentRegisterView': extend_schema(tags=['auth']),
+
+    'StudentRegisterView.post': extend_schema(
+        request=StudentRegistrationSerializer,
+        responses={
+            201: OpenApiResponse(
+                response=SuccessRegistrationResponseSerializer,
+                description="Student registration successful",
+                examples=[
+                    OpenApiExample(
+                        name="RegistrationSuccess",
+                        value={
+                            "message": "The student has been successfully registered. Please wait for the confirmation of the card photo.",
+                            "student_id": 42
+                        }
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Validation error",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidStudentID",
+                        value={"student_id": ["Student ID must be numeric."]}
+                    ),
+                    OpenApiExample(
+                        name="StudentIDTooLong",
+                        value={"student_id": ["Student ID cannot be more than 12 digits."]}
+                    ),
+                    OpenApiExample(
+                        name="InvalidNationalID",
+                        value={"national_id": ["National ID must be numeric."]}
+                    ),
+                    OpenApiExample(
+                        name="NationalIDLength",
+                        value={"national_id": ["National ID must be exactly 10 digits."]}
+                    ),
+                    OpenApiExample(
+                        name="InvalidImage",
+                        value={"student_card_photo": ["Only image files are allowed."]}
+                    )
+                ]
+            ),
+            409: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Conflict - duplicate data",
+                examples=[
+                    # OpenApiExample(
+                    #     name="DuplicateEmail",
+                    #     value={"error": "Email already exists."}
+                    # ),
+                    OpenApiExample(
+                        name="DuplicateStudentID",
+                        value={"student_id": ["This student ID is already in use."]}
+                    ),
+                    OpenApiExample(
+                        name="DuplicateNationalID",
+                        value={"national_id": ["This national ID is already in use."]}
+                    ),
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Unexpected server error",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred."}
+                    )
+                ]
+            ),
+        },
+        description="Register a student with validation for Student ID and National ID."
+    ),
+
+    'StudentProfileUpdateView': extend_schema(tags=['student']),
+
+    'StudentProfileUpdateView.patch': extend_schema(
+        request=StudentProfileUpdateSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=SuccessResponseSerializer,
+                description="Profile updated successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="UpdateSuccess",
+                        value={"message": "Profile updated successfully."}
+                    )
+                ]
+            ),
+            400: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Invalid input or validation error.",
+                examples=[
+                    OpenApiExample(
+                        name="InvalidNationalID",
+                        value={"national_id": ["National ID must be exactly 10 digits."]}
+                    ),
+                    OpenApiExample(
+                        name="InvalidStudentID",
+                        value={"student_id": ["Student ID must not exceed 12 digits."]}
+                    ),
+                    # OpenApiExample(
+                    #     name="DuplicateEmail",
+                    #     value={"email": ["This email is already in use."]}
+                    # ),
+                    OpenApiExample(
+                        name="MissingCurrentPassword",
+                        value={"current_password": ["Current password is required to change password."]}
+                    ),
+                    OpenApiExample(
+                        name="IncorrectCurrentPassword",
+                        value={"current_password": ["Current password is incorrect."]}
+                    ),
+                    OpenApiExample(
+                        name="InvalidImage",
+                        value={"student_card_photo": ["Only image files are allowed."]}
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication credentials were not provided or invalid.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a student.",
+                examples=[
+                    OpenApiExample(
+                        name="NotStudent",
+                        value={"error": "User is not a student."}
+                    )
+                ]
+            ),
+             409: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Conflict - duplicate data",
+                examples=[
+                    # OpenApiExample(
+                    #     name="DuplicateEmail",
+                    #     value={"error": "Email already exists."}
+                    # ),
+                    OpenApiExample(
+                        name="DuplicateStudentID",
+                        value={"student_id": ["This student ID is already in use."]}
+                    ),
+                    OpenApiExample(
+                        name="DuplicateNationalID",
+                        value={"national_id": ["This national ID is already in use."]}
+                    ),
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Server error while updating profile.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred while updating profile."}
+                    )
+                ]
+            )
+        },
+        description="Update profile information of the authenticated student."
+    ),
+
+    'StudentProfileView': extend_schema(tags=['student']),
+
+    'StudentProfileView.get': extend_schema(
+        responses={
+            200: OpenApiResponse(
+                response=StudentProfileSerializer,
+                description="Student profile retrieved successfully.",
+                examples=[
+                    OpenApiExample(
+                        name="ProfileExample",
+                        value={
+                            "first_name": "string",
+                            "last_name": "string",
+                            "email": "string@example.com",
+                            "student_id": "string",
+                            "national_id": "string",
+                            "student_card_photo": "http://example.com/student_cards/string.jpg"
+                        },
+                        response_only=True
+                    )
+                ]
+            ),
+            401: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Authentication credentials were not provided or invalid.",
+                examples=[
+                    OpenApiExample(
+                        name="Unauthorized",
+                        value={"detail": "Authentication credentials were not provided."}
+                    )
+                ]
+            ),
+            403: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="User is not a student.",
+                examples=[
+                    OpenApiExample(
+                        name="NotStudent",
+                        value={"error": "User is not a student."}
+                    )
+                ]
+            ),
+            500: OpenApiResponse(
+                response=ErrorResponseSerializer,
+                description="Server error while retrieving profile.",
+                examples=[
+                    OpenApiExample(
+                        name="ServerError",
+                        value={"error": "An unexpected error occurred while retrieving profile."}
+                    )
+                ]
+            )
+        },
+        description="Retrieves the authenticated student's profile."
+    ),
+}
@@ -1,3 +1,139 @@
-from django.test import TestCase
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from space_managers.models import OutboxEmail
+from common import login
+from students import approvals
+from students.admin import StudentAdmin
+from students.models import Student
+
+
+class ImportStudentsTests(TestCase):
+    def write_roster(self, rows):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write("first_name,last_name,email,student_id,national_id,password\n")
+            fh.writelines(",".join(row) + "\n" for row in rows)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def import_roster(self, *args):
+        path = self.write_roster([
+            ("Ali", "Rezaei", "ali@uni.ac.ir", "4001", "0012345678", "Welcome-1404"),
+            ("Mina", "Moradi", "mina@uni.ac.ir", "4002", "0012345679", "Welcome-1404"),
+            ("Omid", "Sadeghi", "omid@uni.ac.ir", "4003", "0012345680", "Other-1404"),
+            ("Neda", "Jafari", "neda@uni.ac.ir", "4004", "0012345681", ""),
+        ])
+        call_command("import_students", path, *args, stdout=StringIO())
+        return {user.username: user for user in User.objects.filter(username__in=["4001", "4002", "4003", "4004"])}
+
+    def assert_passwords(self, users):
+        self.assertTrue(users["4001"].check_password("Welcome-1404"))
+        self.assertTrue(users["4002"].check_password("Welcome-1404"))
+        self.assertTrue(users["4003"].check_password("Other-1404"))
+        self.assertFalse(users["4004"].has_usable_password())
+        # A shared roster password still gets a salt, and so a hash, of its own per user.
+        self.assertNotEqual(users["4001"].password, users["4002"].password)
+
+    def test_every_user_gets_its_own_salted_hash(self):
+        self.assert_passwords(self.import_roster())
+
+    def test_hashing_across_worker_processes(self):
+        self.assert_passwords(self.import_roster("--workers", "2", "--batch-size", "3"))
+
+
+class ApproveStudentsActionTests(TestCase):
+    def setUp(self):
+        self.students = [
+            Student.objects.create(
+                user=User.objects.create_user(username=str(4100 + n), email=f"s{n}@uni.ac.ir"),
+                student_id=str(4100 + n), national_id=f"00100000{n:02d}",
+            )
+            for n in range(2)
+        ]
+
+    def run_action(self):
+        request = RequestFactory().post("/admin/students/student/")
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        StudentAdmin(Student, AdminSite()).approve_students(request, Student.objects.all())
+        return [str(message) for message in get_messages(request)]
+
+    def test_reports_only_the_emails_this_action_queued(self):
+        # An older failed approval email to the same address is not this action's business.
+        OutboxEmail.objects.create(subject=approvals.APPROVAL_SUBJECT, message="", recipient="s0@uni.ac.ir",
+                                   status="failed", last_error="SMTP 550 mailbox unavailable")
+
+        messages = self.run_action()
+
+        self.assertEqual(messages, [
+            "2 student(s) approved. Notification emails queued: 2; they go out with the next send_queued_emails run.",
+        ])
+        self.assertEqual(OutboxEmail.objects.filter(status="pending").count(), 2)
+
+
+class LoginTests(TestCase):
+    password = "Login-pass-1404"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="4200", password=self.password)
+        Student.objects.create(user=self.user, student_id="4200", national_id="0020000000", is_approved=True)
+
+    def login(self):
+        return self.client.post("/api/login/", {"role": "student", "username": "4200", "password": self.password},
+                                content_type="application/json")
+
+    def test_password_is_hashed_off_the_request_thread(self):
+        threads = []
+
+        def check_password(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return real_check_password(*args, **kwargs)
+
+        real_check_password = login.check_password
+        with mock.patch.object(login, "check_password", check_password):
+            self.assertEqual(self.login().status_code, 200)
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    @override_settings(LOGIN_HASH_WAIT_SECONDS=0.01)
+    def test_busy_when_every_hashing_slot_is_taken(self):
+        with mock.patch.object(login, "_hash_slots", threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            response = self.login()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        # A refused login gives back no slot it never took: a BoundedSemaphore would raise here.
+        slots.release()
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]):
+            self.user.set_password(self.password)
+            self.user.save()
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"), self.user.password)
+
+            # Up to date now: the next login leaves the hash alone.
+            upgraded = self.user.password
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertEqual(self.user.password, upgraded)
+
+    def test_wrong_password_is_refused(self):
+        self.password = "not-" + self.password
+        self.assertEqual(self.login().status_code, 401)